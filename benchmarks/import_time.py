@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for LogicEdu.
+
+Each statement is timed in a fresh interpreter so module caches don't hide the
+cost a render worker pays on startup. Run from the repository root:
+
+    python benchmarks/import_time.py --repeat 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "baseline": "pass",
+    "import logicedu": "import logicedu",
+    "import manim": "import manim",
+    "from logicedu import AND2": "from logicedu import AND2",
+    "from logicedu import RegisterFile": "from logicedu import RegisterFile",
+    "from logicedu import all_gates": "from logicedu import all_gates",
+}
+
+TIMER = """
+import time
+_start = time.perf_counter()
+{statement}
+print(time.perf_counter() - _start)
+"""
+
+
+def time_statement(statement: str, repeat: int) -> list:
+    """Run statement in `repeat` fresh interpreters and return the timings in seconds."""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Emit JSON results")
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in STATEMENTS.items():
+        timings = time_statement(statement, args.repeat)
+        results[name] = {
+            "median_s": statistics.median(timings),
+            "min_s": min(timings),
+            "max_s": max(timings),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, stats in results.items():
+        print(f"{name:36s} median {stats['median_s'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
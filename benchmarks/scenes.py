@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Scene benchmark for LogicEdu.
+
+For each scene this measures how long construct() takes with animations
+skipped, the peak Python memory allocated while doing so, and how long the
+camera takes to draw one frame of the finished scene. Besides the bundled
+examples there are synthetic circuits of N gates and N wires, to show how the
+cost grows with diagram size. Run from the repository root:
+
+    python benchmarks/scenes.py --json > results.json
+    python benchmarks/scenes.py --save-baseline benchmarks/baseline.json
+    python benchmarks/scenes.py --baseline benchmarks/baseline.json
+
+With --baseline the exit status is 1 if any metric got slower than the
+threshold, so the script can gate a CI job.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from manim import RIGHT, UP, Scene, config, tempconfig  # noqa: E402
+
+from logicedu import AND2, ConnectorLine, OR2  # noqa: E402
+
+# Lower is better for every metric; these are compared against the baseline.
+METRICS = ("construct_s", "peak_mib", "frame_ms")
+
+
+def synthetic_scene(num_gates: int) -> type:
+    """A Scene with num_gates alternating AND2/OR2 gates chained by num_gates wires."""
+
+    class SyntheticCircuit(Scene):
+        def construct(self):
+            columns = max(1, int(num_gates**0.5))
+            gates = []
+            for i in range(num_gates):
+                gate = (AND2 if i % 2 == 0 else OR2)()
+                gate.scale(0.3).shift(
+                    RIGHT * (i % columns) * 0.8 + UP * (i // columns) * 0.5
+                )
+                gates.append(gate)
+            wires = [
+                ConnectorLine(
+                    gates[i - 1].get_output_by_index(0),
+                    gates[i].get_input_by_index(i % 2),
+                    manhatten=True,
+                )
+                for i in range(1, num_gates)
+            ]
+            # Close the chain so there are as many wires as gates.
+            if num_gates > 1:
+                wires.append(
+                    ConnectorLine(
+                        gates[-1].get_output_by_index(0),
+                        gates[0].get_input_by_index(1),
+                        manhatten=True,
+                    )
+                )
+            self.add(*gates, *wires)
+
+    SyntheticCircuit.__name__ = f"Synthetic{num_gates}"
+    return SyntheticCircuit
+
+
+def _load_scene(module: str, name: str) -> type:
+    if module.endswith(".py"):
+        spec = importlib.util.spec_from_file_location(Path(module).stem, REPO_ROOT / module)
+        loaded = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(loaded)
+    else:
+        loaded = importlib.import_module(module)
+    return getattr(loaded, name)
+
+
+EXAMPLE_SCENES = {
+    "Cod6Fig417": ("logicedu.examples.cod6_fig4_17", "Cod6Fig417"),
+    "Demo": ("logicedu.examples.demo", "Demo"),
+    "RefactoringDemo": ("examples/refactoring_demo.py", "RefactoringDemo"),
+}
+
+
+def measure(scene_cls: type, repeat: int, frames: int) -> dict:
+    """Construct scene_cls `repeat` times and return the median of each metric."""
+    construct_times, peaks, frame_times = [], [], []
+    mobject_count = 0
+    for _ in range(repeat):
+        # Keep stdout clean for --json; some examples print while constructing.
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                tracemalloc.start()
+                start = time.perf_counter()
+                scene = scene_cls(skip_animations=True)
+                scene.render()
+                construct_times.append(time.perf_counter() - start)
+                peaks.append(tracemalloc.get_traced_memory()[1] / 2**20)
+                tracemalloc.stop()
+            finally:
+                sys.stdout = stdout
+        mobject_count = sum(len(mob.get_family()) for mob in scene.mobjects)
+
+        if frames:
+            start = time.perf_counter()
+            for _ in range(frames):
+                scene.renderer.update_frame(scene, ignore_skipping=True)
+            frame_times.append((time.perf_counter() - start) / frames * 1000)
+
+    return {
+        "construct_s": statistics.median(construct_times),
+        "peak_mib": statistics.median(peaks),
+        "frame_ms": statistics.median(frame_times) if frame_times else None,
+        "mobjects": mobject_count,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print a comparison table and return the (scene, metric) pairs that regressed."""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:24s} (not in baseline)")
+            continue
+        for metric in METRICS:
+            new, old = stats.get(metric), base.get(metric)
+            if new is None or not old:
+                continue
+            ratio = new / old
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append((name, metric))
+            elif ratio < 1 - threshold:
+                flag = "  faster"
+            print(f"{name:24s} {metric:12s} {old:10.3f} -> {new:10.3f}  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--frames", type=int, default=10, help="Frames to time per scene; 0 to skip"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=[10, 100, 500],
+        help="Gate counts of the synthetic circuits",
+    )
+    parser.add_argument(
+        "--scenes",
+        nargs="*",
+        default=list(EXAMPLE_SCENES),
+        help="Example scenes to run (default: all)",
+    )
+    parser.add_argument(
+        "--imports", action="store_true", help="Also run the import-time benchmark"
+    )
+    parser.add_argument("--json", action="store_true", help="Emit JSON results")
+    parser.add_argument("--baseline", help="Compare against this JSON file")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown that counts as a regression (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    scenes = {name: _load_scene(*EXAMPLE_SCENES[name]) for name in args.scenes}
+    for size in args.sizes:
+        scenes[f"Synthetic{size}"] = synthetic_scene(size)
+
+    results = {}
+    with tempconfig({"dry_run": True, "verbosity": "ERROR", "progress_bar": "none"}):
+        for name, scene_cls in scenes.items():
+            results[name] = measure(scene_cls, args.repeat, args.frames)
+
+    report = {
+        "python": platform.python_version(),
+        "manim": importlib.import_module("manim").__version__,
+        "resolution": [config.pixel_width, config.pixel_height],
+        "results": results,
+    }
+    if args.imports:
+        from import_time import STATEMENTS, time_statement
+
+        report["imports"] = {
+            name: statistics.median(time_statement(statement, args.repeat))
+            for name, statement in STATEMENTS.items()
+        }
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif not args.baseline:
+        for name, stats in results.items():
+            frame = (
+                f"{stats['frame_ms']:8.1f} ms/frame"
+                if stats["frame_ms"] is not None
+                else ""
+            )
+            print(
+                f"{name:24s} construct {stats['construct_s'] * 1000:9.1f} ms  "
+                f"peak {stats['peak_mib']:7.1f} MiB  {frame}"
+            )
+        for name, seconds in report.get("imports", {}).items():
+            print(f"{name:36s} median {seconds * 1000:8.1f} ms")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
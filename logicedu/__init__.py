@@ -3,61 +3,163 @@ LogicEdu - Digital Logic Circuit Animation Library for Manim
 
 A comprehensive library for creating educational animations of digital logic circuits,
 computer architecture diagrams, and data flow visualizations.
+
+Exports are resolved lazily: ``import logicedu`` does not import Manim or build any
+components until a name such as ``logicedu.AND2`` is first accessed.
 """
 
+import os
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 __author__ = "Boone Severson"
 __email__ = "boonejs@me.com"
 __email__ = "boonejs@me.com"
 
-# Core components
-from .core.basics import (
-    Pin,
-    PinSide,
-    PinType,
-    ConnectorLine,
-    ArbitrarySegmentLine,
-    create_grid,
-    GRID,
-)
+# Maps each public name to the module that defines it.
+_LAZY_EXPORTS = {
+    # Core components
+    "Pin": ".core.basics",
+    "PinSide": ".core.basics",
+    "PinType": ".core.basics",
+    "ConnectorLine": ".core.basics",
+    "ArbitrarySegmentLine": ".core.basics",
+    "create_grid": ".core.basics",
+    "GRID": ".core.basics",
+    "Netlist": ".core.netlist",
+    "Router": ".core.routing",
+    "route_all": ".core.routing",
+    # Logic gates
+    "AND2": ".components.logic_gates",
+    "OR2": ".components.logic_gates",
+    "INV": ".components.logic_gates",
+    "NAND2": ".components.logic_gates",
+    "NOR2": ".components.logic_gates",
+    "XOR2": ".components.logic_gates",
+    "XNOR2": ".components.logic_gates",
+    "LogicType": ".components.logic_gates",
+    "BinaryLogic": ".components.logic_gates",
+    "all_gates": ".components.logic_gates",
+    "make_all_gates": ".components.logic_gates",
+    # Computer architecture components
+    "ALUZ": ".components.blocks",
+    "RegisterFile": ".components.blocks",
+    "DataMemory": ".components.blocks",
+    "InstructionMemory": ".components.blocks",
+    "ControlUnit": ".components.blocks",
+    "AluControl": ".components.blocks",
+    "PC": ".components.blocks",
+    "AdderPlus4": ".components.blocks",
+    "BranchLogic": ".components.blocks",
+    "Mux": ".components.blocks",
+    "SignExtend": ".components.blocks",
+    "ShiftLeft": ".components.blocks",
+    "DFF": ".components.blocks",
+    "DFFVariant": ".components.blocks",
+    "RegisterStorage": ".components.storage",
+    "MemoryStorage": ".components.storage",
+    "load_image": ".components.storage",
+    # Simulation
+    "LogicSimulator": ".simulation.engine",
+    "SignalPropagation": ".simulation.propagation",
+    "arrival_times": ".simulation.timing",
+    "analyze_timing": ".simulation.sta",
+    "truth_table": ".simulation.truth_table",
+    "gate_truth_table": ".simulation.truth_table",
+    "WordSimulator": ".simulation.words",
+    "EventSimulator": ".simulation.events",
+    "compile_netlist": ".simulation.compiler",
+    "MipsSimulator": ".simulation.mips",
+    "MipsProgram": ".simulation.mips",
+    "MipsDatapath": ".simulation.mips",
+    "encode_instruction": ".simulation.mips",
+    "TraceStore": ".simulation.trace",
+    # Utility functions
+    "dim_all_objects": ".utils.animation_helpers",
+    "undim_all_objects": ".utils.animation_helpers",
+    "ConstructionProfiler": ".utils.profiling",
+    "FocusController": ".utils.focus",
+}
+
+if TYPE_CHECKING:
+    from .core.basics import (
+        Pin,
+        PinSide,
+        PinType,
+        ConnectorLine,
+        ArbitrarySegmentLine,
+        create_grid,
+        GRID,
+    )
+    from .core.netlist import Netlist
+    from .core.routing import Router, route_all
+    from .components.logic_gates import (
+        AND2,
+        OR2,
+        INV,
+        NAND2,
+        NOR2,
+        XOR2,
+        XNOR2,
+        LogicType,
+        BinaryLogic,
+        all_gates,
+        make_all_gates,
+    )
+    from .components.blocks import (
+        ALUZ,
+        RegisterFile,
+        DataMemory,
+        InstructionMemory,
+        ControlUnit,
+        AluControl,
+        PC,
+        AdderPlus4,
+        BranchLogic,
+        Mux,
+        SignExtend,
+        ShiftLeft,
+        DFF,
+        DFFVariant,
+    )
+    from .components.storage import RegisterStorage, MemoryStorage, load_image
+    from .simulation.engine import LogicSimulator
+    from .simulation.propagation import SignalPropagation
+    from .simulation.timing import arrival_times
+    from .simulation.sta import analyze_timing
+    from .simulation.truth_table import truth_table, gate_truth_table
+    from .simulation.words import WordSimulator
+    from .simulation.events import EventSimulator
+    from .simulation.compiler import compile_netlist
+    from .simulation.mips import (
+        MipsDatapath,
+        MipsProgram,
+        MipsSimulator,
+        encode_instruction,
+    )
+    from .simulation.trace import TraceStore
+    from .utils.animation_helpers import (
+        dim_all_objects,
+        undim_all_objects,
+    )
+    from .utils.profiling import ConstructionProfiler
+    from .utils.focus import FocusController
 
-# Logic gates
-from .components.logic_gates import (
-    AND2,
-    OR2,
-    INV,
-    NAND2,
-    NOR2,
-    XOR2,
-    XNOR2,
-    LogicType,
-    BinaryLogic,
-    all_gates,
-)
 
-# Computer architecture components
-from .components.blocks import (
-    ALUZ,
-    RegisterFile,
-    DataMemory,
-    InstructionMemory,
-    ControlUnit,
-    AluControl,
-    PC,
-    AdderPlus4,
-    BranchLogic,
-    Mux,
-    SignExtend,
-    ShiftLeft,
-    DFF,
-    DFFVariant,
-)
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # Cache on the package so the next lookup skips __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-# Utility functions
-from .utils.animation_helpers import (
-    dim_all_objects,
-    undim_all_objects,
-)
 
 # Re-export commonly used components for convenience
 __all__ = [
@@ -69,6 +171,9 @@ __all__ = [
     "ArbitrarySegmentLine",
     "create_grid",
     "GRID",
+    "Netlist",
+    "Router",
+    "route_all",
     # Logic gates
     "AND2",
     "OR2",
@@ -80,6 +185,7 @@ __all__ = [
     "LogicType",
     "BinaryLogic",
     "all_gates",
+    "make_all_gates",
     # Architecture components
     "ALUZ",
     "RegisterFile",
@@ -95,7 +201,32 @@ __all__ = [
     "ShiftLeft",
     "DFF",
     "DFFVariant",
+    "RegisterStorage",
+    "MemoryStorage",
+    "load_image",
+    # Simulation
+    "LogicSimulator",
+    "SignalPropagation",
+    "arrival_times",
+    "analyze_timing",
+    "truth_table",
+    "gate_truth_table",
+    "WordSimulator",
+    "EventSimulator",
+    "compile_netlist",
+    "MipsSimulator",
+    "MipsProgram",
+    "MipsDatapath",
+    "encode_instruction",
+    "TraceStore",
     # Utilities
     "dim_all_objects",
     "undim_all_objects",
+    "ConstructionProfiler",
+    "FocusController",
 ]
+
+# LOGICEDU_PROFILE opts a whole run into construction profiling. It has to start
+# before any component is built, so it is the one thing checked at import time.
+if os.environ.get("LOGICEDU_PROFILE"):
+    import_module(".utils.profiling", __name__).enable_from_env()
@@ -5,42 +5,102 @@ This module contains all the digital logic and computer architecture components:
 - Logic gates (AND, OR, NOT, etc.)
 - Computer architecture blocks (ALU, Register File, Memory, etc.)
 - Data path elements (Multiplexers, Adders, etc.)
+
+Like the top-level package, exports are imported on first access.
 """
 
-from .logic_gates import (
-    AND2,
-    OR2,
-    INV,
-    NAND2,
-    NOR2,
-    XOR2,
-    XNOR2,
-    LogicType,
-    BinaryLogic,
-    ShapeFactory,
-    LOGIC_UP,
-    UnaryLogic,
-    all_gates,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_LAZY_EXPORTS = {
+    # Logic gates
+    "AND2": ".logic_gates",
+    "OR2": ".logic_gates",
+    "INV": ".logic_gates",
+    "NAND2": ".logic_gates",
+    "NOR2": ".logic_gates",
+    "XOR2": ".logic_gates",
+    "XNOR2": ".logic_gates",
+    "LogicType": ".logic_gates",
+    "BinaryLogic": ".logic_gates",
+    "ShapeFactory": ".logic_gates",
+    "LOGIC_UP": ".logic_gates",
+    "UnaryLogic": ".logic_gates",
+    "all_gates": ".logic_gates",
+    "make_all_gates": ".logic_gates",
+    # Architecture components
+    "ALUZ": ".blocks",
+    "RegisterFile": ".blocks",
+    "DataMemory": ".blocks",
+    "InstructionMemory": ".blocks",
+    "ControlUnit": ".blocks",
+    "AluControl": ".blocks",
+    "PC": ".blocks",
+    "AdderPlus4": ".blocks",
+    "BranchLogic": ".blocks",
+    "Mux": ".blocks",
+    "SignExtend": ".blocks",
+    "ShiftLeft": ".blocks",
+    "DFF": ".blocks",
+    "DFFVariant": ".blocks",
+    "Adder": ".blocks",
+    "GenEllipse": ".blocks",
+    # Block state
+    "RegisterStorage": ".storage",
+    "MemoryStorage": ".storage",
+    "load_image": ".storage",
+}
+
+if TYPE_CHECKING:
+    from .logic_gates import (
+        AND2,
+        OR2,
+        INV,
+        NAND2,
+        NOR2,
+        XOR2,
+        XNOR2,
+        LogicType,
+        BinaryLogic,
+        ShapeFactory,
+        LOGIC_UP,
+        UnaryLogic,
+        all_gates,
+        make_all_gates,
+    )
+    from .blocks import (
+        ALUZ,
+        RegisterFile,
+        DataMemory,
+        InstructionMemory,
+        ControlUnit,
+        AluControl,
+        PC,
+        AdderPlus4,
+        BranchLogic,
+        Mux,
+        SignExtend,
+        ShiftLeft,
+        DFF,
+        DFFVariant,
+        Adder,
+        GenEllipse,
+    )
+    from .storage import RegisterStorage, MemoryStorage, load_image
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-from .blocks import (
-    ALUZ,
-    RegisterFile,
-    DataMemory,
-    InstructionMemory,
-    ControlUnit,
-    AluControl,
-    PC,
-    AdderPlus4,
-    BranchLogic,
-    Mux,
-    SignExtend,
-    ShiftLeft,
-    DFF,
-    DFFVariant,
-    Adder,
-    GenEllipse,
-)
 
 __all__ = [
     # Logic gates
@@ -57,6 +117,7 @@ __all__ = [
     "LOGIC_UP",
     "UnaryLogic",
     "all_gates",
+    "make_all_gates",
     # Architecture components
     "ALUZ",
     "RegisterFile",
@@ -74,4 +135,8 @@ __all__ = [
     "DFFVariant",
     "Adder",
     "GenEllipse",
+    # Block state
+    "RegisterStorage",
+    "MemoryStorage",
+    "load_image",
 ]
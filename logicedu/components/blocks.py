@@ -3,7 +3,6 @@ from manim import (
     Ellipse,
     Polygon,
     Rectangle,
-    Text,
     Dot,
     WHITE,
     BLUE,
@@ -15,7 +14,7 @@ from manim import (
     PI,
 )
 import numpy as np
-from typing import List
+from typing import Dict, List, Mapping, Optional, Union
 from ..core.basics import (
     Pin,
     PinSide,
@@ -24,7 +23,9 @@ from ..core.basics import (
     ConnectorLine,
     ArbitrarySegmentLine,
 )
+from ..core.label_cache import cached_text
 from .logic_gates import AND2
+from .storage import MemoryStorage, RegisterStorage
 import math
 
 
@@ -59,19 +60,25 @@ class ClassicALUZShape(Polygon):
 
 
 class ALUZ(VGroupLogicObjectBase):
-    """Starting with classic ALU Shape, adds text and lines."""
+    """Starting with classic ALU Shape, adds text and lines.
+
+    in0, in1 and result are bit_width (default: 32) wide for simulation; the
+    width isn't drawn."""
 
     def __init__(self, **kwargs):
+        bit_width = kwargs.pop("bit_width", 32)
         super().__init__(**kwargs)
         self.shape = ClassicALUZShape(**kwargs)
         self.label = (
-            Text("ALU", font_size=36, color=WHITE)
+            cached_text("ALU", font_size=36, color=WHITE)
             .move_to(self.shape.get_center())
             .shift(DOWN * 0.65)
         )
         self.input0_pin = Pin(
             pin_side=PinSide.LEFT,
             label="in0",
+            bit_width=bit_width,
+            show_width=False,
             show_label=True,
             font_size=30,
             pin_type=PinType.INPUT,
@@ -79,6 +86,8 @@ class ALUZ(VGroupLogicObjectBase):
         self.input1_pin = Pin(
             pin_side=PinSide.LEFT,
             label="in1",
+            bit_width=bit_width,
+            show_width=False,
             show_label=True,
             font_size=30,
             pin_type=PinType.INPUT,
@@ -86,6 +95,8 @@ class ALUZ(VGroupLogicObjectBase):
         self.result_pin = Pin(
             pin_side=PinSide.RIGHT,
             label="result",
+            bit_width=bit_width,
+            show_width=False,
             show_label=True,
             font_size=30,
             pin_type=PinType.OUTPUT,
@@ -147,19 +158,23 @@ class ALUZ(VGroupLogicObjectBase):
 
 
 class Adder(VGroupLogicObjectBase):
-    """Creates an Adder block."""
+    """Creates an Adder block. Its pins are bit_width (default: 32) wide for
+    simulation; the width isn't drawn."""
 
     def __init__(self, **kwargs):
+        bit_width = kwargs.pop("bit_width", 32)
         super().__init__(**kwargs)
         self.shape = ClassicALUZShape(**kwargs)
         self.label = (
-            Text("Adder", font_size=36, color=WHITE)
+            cached_text("Adder", font_size=36, color=WHITE)
             .move_to(self.shape.get_center())
             .shift(DOWN * 0.65)
         )
         self.input0_pin = Pin(
             pin_side=PinSide.LEFT,
             label="in0",
+            bit_width=bit_width,
+            show_width=False,
             show_label=False,
             font_size=30,
             pin_type=PinType.INPUT,
@@ -167,6 +182,8 @@ class Adder(VGroupLogicObjectBase):
         self.input1_pin = Pin(
             pin_side=PinSide.LEFT,
             label="in1",
+            bit_width=bit_width,
+            show_width=False,
             show_label=False,
             font_size=30,
             pin_type=PinType.INPUT,
@@ -174,6 +191,8 @@ class Adder(VGroupLogicObjectBase):
         self.result_pin = Pin(
             pin_side=PinSide.RIGHT,
             label="result",
+            bit_width=bit_width,
+            show_width=False,
             show_label=False,
             font_size=30,
             pin_type=PinType.OUTPUT,
@@ -218,7 +237,7 @@ class AdderPlus4(Adder):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.plus4_text = Text("'d4", font_size=36, color=WHITE).next_to(
+        self.plus4_text = cached_text("'d4", font_size=36, color=WHITE).next_to(
             self.get_input_by_index(1), LEFT
         )
         self.add(self.plus4_text)
@@ -241,12 +260,14 @@ class MuxSelLocation(enum.Enum):
 
 
 class Mux(VGroupLogicObjectBase):
-    """Creates a Mux block."""
+    """Creates a Mux block. The data pins are bit_width (default: 1) wide for
+    simulation and sel is wide enough to pick any input; widths aren't drawn."""
 
     def __init__(self, **kwargs):
         self.sel_location = kwargs.pop("sel_location", MuxSelLocation.BOTTOM)
         self.num_inputs = kwargs.pop("num_inputs", 2)
         self.pin_length = kwargs.pop("pin_length", 0.5)
+        self.bit_width = kwargs.pop("bit_width", 1)
         super().__init__(**kwargs)
         step = 0.25
         height = 2 * step + (self.num_inputs - 1) * step
@@ -267,6 +288,8 @@ class Mux(VGroupLogicObjectBase):
                     pin_type=PinType.INPUT,
                     label=f"{i}",
                     show_label=True,
+                    bit_width=self.bit_width,
+                    show_width=False,
                 ).shift(UP * step * (self.num_inputs - i))
             )
         self.pins.append(
@@ -275,6 +298,8 @@ class Mux(VGroupLogicObjectBase):
                 label=f"{i}",
                 pin_length=self.pin_length,
                 pin_type=PinType.OUTPUT,
+                bit_width=self.bit_width,
+                show_width=False,
             ).shift(UP * (height / 2) + RIGHT * step)
         )
         pin_side = PinSide.BOTTOM
@@ -289,6 +314,8 @@ class Mux(VGroupLogicObjectBase):
                 label="sel",
                 pin_length=self.pin_length,
                 pin_type=PinType.INPUT,
+                bit_width=max(1, math.ceil(math.log2(self.num_inputs))),
+                show_width=False,
             ).shift(start)
         )
 
@@ -316,10 +343,15 @@ class DFFVariant(enum.Enum):
 
 
 class DFF(VGroupLogicObjectBase):
-    """Creates a DFF block."""
+    """
+    Creates a DFF block. DFF_R adds a reset pin R and DFF_SR a set pin S as well;
+    async_reset (default: True) makes them act at once rather than at the next
+    rising clock edge when the DFF is simulated.
+    """
 
     def __init__(self, variant: DFFVariant = DFFVariant.DFF, **kwargs):
         bit_width = kwargs.pop("bit_width", 1)
+        self.async_reset = kwargs.pop("async_reset", True)
         super().__init__(**kwargs)
         self.variant = variant
         clk_side = 0.3
@@ -456,7 +488,9 @@ class GenEllipse(VGroupLogicObjectBase):
 
         x_half = ellipse_width / 2
         y_half = ellipse_height / 2
-        self.label = Text(f"{self.label_text}", font_size=24, **kwargs).rotate(PI / 2)
+        self.label = cached_text(f"{self.label_text}", font_size=24, **kwargs).rotate(
+            PI / 2
+        )
         self.add(self.label)
 
         pin_dirs = [pin for pin in PinSide]
@@ -637,7 +671,8 @@ class ControlUnit(GenEllipse):
             {
                 "pin_side": PinSide.RIGHT,
                 "label": "ALUOp",
-                "bit_width": 1,
+                "bit_width": 2,
+                "show_width": False,
                 "pin_length": output_pin_length,
                 "pin_type": PinType.OUTPUT,
                 **pin_kwargs,
@@ -693,14 +728,16 @@ class AluControl(GenEllipse):
             {
                 "pin_side": PinSide.RIGHT,
                 "label": "decode",
-                "bit_width": 1,
+                "bit_width": 4,
+                "show_width": False,
                 "pin_type": PinType.OUTPUT,
                 **pin_kwargs,
             },
             {
                 "pin_side": PinSide.BOTTOM,
                 "label": "ALUOp",
-                "bit_width": 1,
+                "bit_width": 2,
+                "show_width": False,
                 "pin_type": PinType.INPUT,
                 **pin_kwargs,
             },
@@ -712,6 +749,7 @@ class ShiftLeft(GenEllipse):
     """Creates a ShiftLeft block."""
 
     def __init__(self, amount: int, **kwargs):
+        self.amount = amount
         label = f"Shift\nLeft {amount}"
         eight = kwargs.pop("ellipse_height", 2)
         ellipse_width = kwargs.pop("ellipse_width", 1.2)
@@ -734,6 +772,20 @@ class ShiftLeft(GenEllipse):
         super().__init__(label=label, pins_info=pins_info, **kwargs)
 
 
+def _port_inputs(inputs: Mapping[Union[str, Pin], object]) -> Dict[str, np.ndarray]:
+    """Port values keyed by pin label, from a mapping keyed by label or Pin."""
+    return {
+        (key.label_str if isinstance(key, Pin) else key): np.asarray(value)
+        for key, value in inputs.items()
+    }
+
+
+def _storage_of(block: VGroupLogicObjectBase):
+    if block.storage is None:
+        raise ValueError(f"{type(block).__name__} has no storage")
+    return block.storage
+
+
 class GenRectangle(VGroupLogicObjectBase):
     """A generic block with a Rectangle and labeled pins."""
 
@@ -757,7 +809,7 @@ class GenRectangle(VGroupLogicObjectBase):
         self.add(self.shape)
 
         # Add label at the center
-        self.label = Text(label, font_size=18, color=kwargs.get("color", WHITE))
+        self.label = cached_text(label, font_size=18, color=kwargs.get("color", WHITE))
         self.label.move_to(self.shape.get_center())
         self.add(self.label)
 
@@ -826,9 +878,14 @@ class PC(GenRectangle):
 
 
 class InstructionMemory(GenRectangle):
-    """Creates an Instruction Memory block."""
+    """Creates an Instruction Memory block. Pass storage=MemoryStorage(...) to
+    hold a program; read_ports() then fetches Inst for RAddr."""
+
+    # Copies share the storage, as copies of a drawn memory show the same data.
+    _reference_attrs = ("storage",)
 
     def __init__(self, **kwargs):
+        self.storage: Optional[MemoryStorage] = kwargs.pop("storage", None)
         pins_info = [
             {
                 "pin_side": PinSide.LEFT,
@@ -855,11 +912,22 @@ class InstructionMemory(GenRectangle):
         self._get_input_pins()[0].shift(UP * ((self.rectangle_height / 2) - 0.3))
         self.label.shift(DOWN * (self.rectangle_height / 2 - 0.3))
 
+    def read_ports(
+        self, inputs: Mapping[Union[str, Pin], object]
+    ) -> Dict[str, np.ndarray]:
+        """{"Inst": words} for the RAddr addresses in inputs."""
+        ports = _port_inputs(inputs)
+        return {"Inst": _storage_of(self).read_word(ports["RAddr"])}
+
 
 class DataMemory(GenRectangle):
-    """Creates a Data Memory block."""
+    """Creates a Data Memory block. Pass storage=MemoryStorage(...) to hold data;
+    read_ports() and write_ports() then access it through the pin names."""
+
+    _reference_attrs = ("storage",)
 
     def __init__(self, **kwargs):
+        self.storage: Optional[MemoryStorage] = kwargs.pop("storage", None)
         pins_info = [
             {
                 "pin_side": PinSide.LEFT,
@@ -913,11 +981,34 @@ class DataMemory(GenRectangle):
         self._get_output_pins()[0].shift(UP * 0.3)
         self.label.shift(DOWN * (self.rectangle_height / 2 - 0.6))
 
+    def read_ports(
+        self, inputs: Mapping[Union[str, Pin], object]
+    ) -> Dict[str, np.ndarray]:
+        """{"ReadData": words} at Addr where MemRead is 1 (default: 1), else 0."""
+        ports = _port_inputs(inputs)
+        address, enable = np.broadcast_arrays(ports["Addr"], ports.get("MemRead", 1))
+        enable = enable.astype(bool)
+        data = np.zeros(address.shape, dtype=np.uint32)
+        data[enable] = _storage_of(self).read_word(address[enable])
+        return {"ReadData": data}
+
+    def write_ports(self, inputs: Mapping[Union[str, Pin], object]):
+        """Store WriteData at Addr where MemWrite is 1, as at a clock edge."""
+        ports = _port_inputs(inputs)
+        _storage_of(self).write_word(
+            ports["Addr"], ports["WriteData"], ports.get("MemWrite", 1)
+        )
+
 
 class RegisterFile(GenRectangle):
-    """Creates a Register File block."""
+    """Creates a Register File block. Pass storage=RegisterStorage() to hold
+    values; read_ports() and write_ports() then access them through the pin
+    names."""
+
+    _reference_attrs = ("storage",)
 
     def __init__(self, **kwargs):
+        self.storage: Optional[RegisterStorage] = kwargs.pop("storage", None)
         pins_info = [
             {
                 "pin_side": PinSide.LEFT,
@@ -1001,6 +1092,25 @@ class RegisterFile(GenRectangle):
         )
         self.label.shift(DOWN * (self.rectangle_height / 2 - 0.2) + RIGHT * 0.2)
 
+    def read_ports(
+        self, inputs: Mapping[Union[str, Pin], object]
+    ) -> Dict[str, np.ndarray]:
+        """ReadData1 and ReadData2 for the ReadReg1 and ReadReg2 given in inputs."""
+        ports = _port_inputs(inputs)
+        storage = _storage_of(self)
+        return {
+            data: storage.read(ports[reg])
+            for reg, data in (("ReadReg1", "ReadData1"), ("ReadReg2", "ReadData2"))
+            if reg in ports
+        }
+
+    def write_ports(self, inputs: Mapping[Union[str, Pin], object]):
+        """Write WriteData to WriteReg where RegWrite is 1, as at a clock edge."""
+        ports = _port_inputs(inputs)
+        _storage_of(self).write(
+            ports["WriteReg"], ports["WriteData"], ports.get("RegWrite", 1)
+        )
+
 
 class BranchLogic(VGroupLogicObjectBase):
     def __init__(self, **kwargs):
@@ -1013,7 +1123,7 @@ class BranchLogic(VGroupLogicObjectBase):
             - self.shiftleft2.get_output_by_index(0).dot.get_center()
         )
 
-        self.mux2 = Mux(color=WHITE).scale(1.5)
+        self.mux2 = Mux(color=WHITE, bit_width=32).scale(1.5)
         self.mux2.shift(
             self.branch_adder.get_output_by_index(0).dot.get_center()
             - self.mux2.get_input_by_index(1).dot.get_center()
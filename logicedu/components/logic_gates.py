@@ -8,6 +8,8 @@ from manim import (
     WHITE,
     ArcBetweenPoints,
     ArcPolygon,
+    Line,
+    VGroup,
 )
 from manim.typing import Point3DLike
 from ..core.basics import (
@@ -17,7 +19,10 @@ from ..core.basics import (
     VGroupLogicBase,
     VGroupLogicObjectBase,
 )
-from typing import List
+from ..core.prototypes import freeze
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable, List, Optional, Tuple
 import enum
 import numpy as np
 
@@ -36,6 +41,11 @@ class LogicType(enum.Enum):
 class ShapeFactory:
     """Creates shapes for logic gates per MIL-STD-806B."""
 
+    # LRU of shape prototypes by (shape family, create_shape kwargs); see
+    # cached_shape().
+    _shapes: "OrderedDict[Hashable, ArcPolygon]" = OrderedDict()
+    _SHAPES_SIZE = 128
+
     @staticmethod
     def or_radius() -> float:
         return 0.8
@@ -87,6 +97,97 @@ class ShapeFactory:
     def solve_for_y_intercept(radius: float, y: float) -> float:
         return np.sqrt(radius**2 - y**2)
 
+    @staticmethod
+    def shape_family(logic_type: LogicType) -> LogicType:
+        """The logic type whose shape a gate draws: AND, OR or BUF."""
+        match logic_type:
+            case LogicType.AND | LogicType.NAND:
+                return LogicType.AND
+            case LogicType.OR | LogicType.NOR | LogicType.XOR | LogicType.XNOR:
+                return LogicType.OR
+            case _:
+                return LogicType.BUF
+
+    @staticmethod
+    def back_edge_x(logic_type: LogicType) -> float:
+        """x of the top and bottom corners of the gate's input side."""
+        if ShapeFactory.shape_family(logic_type) == LogicType.OR:
+            return -(
+                ShapeFactory.or_radius()
+                - ShapeFactory.solve_for_y_intercept(
+                    ShapeFactory.or_radius(), ShapeFactory.gate_dim() / 2
+                )
+            )
+        return 0.0
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def input_pin_layout(
+        logic_type: LogicType, num_inputs: int
+    ) -> Tuple[Tuple[float, float], ...]:
+        """
+        Height and back-edge intercept of each input pin, top pin first.
+
+        Pins are spaced between_pins() apart, centered on the gate. The intercept
+        is how far left of x=0 the pin meets the gate: on an OR's curved back, or
+        on the extension line that carries pins beyond the body of wide gates.
+        """
+        spacing = ShapeFactory.between_pins(num_inputs)
+        center = ShapeFactory.gate_dim() / 2
+        curved = ShapeFactory.shape_family(logic_type) == LogicType.OR
+        layout = []
+        for i in range(num_inputs):
+            y = center + ((num_inputs - 1) / 2 - i) * spacing
+            offset = min(abs(y - center), ShapeFactory.gate_dim() / 2)
+            intercept = 0.0
+            if curved:
+                radius = ShapeFactory.or_radius()
+                intercept = radius - ShapeFactory.solve_for_y_intercept(radius, offset)
+            layout.append((float(y), float(intercept)))
+        return tuple(layout)
+
+    @staticmethod
+    def extension_lines(
+        logic_type: LogicType, num_inputs: int, x_offset: float = 0, **kwargs
+    ) -> List[Line]:
+        """
+        Lines extending the input side of a gate whose pins don't fit its body.
+
+        Returns no lines for gates of up to three inputs.
+        """
+        layout = ShapeFactory.input_pin_layout(logic_type, num_inputs)
+        top = layout[0][0] + ShapeFactory.edge_to_pin()
+        bottom = layout[-1][0] - ShapeFactory.edge_to_pin()
+        if top <= ShapeFactory.gate_dim() and bottom >= 0:
+            return []
+        x = ShapeFactory.back_edge_x(logic_type) + x_offset
+        return [
+            Line(RIGHT * x + LOGIC_UP, RIGHT * x + UP * top, **kwargs),
+            Line(RIGHT * x, RIGHT * x + UP * bottom, **kwargs),
+        ]
+
+    @staticmethod
+    def cached_shape(logic_type: LogicType, **kwargs) -> ArcPolygon:
+        """
+        create_shape() for gates drawn many times.
+
+        The shape is built once per shape family and set of kwargs, and each call
+        returns a copy of that prototype. The _SHAPES_SIZE most recently used
+        prototypes are kept.
+        """
+        family = ShapeFactory.shape_family(logic_type)
+        key = (family, freeze(kwargs))
+        shapes = ShapeFactory._shapes
+        prototype = shapes.get(key)
+        if prototype is None:
+            prototype = ShapeFactory.create_shape(family, **kwargs)
+            shapes[key] = prototype
+            while len(shapes) > ShapeFactory._SHAPES_SIZE:
+                shapes.popitem(last=False)
+        else:
+            shapes.move_to_end(key)
+        return prototype.copy()
+
     @staticmethod
     def create_shape(logic_type: LogicType, **kwargs) -> ArcPolygon:
         color = kwargs.pop("color", WHITE)
@@ -173,11 +274,14 @@ LOGIC_DOWN = DOWN * ShapeFactory.gate_dim()
 class UnaryLogic(VGroupLogicObjectBase):
     """Creates shapes for unary logic gates per MIL-STD-806B."""
 
+    # Boolean function the gate computes, used by simulation.
+    logic_function: LogicType = LogicType.BUF
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         color = kwargs.pop("color", WHITE)
 
-        self.shape = ShapeFactory.create_shape(LogicType.INV, color=color, **kwargs)
+        self.shape = ShapeFactory.cached_shape(LogicType.INV, color=color, **kwargs)
         self.add(self.shape)
 
         self.pins.append(
@@ -193,32 +297,10 @@ class UnaryLogic(VGroupLogicObjectBase):
         self.add(*self.pins)
 
     def invert_output(self):
-        output_pins = [pin for pin in self.pins if pin.pin_type == PinType.OUTPUT]
+        output_pins = self._get_output_pins()
         if output_pins:
             output_pins[0].add_invert()
 
-    def get_input_by_index(self, index: int) -> Pin:
-        """Return the input Pin at the specified index."""
-        input_pins = [pin for pin in self.pins if pin.pin_type == PinType.INPUT]
-        if 0 <= index < len(input_pins):
-            return input_pins[index]
-        else:
-            raise ValueError(f"Input pin index {index} not found")
-
-    def get_output_by_index(self, index: int) -> Pin:
-        """Return the output Pin at the specified index."""
-        output_pins = [pin for pin in self.pins if pin.pin_type == PinType.OUTPUT]
-        if 0 <= index < len(output_pins):
-            return output_pins[index]
-        else:
-            raise ValueError(f"Output pin index {index} not found")
-
-    def get_input_count(self):
-        return len([pin for pin in self.pins if pin.pin_type == PinType.INPUT])
-
-    def get_output_count(self):
-        return len([pin for pin in self.pins if pin.pin_type == PinType.OUTPUT])
-
     def get_height(self):
         return self.shape.height
 
@@ -234,58 +316,57 @@ class UnaryLogic(VGroupLogicObjectBase):
 
 
 class BinaryLogic(VGroupLogicObjectBase):
+    """
+    Creates shapes for gates of two or more inputs per MIL-STD-806B.
+
+    Gates of up to three inputs fit their pins on the standard body. Wider gates
+    keep the same body and carry the extra pins on extension lines above and
+    below it, spaced ShapeFactory.between_pins() apart.
+
+    Parameters:
+        logic_type (LogicType): Shape to draw
+        num_inputs (int): Number of input pins (default: 2)
+        color: Stroke color (default: WHITE)
+
+    Attributes:
+        shape (ArcPolygon): The gate body, a copy of a cached prototype
+        extension (VGroup): Extension lines of gates wider than three inputs
+    """
+
+    # Boolean function the gate computes, used by simulation. logic_type picks the
+    # drawn shape, which subclasses such as NAND2 share with their base gate.
+    logic_function: Optional[LogicType] = None
+
     def __init__(self, logic_type: LogicType, **kwargs):
         self.num_inputs = kwargs.pop("num_inputs", 2)
+        if self.num_inputs < 2:
+            raise ValueError(
+                f"BinaryLogic needs at least 2 inputs, got {self.num_inputs}"
+            )
         color = kwargs.pop("color", WHITE)
         super().__init__(color=color, **kwargs)
         self.logic_type = logic_type
+        if self.logic_function is None:
+            self.logic_function = logic_type
 
-        pin_starts = List[Point3DLike]
-        outer_pin_intercept = 0  # AND shapes
-        if self.logic_type == LogicType.OR:
-            outer_pin_intercept = (
-                ShapeFactory.or_radius()
-                - ShapeFactory.solve_for_y_intercept(
-                    ShapeFactory.or_radius(),
-                    ShapeFactory.gate_dim() / 2 - ShapeFactory.edge_to_pin(),
-                )
-            )
-        self.shape = ShapeFactory.create_shape(self.logic_type, color=color, **kwargs)
+        self.shape = ShapeFactory.cached_shape(self.logic_type, color=color, **kwargs)
         self.add(self.shape)
-
-        # Create Input Pins for 2 or 3 input gates.
-        # Input 0 measures down from the top of the gate.
-        self.pins.append(
-            Pin(pin_side=PinSide.LEFT, color=color, pin_type=PinType.INPUT).shift(
-                LOGIC_UP + DOWN * ShapeFactory.edge_to_pin()
-            )
+        self.extension = VGroup(
+            *ShapeFactory.extension_lines(self.logic_type, self.num_inputs, color=color)
         )
-        # If there's more than 2 inputs, add the second input to the middle
-        if self.num_inputs > 2:
-            self.pins.append(
-                Pin(pin_side=PinSide.LEFT, color=color, pin_type=PinType.INPUT).shift(
-                    LOGIC_UP / 2
+        if self.extension.submobjects:
+            self.add(self.extension)
+
+        # Input 0 is the top pin. Each pin is shortened to meet the gate's back edge.
+        for y, intercept in ShapeFactory.input_pin_layout(
+            self.logic_type, self.num_inputs
+        ):
+            pin = Pin(pin_side=PinSide.LEFT, color=color, pin_type=PinType.INPUT)
+            if intercept:
+                pin.line.put_start_and_end_on(
+                    pin.line.get_start() + LEFT * intercept, pin.line.get_end()
                 )
-            )
-
-        # The last input measures up from the bottom of the gate.
-        self.pins.append(
-            Pin(pin_side=PinSide.LEFT, color=color, pin_type=PinType.INPUT).shift(
-                UP * ShapeFactory.edge_to_pin()
-            )
-        )
-
-        # Shorten the outermost input pins.
-        input_pins = [pin for pin in self.pins if pin.pin_type == PinType.INPUT]
-        input_pins[0].line.put_start_and_end_on(
-            input_pins[0].line.get_start() + LEFT * outer_pin_intercept,
-            input_pins[0].line.get_end(),
-        )
-        input_pins[self.num_inputs - 1].line.put_start_and_end_on(
-            input_pins[self.num_inputs - 1].line.get_start()
-            + LEFT * outer_pin_intercept,
-            input_pins[self.num_inputs - 1].line.get_end(),
-        )
+            self.pins.append(pin.shift(UP * y))
 
         self.pins.append(
             Pin(pin_side=PinSide.RIGHT, pin_type=PinType.OUTPUT, color=color).shift(
@@ -302,7 +383,7 @@ class BinaryLogic(VGroupLogicObjectBase):
                 self.ex_inputs()
 
     def invert_output(self):
-        output_pins = [pin for pin in self.pins if pin.pin_type == PinType.OUTPUT]
+        output_pins = self._get_output_pins()
         if output_pins:
             output_pins[0].add_invert()
 
@@ -319,43 +400,31 @@ class BinaryLogic(VGroupLogicObjectBase):
             radius=-ShapeFactory.or_radius(),
         ).shift(LEFT * ShapeFactory.ex_offset())
         self.add(ex)
+        if self.extension.submobjects:
+            self.extension.add(
+                *ShapeFactory.extension_lines(
+                    self.logic_type,
+                    self.num_inputs,
+                    x_offset=-ShapeFactory.ex_offset(),
+                    color=self.shape.get_stroke_color(),
+                )
+            )
 
-        input_pins = [pin for pin in self.pins if pin.pin_type == PinType.INPUT]
-        for pin in input_pins:
+        for pin in self._get_input_pins():
             pin.line.put_start_and_end_on(
                 pin.line.get_start() + LEFT * ShapeFactory.ex_offset(),
                 pin.line.get_end(),
             )
 
-    def get_input_by_index(self, index: int) -> Pin:
-        """Return the input Pin at the specified index."""
-        input_pins = [pin for pin in self.pins if pin.pin_type == PinType.INPUT]
-        if 0 <= index < len(input_pins):
-            return input_pins[index]
-        else:
-            raise ValueError(f"Input pin index {index} not found")
-
-    def get_output_by_index(self, index: int) -> Pin:
-        """Return the output Pin at the specified index."""
-        output_pins = [pin for pin in self.pins if pin.pin_type == PinType.OUTPUT]
-        if 0 <= index < len(output_pins):
-            return output_pins[index]
-        else:
-            raise ValueError(f"Output pin index {index} not found")
-
-    def get_input_count(self):
-        return len([pin for pin in self.pins if pin.pin_type == PinType.INPUT])
-
-    def get_output_count(self):
-        return len([pin for pin in self.pins if pin.pin_type == PinType.OUTPUT])
-
     def dim_all(self):
         self.shape.set_stroke(opacity=self.dim_value)
+        self.extension.set_stroke(opacity=self.dim_value)
         for pin in self.pins:
             pin.set_opacity(self.dim_value)
 
     def undim_all(self):
         self.shape.set_stroke(opacity=1)
+        self.extension.set_stroke(opacity=1)
         for pin in self.pins:
             pin.set_opacity(1)
 
@@ -363,6 +432,8 @@ class BinaryLogic(VGroupLogicObjectBase):
 class AND2(BinaryLogic):
     """Create a custom AND2 shape."""
 
+    logic_function = LogicType.AND
+
     def __init__(self, **kwargs):
         super().__init__(LogicType.AND, **kwargs)
 
@@ -370,6 +441,8 @@ class AND2(BinaryLogic):
 class NAND2(AND2):
     """Create a custom NAND2 shape from AND2."""
 
+    logic_function = LogicType.NAND
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # self.invert_output()
@@ -378,6 +451,8 @@ class NAND2(AND2):
 class OR2(BinaryLogic):
     """Create a custom OR2 shape."""
 
+    logic_function = LogicType.OR
+
     def __init__(self, **kwargs):
         super().__init__(LogicType.OR, **kwargs)
 
@@ -385,6 +460,8 @@ class OR2(BinaryLogic):
 class NOR2(OR2):
     """Create a custom NOR2 shape from OR2."""
 
+    logic_function = LogicType.NOR
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.invert_output()
@@ -393,6 +470,8 @@ class NOR2(OR2):
 class XOR2(OR2):
     """Create a custom XOR2 shape from OR2."""
 
+    logic_function = LogicType.XOR
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.ex_inputs()
@@ -401,6 +480,8 @@ class XOR2(OR2):
 class XNOR2(XOR2):
     """Create a custom XNOR shape from XOR2."""
 
+    logic_function = LogicType.XNOR
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.invert_output()
@@ -409,6 +490,8 @@ class XNOR2(XOR2):
 class BUF(UnaryLogic):
     """Create a custom Inv shape."""
 
+    logic_function = LogicType.BUF
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -416,18 +499,31 @@ class BUF(UnaryLogic):
 class INV(BUF):
     """Create a custom INV shape from BUF."""
 
+    logic_function = LogicType.INV
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.invert_output()
 
 
-all_gates = [
-    AND2(num_inputs=2),
-    NAND2(num_inputs=3),
-    OR2(num_inputs=2),
-    NOR2(num_inputs=3),
-    XOR2(num_inputs=2),
-    XNOR2(num_inputs=3),
-    BUF(),
-    INV(),
-]
+def make_all_gates() -> List[VGroupLogicObjectBase]:
+    """Build one instance of every gate, e.g. for a showcase scene."""
+    return [
+        AND2(num_inputs=2),
+        NAND2(num_inputs=3),
+        OR2(num_inputs=2),
+        NOR2(num_inputs=3),
+        XOR2(num_inputs=2),
+        XNOR2(num_inputs=3),
+        BUF(),
+        INV(),
+    ]
+
+
+def __getattr__(name: str):
+    # all_gates is built on first access so importing this module stays cheap.
+    if name == "all_gates":
+        gates = make_all_gates()
+        globals()["all_gates"] = gates
+        return gates
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,378 @@
+"""
+State for the register file and memory blocks.
+
+RegisterFile, DataMemory and InstructionMemory are only drawings until they are
+given storage. RegisterStorage holds the registers in one small NumPy array.
+MemoryStorage holds a byte-addressable memory in a bytearray, or in a
+memory-mapped file for large images, and views the same bytes as 32-bit words.
+Every read and write takes arrays of addresses as well as single addresses, and
+images are loaded with a single copy rather than a Python loop.
+
+load_image() opens program images: raw binaries and the code segment of an ELF
+executable are memory-mapped in place, so a multi-megabyte program is ready
+without reading it; hex files (Intel HEX, or one hex word per line) are parsed.
+"""
+
+import os
+import struct
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..core.basics import word_dtype
+
+# Things a memory image can be loaded from.
+Image = Union[bytes, bytearray, memoryview, np.ndarray]
+
+_ELF_MAGIC = b"\x7fELF"
+_PT_LOAD = 1
+_PF_X = 1
+_HEX_SUFFIXES = (".hex", ".ihex", ".ihx")
+
+
+class RegisterStorage:
+    """
+    Registers in a NumPy array.
+
+    Parameters:
+        num_registers (int): Number of registers (default: 32)
+        bit_width (int): Width of each register (default: 32)
+        zero_register (bool): Register 0 always reads 0 and ignores writes, as
+            in MIPS (default: True)
+
+    Attributes:
+        values (np.ndarray): The register values
+
+    Examples:
+        >>> regs = RegisterStorage()
+        >>> regs.write([8, 9], [5, 7])
+        >>> regs.read([9, 8, 0])  # array([7, 5, 0], dtype=uint32)
+    """
+
+    def __init__(
+        self, num_registers: int = 32, bit_width: int = 32, zero_register: bool = True
+    ):
+        self.bit_width = bit_width
+        self.zero_register = zero_register
+        self.values = np.zeros(num_registers, dtype=word_dtype(bit_width))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _numbers(self, number) -> np.ndarray:
+        number = np.asarray(number)
+        if number.size and (number.min() < 0 or number.max() >= len(self.values)):
+            raise ValueError(f"Register number out of range: {number}")
+        return number.astype(np.intp)
+
+    def read(self, number) -> np.ndarray:
+        """Values of one register or an array of registers."""
+        return self.values[self._numbers(number)]
+
+    def write(self, number, value, enable=1):
+        """
+        Write registers where enable is set. Writes are applied in order, so the
+        last write to a register wins.
+        """
+        number, value, enable = np.broadcast_arrays(
+            np.asarray(number), np.asarray(value), np.asarray(enable)
+        )
+        selected = enable.astype(bool)
+        if self.zero_register:
+            selected &= number != 0
+        mask = (1 << self.bit_width) - 1
+        number = self._numbers(number[selected])
+        self.values[number] = value[selected].astype(np.uint64) & mask
+
+    def load(self, values):
+        """Set the registers from the start, e.g. from a saved state."""
+        values = np.asarray(values)
+        self.values[: len(values)] = values
+        if self.zero_register:
+            self.values[0] = 0
+
+    def __repr__(self):
+        return f"RegisterStorage({len(self.values)} x {self.bit_width} bits)"
+
+
+class MemoryStorage:
+    """
+    Byte-addressable memory in a NumPy buffer.
+
+    Parameters:
+        size (int): Size in bytes, a multiple of 4
+        base (int): Address of the first byte (default: 0)
+        byteorder (str): Order of the bytes in a word, "little" or "big"
+            (default: "little")
+        buffer: A bytearray, uint8 array or memmap to use instead of a new
+            zeroed bytearray; size is then taken from it
+
+    Attributes:
+        bytes (np.ndarray): The memory as uint8
+        words (np.ndarray): The same memory as 32-bit words
+        entry (int): Start address of a loaded program (default: base)
+
+    Examples:
+        >>> dmem = MemoryStorage(1 << 20, base=0x10010000)
+        >>> dmem.load(open("data.bin", "rb").read())
+        >>> dmem.read_word([0x10010000, 0x10010004])
+        >>> imem = MemoryStorage.from_file("program.bin", base=0x00400000)
+    """
+
+    def __init__(
+        self,
+        size: int = 0,
+        base: int = 0,
+        byteorder: str = "little",
+        buffer: Optional[Union[bytearray, np.ndarray]] = None,
+    ):
+        if byteorder not in ("little", "big"):
+            raise ValueError(f"byteorder must be 'little' or 'big', got {byteorder}")
+        if buffer is None:
+            buffer = bytearray(size)
+        if isinstance(buffer, bytearray):
+            self.bytes = np.frombuffer(buffer, dtype=np.uint8)
+        else:
+            self.bytes = buffer.view(np.uint8)
+        if len(self.bytes) % 4:
+            raise ValueError(f"Memory size must be a multiple of 4, got {len(self)}")
+        self.base = base
+        self.entry = base
+        self.byteorder = byteorder
+        word = np.dtype("<u4" if byteorder == "little" else ">u4")
+        self.words = self.bytes.view(word)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Union[str, os.PathLike],
+        base: int = 0,
+        byteorder: str = "little",
+        writable: bool = False,
+        offset: int = 0,
+        size: Optional[int] = None,
+    ) -> "MemoryStorage":
+        """
+        Map size bytes (default: the rest of the file) of a raw binary image,
+        starting at offset in the file. Writes change the file only if writable
+        is set; otherwise they stay in memory. A read-only image that isn't a
+        whole number of words is read and padded with zeros instead of mapped.
+        """
+        if size is None:
+            size = os.path.getsize(path) - offset
+        if size % 4 or size == 0:
+            if writable:
+                raise ValueError(f"{path} is {size} bytes, not whole words")
+            with open(path, "rb") as f:
+                f.seek(offset)
+                buffer = bytearray(f.read(size)) + bytes(-size % 4)
+        else:
+            mode = "r+" if writable else "c"
+            buffer = np.memmap(path, mode=mode, offset=offset, shape=(size,))
+        return cls(base=base, byteorder=byteorder, buffer=buffer)
+
+    @classmethod
+    def from_elf(cls, path: Union[str, os.PathLike]) -> "MemoryStorage":
+        """
+        The code of an ELF executable, 32- or 64-bit, in its own byte order.
+        base is the address of the executable segments (all loadable segments
+        if none is marked executable) and entry the ELF entry point. A single
+        segment stored as whole words is mapped copy-on-write; otherwise the
+        segments are copied into one memory and their .bss is zeroed.
+        """
+        with open(path, "rb") as f:
+            header = f.read(64)
+            if header[:4] != _ELF_MAGIC:
+                raise ValueError(f"{path} is not an ELF file")
+            wide = header[4] == 2
+            order = "<" if header[5] == 1 else ">"
+            fields = struct.unpack_from(
+                order + ("HHIQQQIHHH" if wide else "HHIIIIIHHH"), header, 16
+            )
+            entry, phoff, phentsize, phnum = fields[3], fields[4], fields[8], fields[9]
+            f.seek(phoff)
+            table = f.read(phentsize * phnum)
+        segments: List[Tuple[int, int, int, int, int]] = []
+        for i in range(phnum):
+            if wide:
+                kind, flags, offset, vaddr, _, filesz, memsz, _ = struct.unpack_from(
+                    order + "IIQQQQQQ", table, i * phentsize
+                )
+            else:
+                kind, offset, vaddr, _, filesz, memsz, flags, _ = struct.unpack_from(
+                    order + "IIIIIIII", table, i * phentsize
+                )
+            if kind == _PT_LOAD and memsz:
+                segments.append((flags, offset, vaddr, filesz, memsz))
+        code = [s for s in segments if s[0] & _PF_X] or segments
+        if not code:
+            raise ValueError(f"{path} has no loadable segments")
+        byteorder = "little" if order == "<" else "big"
+
+        _, offset, vaddr, filesz, memsz = code[0]
+        if len(code) == 1 and filesz == memsz and not (offset | filesz) % 4:
+            memory = cls.from_file(
+                path, base=vaddr, byteorder=byteorder, offset=offset, size=filesz
+            )
+        else:
+            start = min(s[2] for s in code) & ~3
+            end = max(s[2] + s[4] for s in code)
+            memory = cls(end - start + (-(end - start) % 4), start, byteorder)
+            with open(path, "rb") as f:
+                for _, offset, vaddr, filesz, _ in code:
+                    f.seek(offset)
+                    memory.load(f.read(filesz), address=vaddr)
+        memory.entry = entry
+        return memory
+
+    @classmethod
+    def from_hex(
+        cls,
+        path: Union[str, os.PathLike],
+        base: int = 0,
+        byteorder: str = "little",
+    ) -> "MemoryStorage":
+        """
+        Parse a hex image: Intel HEX records, which carry their own addresses,
+        or hexadecimal words starting at base ("#" comments and a Logisim
+        "v2.0 raw" header are skipped, and Logisim's "N*word" repeats a word N
+        times).
+
+        Raises:
+            ValueError: If a record or word is malformed, or a word does not fit
+                in 32 bits
+        """
+        with open(path) as f:
+            lines = [line.split("#")[0].strip() for line in f]
+        lines = [line for line in lines if line and line != "v2.0 raw"]
+        if not lines or not lines[0].startswith(":"):
+            counts, values = [], []
+            for entry in (word for line in lines for word in line.split()):
+                count, _, word = entry.rpartition("*")
+                try:
+                    counts.append(int(count) if count else 1)
+                    values.append(int(word, 16))
+                except ValueError:
+                    raise ValueError(f"Bad hex word in {path}: {entry}") from None
+                if not 0 <= values[-1] <= 0xFFFF_FFFF:
+                    raise ValueError(
+                        f"Hex word in {path} does not fit in 32 bits: {entry}"
+                    )
+            words = np.repeat(np.array(values, dtype=np.uint32), counts)
+            memory = cls(4 * len(words), base, byteorder)
+            memory.load(words)
+            return memory
+
+        chunks: List[Tuple[int, bytes]] = []
+        upper, entry = 0, None
+        for line in lines:
+            record = bytes.fromhex(line[1:])
+            if len(record) < 5 or len(record) != record[0] + 5 or sum(record) & 0xFF:
+                raise ValueError(f"Bad Intel HEX record in {path}: {line}")
+            address = int.from_bytes(record[1:3], "big")
+            kind, data = record[3], record[4:-1]
+            match kind:
+                case 0:
+                    chunks.append((upper + address, data))
+                case 1:
+                    break
+                case 2:
+                    upper = int.from_bytes(data, "big") << 4
+                case 4:
+                    upper = int.from_bytes(data, "big") << 16
+                case 5:
+                    entry = int.from_bytes(data, "big")
+        start = min((a for a, _ in chunks), default=0) & ~3
+        end = max((a + len(d) for a, d in chunks), default=start)
+        memory = cls(end - start + (-(end - start) % 4), start, byteorder)
+        for address, data in chunks:
+            memory.load(data, address=address)
+        memory.entry = start if entry is None else entry
+        return memory
+
+    def __len__(self) -> int:
+        return len(self.bytes)
+
+    @property
+    def end(self) -> int:
+        """Address just past the last byte."""
+        return self.base + len(self.bytes)
+
+    def _offsets(self, address, alignment: int) -> np.ndarray:
+        offset = np.asarray(address, dtype=np.int64) - self.base
+        if offset.size:
+            if offset.min() < 0 or offset.max() + alignment > len(self.bytes):
+                raise ValueError(f"Address out of range: {address}")
+            if alignment > 1 and np.any(offset % alignment):
+                raise ValueError(f"Unaligned word address: {address}")
+        return offset
+
+    def _image_bytes(self, image: Image) -> np.ndarray:
+        if isinstance(image, np.ndarray):
+            if image.dtype.itemsize == 4 and image.dtype.kind in "ui":
+                image = image.astype(self.words.dtype, copy=False)
+            return image.reshape(-1).view(np.uint8)
+        return np.frombuffer(image, dtype=np.uint8)
+
+    def load(self, image: Image, address: Optional[int] = None):
+        """
+        Copy an image into memory at address (default: base). Bytes-like images
+        are raw bytes; arrays of 32-bit integers are words in this byte order.
+        """
+        data = self._image_bytes(image)
+        start = int(self._offsets(self.base if address is None else address, 1))
+        if start + len(data) > len(self.bytes):
+            raise ValueError(
+                f"Image of {len(data)} bytes does not fit at {address or self.base:#x}"
+            )
+        self.bytes[start : start + len(data)] = data
+
+    def read_word(self, address) -> np.ndarray:
+        """Words at one address or an array of word-aligned addresses."""
+        return self.words[self._offsets(address, 4) >> 2]
+
+    def write_word(self, address, value, enable=1):
+        """Write words where enable is set, in order."""
+        address, value, enable = np.broadcast_arrays(
+            np.asarray(address), np.asarray(value), np.asarray(enable)
+        )
+        selected = enable.astype(bool)
+        offset = self._offsets(address[selected], 4)
+        self.words[offset >> 2] = value[selected].astype(np.uint64) & 0xFFFF_FFFF
+
+    def read_byte(self, address) -> np.ndarray:
+        return self.bytes[self._offsets(address, 1)]
+
+    def write_byte(self, address, value, enable=1):
+        address, value, enable = np.broadcast_arrays(
+            np.asarray(address), np.asarray(value), np.asarray(enable)
+        )
+        selected = enable.astype(bool)
+        offset = self._offsets(address[selected], 1)
+        self.bytes[offset] = value[selected].astype(np.uint64) & 0xFF
+
+    def __repr__(self):
+        return (
+            f"MemoryStorage({len(self.bytes)} bytes at {self.base:#x}, "
+            f"{self.byteorder}-endian)"
+        )
+
+
+def load_image(
+    path: Union[str, os.PathLike], base: int = 0, byteorder: str = "little"
+) -> MemoryStorage:
+    """
+    Open a program image for InstructionMemory: an ELF executable (by its
+    header), a hex file (.hex, .ihex or .ihx) or else a raw binary, which is
+    memory-mapped at base. ELF images carry their own base and byte order.
+
+    Examples:
+        >>> imem = InstructionMemory(storage=load_image("program.elf"))
+        >>> imem.storage.entry, imem.storage.read_word(imem.storage.entry)
+    """
+    with open(path, "rb") as f:
+        if f.read(4) == _ELF_MAGIC:
+            return MemoryStorage.from_elf(path)
+    if os.fspath(path).lower().endswith(_HEX_SUFFIXES):
+        return MemoryStorage.from_hex(path, base=base, byteorder=byteorder)
+    return MemoryStorage.from_file(path, base=base, byteorder=byteorder)
@@ -5,6 +5,12 @@ This module contains the fundamental building blocks:
 - Pin system for component connections
 - Connector system for wiring
 - Grid utilities
+- Netlist extraction from connected pins
+- Manhattan wire routing around components
+- Spatial index for hit-testing and layout checks
+- Baked rendering for static components
+- Label cache for repeated Text labels
+- Prototype registry for repeated components
 """
 
 from .basics import (
@@ -17,6 +23,30 @@ from .basics import (
     GRID,
     VGroupLogicBase,
 )
+from .netlist import (
+    Net,
+    Netlist,
+)
+from .routing import (
+    Router,
+    RoutingGrid,
+    route_all,
+)
+from .baking import BakedComponent
+from .spatial import (
+    EntryKind,
+    SpatialIndex,
+)
+from .label_cache import (
+    LabelCache,
+    label_cache,
+    cached_text,
+)
+from .prototypes import (
+    PrototypeRegistry,
+    prototypes,
+    clone,
+)
 
 __all__ = [
     "Pin",
@@ -27,4 +57,18 @@ __all__ = [
     "create_grid",
     "GRID",
     "VGroupLogicBase",
+    "Net",
+    "Netlist",
+    "Router",
+    "RoutingGrid",
+    "route_all",
+    "BakedComponent",
+    "EntryKind",
+    "SpatialIndex",
+    "LabelCache",
+    "label_cache",
+    "cached_text",
+    "PrototypeRegistry",
+    "prototypes",
+    "clone",
 ]
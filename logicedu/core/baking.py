@@ -0,0 +1,136 @@
+"""
+Baked rendering for static components.
+
+A component such as a RegisterFile is a tree of dozens of mobjects: every Pin
+alone is a Line, a Dot and possibly a bus slash, labels and a bubble. Manim
+walks and rasterizes each of them every frame. Baking merges all the strokes and
+fills that share a style into one VMobject path each, so a component renders as
+a handful of mobjects. Each label is merged into a path of its own, so text can
+still be told apart from the strokes and dimmed separately.
+
+The original component is kept, off-scene, as BakedComponent.source and moves
+together with the baked copy, so pin lookups, pin end coordinates, netlists and
+routing keep working as before.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+from manim import SVGMobject, VMobject
+
+from .basics import Pin, VGroupLogicObjectBase
+
+_StyleKey = Tuple[str, float, float, str, float]
+
+
+def _style_key(mob: VMobject) -> _StyleKey:
+    return (
+        mob.get_stroke_color().to_hex(),
+        round(float(mob.get_stroke_width()), 4),
+        round(float(mob.get_stroke_opacity()), 4),
+        mob.get_fill_color().to_hex(),
+        round(float(mob.get_fill_opacity()), 4),
+    )
+
+
+def _merge(mobs: List[VMobject]) -> List[VMobject]:
+    """One VMobject per distinct style, holding the points of every mob with that style."""
+    groups: Dict[_StyleKey, List[VMobject]] = {}
+    for mob in mobs:
+        groups.setdefault(_style_key(mob), []).append(mob)
+    paths = []
+    for (stroke, width, stroke_opacity, fill, fill_opacity), group in groups.items():
+        path = VMobject()
+        path.set_points(np.concatenate([mob.points for mob in group]))
+        path.set_stroke(stroke, width, stroke_opacity)
+        path.set_fill(fill, fill_opacity)
+        paths.append(path)
+    return paths
+
+
+class BakedComponent(VGroupLogicObjectBase):
+    """
+    A component drawn as a few merged paths plus its labels.
+
+    Build one with component.bake(). Moving, scaling or rotating the baked
+    component moves the source too, including when done with .animate; other
+    animations that rewrite points directly (Transform, ReplacementTransform)
+    leave the source behind.
+
+    Parameters:
+        source (VGroupLogicObjectBase): The component to bake
+
+    Attributes:
+        source (VGroupLogicObjectBase): The original component, not part of the
+            scene; it owns the pins
+        paths (List[VMobject]): One merged path per stroke and fill style
+        labels (List[VMobject]): The component's text, one merged path per label
+
+    Examples:
+        >>> regfile = RegisterFile().shift(RIGHT * 2).bake()
+        >>> regfile.get_input_by_label("ReadReg1").line.get_end()
+        >>> regfile.shift(UP)  # pins move with it
+        >>> self.add(regfile)
+    """
+
+    def __init__(self, source: VGroupLogicObjectBase, **kwargs):
+        super().__init__(**kwargs)
+        self.source = source
+        self.pins = source.pins
+        self.dim_value = source.dim_value
+
+        shapes: List[VMobject] = []
+        self.labels: List[VMobject] = []
+        pending = list(source.submobjects)
+        while pending:
+            mob = pending.pop(0)
+            if isinstance(mob, SVGMobject):
+                # Each label's glyphs become one path of their own.
+                self.labels.extend(_merge(mob.family_members_with_points()))
+                continue
+            pending[:0] = mob.submobjects
+            if isinstance(mob, VMobject) and mob.has_points():
+                shapes.append(mob)
+        self.paths: List[VMobject] = _merge(shapes)
+        self._opacities = [
+            (path.get_stroke_opacity(), path.get_fill_opacity()) for path in self.paths
+        ]
+        self.add(*self.paths, *self.labels)
+
+    def get_owned_pins(self) -> List[Pin]:
+        """The source's pins; they stay owned by the source component."""
+        return self.source.get_owned_pins()
+
+    def unbake(self) -> VGroupLogicObjectBase:
+        """Return the source component, in the baked component's current position."""
+        return self.source
+
+    def shift(self, *vectors):
+        super().shift(*vectors)
+        self.source.shift(*vectors)
+        return self
+
+    def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+        if about_point is None:
+            about_point = self.get_critical_point(
+                about_edge if about_edge is not None else np.zeros(3)
+            )
+        super().apply_points_function_about_point(func, about_point)
+        self.source.apply_points_function_about_point(func, about_point)
+        return self
+
+    def dim_all(self):
+        super().dim_all()
+        for path, (stroke_opacity, fill_opacity) in zip(self.paths, self._opacities):
+            path.set_stroke(opacity=stroke_opacity * self.dim_value)
+            path.set_fill(opacity=fill_opacity * self.dim_value)
+        for label in self.labels:
+            label.set_opacity(self.dim_value)
+
+    def undim_all(self):
+        super().undim_all()
+        for path, (stroke_opacity, fill_opacity) in zip(self.paths, self._opacities):
+            path.set_stroke(opacity=stroke_opacity)
+            path.set_fill(opacity=fill_opacity)
+        for label in self.labels:
+            label.set_opacity(1)
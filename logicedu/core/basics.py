@@ -9,20 +9,110 @@ from manim import (
     ORIGIN,
     PI,
     RIGHT,
-    Text,
     UP,
     VGroup,
     WHITE,
     NumberPlane,
 )
+import contextlib
+import copy
 import enum
+import re
+import weakref
 from manim.typing import Point3DLike
 import numpy as np
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .label_cache import cached_text
 
 
 GRID = 0.1
 
+# memo key under which VGroupLogicBase.__deepcopy__ collects deferred references.
+_DEFERRED_REFERENCES = "_logicedu_deferred_references"
+
+# Netlists recording the wires created while they are active; see Netlist.__enter__.
+_recording_netlists: list = []
+
+
+def _record_wire(wire):
+    """Add a wire to every recording Netlist if it joins two pins."""
+    if wire.start_pin is not None and wire.end_pin is not None:
+        for netlist in _recording_netlists:
+            netlist.add_wire(wire)
+
+
+# SpatialIndexes to tell when a logic object is moved; see SpatialIndex.
+_spatial_indexes: "weakref.WeakSet" = weakref.WeakSet()
+
+
+@contextlib.contextmanager
+def _recording_paused():
+    """Temporarily stop netlists from recording, e.g. while building off-scene objects."""
+    saved = _recording_netlists[:]
+    _recording_netlists.clear()
+    try:
+        yield
+    finally:
+        _recording_netlists[:] = saved
+
+
+# A trailing bit slice in a pin label, e.g. "inst[31:26]" or "inst[5]".
+_BIT_RANGE = re.compile(r"\[(\d+)(?::(\d+))?\]$")
+
+
+def parse_bit_range(label: str) -> Optional[Tuple[int, int]]:
+    """Return (high, low) of a label ending in a bit slice, else None."""
+    match = _BIT_RANGE.search(label)
+    if match is None:
+        return None
+    high = int(match.group(1))
+    low = int(match.group(2)) if match.group(2) is not None else high
+    return (max(high, low), min(high, low))
+
+
+def word_dtype(bit_width: int) -> np.dtype:
+    """Smallest unsigned NumPy integer type holding bit_width bits."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if bit_width <= np.dtype(dtype).itemsize * 8:
+            return np.dtype(dtype)
+    raise ValueError(f"Pins wider than 64 bits are not supported, got {bit_width}")
+
+
+def width_error(start_pin: "Pin", end_pin: "Pin") -> Optional[str]:
+    """
+    Describe why two pins can't be connected, or return None if they can.
+
+    The pins must have the same bit_width, unless the reading pin has a
+    bit_range, in which case the range must fit the driving pin and be as wide
+    as the reading pin.
+    """
+    driver, load = start_pin, end_pin
+    if start_pin.pin_type == PinType.INPUT and end_pin.pin_type == PinType.OUTPUT:
+        driver, load = end_pin, start_pin
+    if load.bit_range is not None:
+        high, low = load.bit_range
+        if high >= driver.bit_width:
+            return (
+                f"{load} reads bits [{high}:{low}] of {driver}, "
+                f"which is only {driver.bit_width} bits wide"
+            )
+        if high - low + 1 != load.bit_width:
+            return f"{load} reads bits [{high}:{low}] but is {load.bit_width} bits wide"
+        return None
+    if driver.bit_width != load.bit_width:
+        return (
+            f"Cannot connect {driver.bit_width}-bit {driver} "
+            f"to {load.bit_width}-bit {load}"
+        )
+    return None
+
+
+def _check_width(wire: "VGroupLogicBase"):
+    error = width_error(wire.start_pin, wire.end_pin)
+    if error is not None:
+        raise ValueError(error)
+
 
 def grid_round(x: float) -> float:
     """Round a float to 1 decimal place to bring order to wire routing."""
@@ -48,10 +138,55 @@ class PinType(enum.Enum):
 class VGroupLogicBase(VGroup):
     """Base class for all logic objects."""
 
+    # Attributes that point at mobjects this object doesn't own, e.g. a Pin's owner
+    # or a ConnectorLine's pins. Copies keep the reference rather than copying the
+    # target, unless the target is copied in the same deepcopy, in which case the
+    # copy points at the target's copy.
+    _reference_attrs: tuple = ()
+
     def __init__(self, **kwargs):
         self.dim_value = kwargs.pop("dim_value", 0.3)
         super().__init__(**kwargs)
 
+    def __deepcopy__(self, memo):
+        deferred = memo.get(_DEFERRED_REFERENCES)
+        outermost = deferred is None
+        if outermost:
+            deferred = memo[_DEFERRED_REFERENCES] = []
+
+        cls = self.__class__
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        for k, v in self.__dict__.items():
+            if k in self._reference_attrs:
+                deferred.append((result, k, v))
+                setattr(result, k, v)
+            else:
+                setattr(result, k, copy.deepcopy(v, memo))
+        result.original_id = str(id(self))
+
+        # References are resolved once everything reachable has been copied.
+        if outermost:
+            for obj, k, v in deferred:
+                setattr(obj, k, memo.get(id(v), v))
+            del memo[_DEFERRED_REFERENCES]
+        return result
+
+    # Moves and transforms made through a logic object are reported to the spatial
+    # indexes holding it. Everything else (scale, rotate, move_to, next_to, ...)
+    # goes through one of these two methods.
+    def shift(self, *vectors):
+        super().shift(*vectors)
+        for index in _spatial_indexes:
+            index.mark_moved(self)
+        return self
+
+    def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+        super().apply_points_function_about_point(func, about_point, about_edge)
+        for index in _spatial_indexes:
+            index.mark_moved(self)
+        return self
+
     def dim_all(self):
         pass
 
@@ -74,6 +209,7 @@ class Pin(VGroupLogicBase):
         bus_line (Line, optional): Visual indicator for multi-bit connections
         bus_text (Text, optional): Bit width indicator for bus connections
         circle (Circle, optional): Inversion bubble for inverted pins
+        value (np.ndarray, optional): Simulated values, one per cycle; see set_value()
 
     Parameters:
         pin_side (PinSide): Which side of the component the pin is on (LEFT, RIGHT, TOP, BOTTOM)
@@ -83,6 +219,9 @@ class Pin(VGroupLogicBase):
         show_label (bool): Whether to display the label (default: False)
         inner_label (bool): Whether to place label inside or outside component (default: True)
         bit_width (int): Number of bits for bus connections; >1 generates a bus slash and bit-width text (default: 1)
+        show_width (bool): Whether a bus draws its slash and bit-width text (default: True)
+        bit_range (Tuple[int, int]): (high, low) bits of the driving bus this input
+            reads; parsed from labels such as "inst[31:26]" when not given
         dot_radius (float): Radius of the connection dot (default: 0.05)
         not_bubble_radius (float): Radius of inversion bubble (default: 0.06)
         font_size (int): Font size for labels (default: 14)
@@ -101,7 +240,11 @@ class Pin(VGroupLogicBase):
         >>> inv_pin.add_invert()
     """
 
+    _reference_attrs = ("owner",)
+
     def __init__(self, **kwargs):
+        # Component this pin belongs to; set when the component adds the pin.
+        self.owner = None
         self.inner_label = kwargs.pop("inner_label", True)
         self.label_str = kwargs.pop("label", "")
         self.show_label = kwargs.pop("show_label", False)
@@ -111,7 +254,12 @@ class Pin(VGroupLogicBase):
         self.dot_radius = kwargs.pop("dot_radius", 0.05)
         self.not_bubble_radius = kwargs.pop("not_bubble_radius", 0.12 / 2)
         self.bit_width = kwargs.pop("bit_width", 1)
+        self.show_width = kwargs.pop("show_width", True)
+        self.bit_range: Optional[Tuple[int, int]] = kwargs.pop(
+            "bit_range", parse_bit_range(self.label_str)
+        )
         self.font_size = kwargs.pop("font_size", 14)
+        self.value: Optional[np.ndarray] = None
         super().__init__(**kwargs)
 
         # bus starts -0.15 in from the end.
@@ -157,19 +305,21 @@ class Pin(VGroupLogicBase):
         self.add(self.line, self.dot)
 
         # Bus line
-        if self.bit_width > 1:
+        if self.bit_width > 1 and self.show_width:
             self.bus_line = Line(
                 start=bus_start,
                 end=bus_end,
                 color=color,
             )
-            self.bus_text = Text(
+            self.bus_text = cached_text(
                 f"{self.bit_width}", font_size=self.font_size, **kwargs
             ).next_to(self.bus_line, text_next_to)
             self.add(self.bus_line, self.bus_text)
 
         if self.show_label:
-            self.label = Text(self.label_str, font_size=self.font_size, color=color)
+            self.label = cached_text(
+                self.label_str, font_size=self.font_size, color=color
+            )
             if self.inner_label:
                 match self.pin_side:
                     case PinSide.LEFT:
@@ -226,6 +376,45 @@ class Pin(VGroupLogicBase):
     def __str__(self):
         return f"Pin(label={self.label_str}, side={self.pin_side}, length={self.pin_length}, type={self.pin_type})"
 
+    @property
+    def mask(self) -> int:
+        """All ones in the pin's bit_width."""
+        return (1 << self.bit_width) - 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        """NumPy type of the pin's values; see word_dtype()."""
+        return word_dtype(self.bit_width)
+
+    def set_value(self, values) -> "Pin":
+        """
+        Set the pin's simulated values: an integer or one integer per cycle.
+
+        Raises:
+            ValueError: If a value doesn't fit in bit_width bits
+        """
+        values = np.atleast_1d(np.asarray(values))
+        if values.dtype.kind == "b":
+            values = values.astype(np.uint8)
+        if values.dtype.kind not in "ui":
+            raise TypeError(f"Pin values must be integers, got {values.dtype}")
+        if values.size and (values.min() < 0 or int(values.max()) > self.mask):
+            raise ValueError(
+                f"Value out of range for {self.bit_width}-bit {self}: "
+                f"{int(values.max()) if values.min() >= 0 else int(values.min())}"
+            )
+        self.value = values.astype(self.dtype)
+        return self
+
+    def get_value(self) -> Optional[np.ndarray]:
+        return self.value
+
+    def read(self, driver_values: np.ndarray) -> np.ndarray:
+        """The part of a driving bus's values this pin sees, using bit_range."""
+        values = np.asarray(driver_values, dtype=np.uint64)
+        low = self.bit_range[1] if self.bit_range is not None else 0
+        return ((values >> np.uint64(low)) & np.uint64(self.mask)).astype(self.dtype)
+
     def dim_all(self):
         super().dim_all()
         self.line.set_opacity(self.dim_value)
@@ -245,25 +434,149 @@ class Pin(VGroupLogicBase):
             self.bus_text.set_opacity(1)
 
 
+class PinList(list):
+    """
+    List of a component's pins that keeps lookup indexes in sync.
+
+    Appending or extending updates the per-type lists and the label dictionaries
+    incrementally; any other mutation rebuilds them. When several pins share a
+    label the first one wins, as with a linear search.
+
+    Attributes:
+        inputs (List[Pin]): Input pins in list order
+        outputs (List[Pin]): Output pins in list order
+        by_label (Dict[str, Pin]): First pin with each label
+        inputs_by_label (Dict[str, Pin]): First input pin with each label
+        outputs_by_label (Dict[str, Pin]): First output pin with each label
+    """
+
+    def __init__(self, pins=()):
+        super().__init__(pins)
+        self._reindex()
+
+    def _reindex(self):
+        self.inputs: List[Pin] = []
+        self.outputs: List[Pin] = []
+        self.by_label: Dict[str, Pin] = {}
+        self.inputs_by_label: Dict[str, Pin] = {}
+        self.outputs_by_label: Dict[str, Pin] = {}
+        for pin in self:
+            self._index(pin)
+
+    def _index(self, pin: Pin):
+        label = getattr(pin, "label_str", None)
+        self.by_label.setdefault(label, pin)
+        if pin.pin_type == PinType.INPUT:
+            self.inputs.append(pin)
+            self.inputs_by_label.setdefault(label, pin)
+        elif pin.pin_type == PinType.OUTPUT:
+            self.outputs.append(pin)
+            self.outputs_by_label.setdefault(label, pin)
+
+    def append(self, pin: Pin):
+        super().append(pin)
+        self._index(pin)
+
+    def extend(self, pins):
+        pins = list(pins)
+        super().extend(pins)
+        for pin in pins:
+            self._index(pin)
+
+    def __iadd__(self, pins):
+        self.extend(pins)
+        return self
+
+    def __deepcopy__(self, memo):
+        return type(self)(copy.deepcopy(list(self), memo))
+
+
+def _reindexing(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._reindex()
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "insert",
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+):
+    setattr(PinList, _name, _reindexing(_name))
+
+
 class VGroupLogicObjectBase(VGroupLogicBase):
     """Base class for all LogicObject objects."""
 
     def __init__(self, **kwargs):
         self.dim_value = kwargs.pop("dim_value", 0.3)
-        self.pins: List[Pin] = []
+        self.pins = PinList()
         super().__init__(**kwargs)
 
+    @property
+    def pins(self) -> PinList:
+        return self._pins
+
+    @pins.setter
+    def pins(self, pins):
+        self._pins = pins if isinstance(pins, PinList) else PinList(pins)
+
+    def add(self, *vmobjects):
+        super().add(*vmobjects)
+        for mob in vmobjects:
+            if isinstance(mob, Pin) and mob.owner is None:
+                mob.owner = self
+        return self
+
+    def get_owned_pins(self) -> List[Pin]:
+        """Return the Pins this component added directly, in the order added."""
+        return [
+            mob
+            for mob in self.submobjects
+            if isinstance(mob, Pin) and mob.owner is self
+        ]
+
     def dim_all(self):
         super().dim_all()
 
     def undim_all(self):
         super().undim_all()
 
+    def bake(self) -> "VGroupLogicObjectBase":
+        """
+        Return a BakedComponent that draws this component with a few merged paths.
+
+        Use it for components that won't be restyled piece by piece: the baked copy
+        renders far fewer mobjects per frame but can only be dimmed as a whole.
+        """
+        from .baking import BakedComponent
+
+        return BakedComponent(self)
+
     def _get_input_pins(self) -> List[Pin]:
-        return [pin for pin in self.pins if pin.pin_type == PinType.INPUT]
+        """Input pins in order. This is the live index; don't modify it."""
+        return self.pins.inputs
 
     def _get_output_pins(self) -> List[Pin]:
-        return [pin for pin in self.pins if pin.pin_type == PinType.OUTPUT]
+        """Output pins in order. This is the live index; don't modify it."""
+        return self.pins.outputs
+
+    def get_input_count(self) -> int:
+        return len(self.pins.inputs)
+
+    def get_output_count(self) -> int:
+        return len(self.pins.outputs)
 
     def get_input_by_index(self, index: int) -> Pin:
         input_pins = self._get_input_pins()
@@ -284,18 +597,36 @@ class VGroupLogicObjectBase(VGroupLogicBase):
             )
 
     def get_input_by_label(self, label):
-        for pin in self._get_input_pins():
-            if getattr(pin, "label_str", None) == label:
-                return pin
-        print(f"No input pin found with label '{label}': {self._get_input_pins()}")
-        return None
+        pin = self.pins.inputs_by_label.get(label)
+        if pin is None:
+            print(f"No input pin found with label '{label}': {self._get_input_pins()}")
+        return pin
 
     def get_output_by_label(self, label):
-        for pin in self._get_output_pins():
-            if getattr(pin, "label_str", None) == label:
-                return pin
-        print(f"No output pin found with label '{label}': {self._get_output_pins()}")
-        return None
+        pin = self.pins.outputs_by_label.get(label)
+        if pin is None:
+            print(
+                f"No output pin found with label '{label}': {self._get_output_pins()}"
+            )
+        return pin
+
+    def get_pins(
+        self, labels: List[str], pin_type: Optional[PinType] = None
+    ) -> List[Optional[Pin]]:
+        """Look up several pins by label at once; missing labels give None.
+
+        Examples:
+            >>> read1, read2, write = regfile.get_pins(
+            ...     ["ReadReg1", "ReadReg2", "WriteReg"], PinType.INPUT)
+        """
+        match pin_type:
+            case PinType.INPUT:
+                index = self.pins.inputs_by_label
+            case PinType.OUTPUT:
+                index = self.pins.outputs_by_label
+            case _:
+                index = self.pins.by_label
+        return [index.get(label) for label in labels]
 
 
 class ConnectorFirstSegmentDir(enum.Enum):
@@ -308,7 +639,11 @@ class ConnectorFirstSegmentDir(enum.Enum):
 class ConnectorLine(VGroupLogicBase):
     """ConnectorLine is used to connect two pins directly. If a mid_y_axis is provided,
     3 segments are created: the first and last traverse x-axis only, and the middle segment
-    traverses y-axis only."""
+    traverses y-axis only. The connected pins are kept as start_pin and end_pin.
+    Pass check_width=True to raise ValueError if the pins' bit widths don't match;
+    see width_error()."""
+
+    _reference_attrs = ("start_pin", "end_pin")
 
     def __init__(
         self,
@@ -320,12 +655,17 @@ class ConnectorLine(VGroupLogicBase):
         manhatten: bool = kwargs.pop("manhatten", False)
         axis_shift: float = kwargs.pop("axis_shift", 0)
         verbose: bool = kwargs.pop("verbose", False)
+        check_width: bool = kwargs.pop("check_width", False)
         mid_axis: float = kwargs.pop("mid_axis", None)
         # First segment direction defaults to X-axis.
         first_segment_dir: ConnectorFirstSegmentDir = kwargs.pop(
             "first_segment_dir", ConnectorFirstSegmentDir.X_AXIS
         )
         super().__init__(**kwargs)
+        self.start_pin = start_pin
+        self.end_pin = end_pin
+        if check_width:
+            _check_width(self)
 
         if manhatten is False:
             self.line = Line(start_pin.line.get_end(), end_pin.line.get_end(), **kwargs)
@@ -380,6 +720,7 @@ class ConnectorLine(VGroupLogicBase):
                 Line(mid_segment_end, end_pin.line.get_end(), **kwargs),
             )
         self.add(self.line)
+        _record_wire(self)
 
     def dim_all(self):
         super().dim_all()
@@ -393,16 +734,27 @@ class ConnectorLine(VGroupLogicBase):
 
 
 class ArbitrarySegmentLine(VGroupLogicBase):
-    """ArbitrarySegmentLine is used to connect each point given in the list of vertices."""
+    """ArbitrarySegmentLine is used to connect each point given in the list of vertices.
+    Pass start_pin and end_pin when the line wires two pins together so that the
+    connection is known to the netlist, and check_width=True to check their bit
+    widths as ConnectorLine does."""
+
+    _reference_attrs = ("start_pin", "end_pin")
 
     def __init__(self, *vertices: Point3DLike, **kwargs):
+        self.start_pin: Optional[Pin] = kwargs.pop("start_pin", None)
+        self.end_pin: Optional[Pin] = kwargs.pop("end_pin", None)
+        check_width: bool = kwargs.pop("check_width", False)
         super().__init__(**kwargs)
+        if check_width and self.start_pin is not None and self.end_pin is not None:
+            _check_width(self)
         self.vertices = vertices
         self.segments = VGroup()
         for i in range(len(self.vertices) - 1):
             segment = Line(vertices[i], vertices[i + 1], **kwargs)
             self.segments.add(segment)
         self.add(*self.segments)
+        _record_wire(self)
 
     def dim_all(self):
         super().dim_all()
@@ -0,0 +1,92 @@
+"""
+Process-wide cache of typeset labels.
+
+Creating a Manim Text runs a Pango layout and parses the resulting SVG, yet
+components reuse a handful of strings ("32", "5", "ReadData1", ...) over and
+over. LabelCache typesets each distinct label once and hands out copies.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Tuple
+
+from manim import ManimColor, Text, WHITE
+
+
+@dataclass(frozen=True)
+class LabelCacheInfo:
+    """Snapshot of the cache counters."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LabelCache:
+    """
+    LRU cache of Text mobjects keyed on (text, font_size, color, font).
+
+    get() always returns a fresh copy, so callers may move, rotate or recolor the
+    result without affecting the cached prototype.
+
+    Parameters:
+        maxsize (int): Maximum number of prototypes kept; 0 disables caching (default: 512)
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Text]" = OrderedDict()
+
+    @staticmethod
+    def make_key(text: str, font_size: float, color, font: str, **kwargs) -> tuple:
+        """Build the cache key; any extra Text kwargs take part in it too."""
+        color_key = ManimColor(color).to_hex() if color is not None else None
+        extra = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+        return (text, float(font_size), color_key, font, extra)
+
+    def get(
+        self, text: str, font_size: float = 14, color=WHITE, font: str = "", **kwargs
+    ) -> Text:
+        """Return a copy of the Text for these settings, typesetting it on a miss."""
+        if self.maxsize <= 0:
+            self.misses += 1
+            return Text(text, font_size=font_size, color=color, font=font, **kwargs)
+
+        key = self.make_key(text, font_size, color, font, **kwargs)
+        prototype = self._entries.get(key)
+        if prototype is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return prototype.copy()
+
+        self.misses += 1
+        prototype = Text(text, font_size=font_size, color=color, font=font, **kwargs)
+        self._entries[key] = prototype
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return prototype.copy()
+
+    def info(self) -> LabelCacheInfo:
+        return LabelCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        """Drop every cached prototype and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+label_cache = LabelCache()
+
+
+def cached_text(
+    text: str, font_size: float = 14, color=WHITE, font: str = "", **kwargs
+) -> Text:
+    """Shorthand for label_cache.get(); use in place of Text() for repeated labels."""
+    return label_cache.get(text, font_size=font_size, color=color, font=font, **kwargs)
@@ -0,0 +1,298 @@
+"""
+Netlist extraction for LogicEdu scenes.
+
+A Netlist groups the pins joined by ConnectorLines (and ArbitrarySegmentLines
+created with start_pin/end_pin) into nets, so that tools such as the simulator
+can reason about connectivity instead of geometry.
+
+Nets are merged as connections are made and every pin, component and label is
+indexed, so driver, fan-in, fan-out and connected-net queries never scan the
+scene. While a Netlist is used as a context manager it records every wire
+created inside the block.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from manim import Mobject
+
+from . import basics
+from .baking import BakedComponent
+from .basics import (
+    ArbitrarySegmentLine,
+    ConnectorLine,
+    Pin,
+    PinType,
+    VGroupLogicBase,
+    VGroupLogicObjectBase,
+    width_error,
+)
+
+
+class Net:
+    """
+    A set of electrically connected pins.
+
+    The lists below are maintained by the Netlist and must not be modified.
+
+    Attributes:
+        index (int): Position of the net in Netlist.nets()
+        pins (List[Pin]): Every pin on the net
+        drivers (List[Pin]): Output pins on the net; a well-formed net has at most one
+        loads (List[Pin]): Input pins on the net
+        wires (List[VGroupLogicBase]): Connector lines that form the net
+    """
+
+    def __init__(self, index: int = 0):
+        self.index = index
+        self.pins: List[Pin] = []
+        self.drivers: List[Pin] = []
+        self.loads: List[Pin] = []
+        self.wires: List[VGroupLogicBase] = []
+
+    def _add_pin(self, pin: Pin):
+        self.pins.append(pin)
+        if pin.pin_type == PinType.OUTPUT:
+            self.drivers.append(pin)
+        else:
+            self.loads.append(pin)
+
+    @property
+    def driver(self) -> Optional[Pin]:
+        if len(self.drivers) > 1:
+            raise ValueError(f"Net {self.index} has {len(self.drivers)} drivers")
+        return self.drivers[0] if self.drivers else None
+
+    def __len__(self) -> int:
+        return len(self.pins)
+
+    def __repr__(self):
+        return f"Net(index={self.index}, pins={len(self.pins)})"
+
+
+class Netlist:
+    """
+    Connectivity between component pins.
+
+    Parameters:
+        wires: ConnectorLines or ArbitrarySegmentLines with start_pin and end_pin set
+        components: Components to include even if some of their pins are unconnected
+
+    Examples:
+        >>> with Netlist() as netlist:
+        ...     wire = ConnectorLine(and_gate.get_output_by_index(0),
+        ...                          or_gate.get_input_by_index(0))
+        >>> netlist.fanout(and_gate.get_output_by_index(0))
+        >>> netlist.pin(or_gate, "A")
+    """
+
+    def __init__(
+        self,
+        wires: Iterable[VGroupLogicBase] = (),
+        components: Iterable[VGroupLogicObjectBase] = (),
+    ):
+        self.components: List[VGroupLogicObjectBase] = []
+        self.connections: List[Tuple[Pin, Pin, Optional[VGroupLogicBase]]] = []
+        self._net_of: Dict[Pin, Net] = {}
+        self._live_nets: Dict[int, Net] = {}
+        self._nets: Optional[List[Net]] = None
+        self._pins_of: Dict[VGroupLogicObjectBase, List[Pin]] = {}
+        self._pins_by_label: Dict[Tuple[VGroupLogicObjectBase, str], List[Pin]] = {}
+        for component in components:
+            self.add_component(component)
+        for wire in wires:
+            self.add_wire(wire)
+
+    @classmethod
+    def from_mobjects(cls, *mobjects: Mobject) -> "Netlist":
+        """Build a netlist from every component and wire found in the given mobjects."""
+        netlist = cls()
+        wires = []
+        for mobject in mobjects:
+            for mob in mobject.get_family():
+                if isinstance(mob, (ConnectorLine, ArbitrarySegmentLine)):
+                    if mob.start_pin is not None and mob.end_pin is not None:
+                        wires.append(mob)
+                elif isinstance(mob, VGroupLogicObjectBase):
+                    netlist.add_component(mob)
+        for wire in wires:
+            netlist.add_wire(wire)
+        return netlist
+
+    # Recording
+
+    def __enter__(self) -> "Netlist":
+        basics._recording_netlists.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        basics._recording_netlists.remove(self)
+        return False
+
+    # Building
+
+    def add_component(self, component: VGroupLogicObjectBase):
+        """Register a component and all the pins it owns."""
+        if isinstance(component, BakedComponent):
+            component = component.source
+        if component in self._pins_of:
+            return
+        pins = component.get_owned_pins()
+        self._pins_of[component] = pins
+        self.components.append(component)
+        for pin in pins:
+            self._add_pin(pin)
+            self._pins_by_label.setdefault((component, pin.label_str), []).append(pin)
+
+    def add_wire(self, wire: VGroupLogicBase):
+        """Register a ConnectorLine or ArbitrarySegmentLine that joins two pins."""
+        if not isinstance(wire, (ConnectorLine, ArbitrarySegmentLine)):
+            raise TypeError(f"Cannot add {type(wire).__name__} to a netlist")
+        if wire.start_pin is None or wire.end_pin is None:
+            raise ValueError("Wire was created without start_pin and end_pin")
+        self.connect(wire.start_pin, wire.end_pin, wire)
+
+    def connect(
+        self, start_pin: Pin, end_pin: Pin, wire: Optional[VGroupLogicBase] = None
+    ):
+        """Join two pins, optionally recording the wire that draws the connection."""
+        for pin in (start_pin, end_pin):
+            if pin.owner is not None:
+                self.add_component(pin.owner)
+            self._add_pin(pin)
+        self.connections.append((start_pin, end_pin, wire))
+
+        net_a = self._net_of[start_pin]
+        net_b = self._net_of[end_pin]
+        if net_a is not net_b:
+            # Merge the smaller net into the larger so each pin moves O(log n) times.
+            if len(net_a) < len(net_b):
+                net_a, net_b = net_b, net_a
+            for pin in net_b.pins:
+                self._net_of[pin] = net_a
+            net_a.pins.extend(net_b.pins)
+            net_a.drivers.extend(net_b.drivers)
+            net_a.loads.extend(net_b.loads)
+            net_a.wires.extend(net_b.wires)
+            del self._live_nets[id(net_b)]
+            self._nets = None
+        if wire is not None:
+            net_a.wires.append(wire)
+
+    def assign_wire(self, index: int, wire: VGroupLogicBase):
+        """Attach the wire drawn for connections[index], e.g. once it has been routed."""
+        start_pin, end_pin, old_wire = self.connections[index]
+        net = self._net_of[start_pin]
+        if old_wire is not None:
+            net.wires.remove(old_wire)
+        self.connections[index] = (start_pin, end_pin, wire)
+        net.wires.append(wire)
+
+    def _add_pin(self, pin: Pin):
+        if pin in self._net_of:
+            return
+        net = Net(len(self._live_nets))
+        net._add_pin(pin)
+        self._net_of[pin] = net
+        self._live_nets[id(net)] = net
+        self._nets = None
+
+    # Queries
+
+    def nets(self) -> List[Net]:
+        """Return all nets in creation order; Net.index is the position in this list."""
+        if self._nets is None:
+            self._nets = list(self._live_nets.values())
+            for index, net in enumerate(self._nets):
+                net.index = index
+        return self._nets
+
+    def net_of(self, pin: Pin) -> Net:
+        """Return the net the pin belongs to. Net.index is valid once nets() is called."""
+        try:
+            return self._net_of[pin]
+        except KeyError:
+            raise KeyError(f"{pin} is not part of this netlist") from None
+
+    def connected_pins(self, pin: Pin) -> List[Pin]:
+        """All pins on the same net as pin, including pin itself."""
+        return self.net_of(pin).pins
+
+    def driver(self, pin: Pin) -> Optional[Pin]:
+        """The output pin driving pin's net, or None if the net is undriven."""
+        return self.net_of(pin).driver
+
+    def fanout(self, pin: Pin) -> List[Pin]:
+        """Input pins driven by pin's net."""
+        return self.net_of(pin).loads
+
+    def fanin(self, component: VGroupLogicObjectBase) -> List[Optional[Pin]]:
+        """For each input pin of the component, the output pin driving it (or None)."""
+        return [
+            self.driver(pin)
+            for pin in self.pins_of(component)
+            if pin.pin_type == PinType.INPUT
+        ]
+
+    def successors(self, component: VGroupLogicObjectBase) -> List[VGroupLogicObjectBase]:
+        """Components with an input driven by one of the component's outputs."""
+        found = {}
+        for pin in self.pins_of(component):
+            if pin.pin_type == PinType.OUTPUT:
+                for load in self.fanout(pin):
+                    if load.owner is not None:
+                        found[id(load.owner)] = load.owner
+        return list(found.values())
+
+    def predecessors(
+        self, component: VGroupLogicObjectBase
+    ) -> List[VGroupLogicObjectBase]:
+        """Components driving one of the component's inputs."""
+        found = {}
+        for driver in self.fanin(component):
+            if driver is not None and driver.owner is not None:
+                found[id(driver.owner)] = driver.owner
+        return list(found.values())
+
+    def pins_of(self, component: VGroupLogicObjectBase) -> List[Pin]:
+        """Pins the component owns, in the order they were added."""
+        return self._pins_of.get(component, [])
+
+    def pin(
+        self,
+        component: VGroupLogicObjectBase,
+        label: str,
+        pin_type: Optional[PinType] = None,
+    ) -> Optional[Pin]:
+        """Look up a component's pin by label, optionally restricted to a pin type."""
+        for pin in self._pins_by_label.get((component, label), ()):
+            if pin_type is None or pin.pin_type == pin_type:
+                return pin
+        return None
+
+    def pending_connections(self) -> List[Tuple[int, Pin, Pin]]:
+        """(index, start_pin, end_pin) for every connection that has no wire yet."""
+        return [
+            (index, start_pin, end_pin)
+            for index, (start_pin, end_pin, wire) in enumerate(self.connections)
+            if wire is None
+        ]
+
+    def wires(self) -> List[VGroupLogicBase]:
+        """Every wire added to the netlist, in order."""
+        return [wire for _, _, wire in self.connections if wire is not None]
+
+    def width_mismatches(self) -> List[Tuple[Pin, Pin, str]]:
+        """(driver, load, reason) for every load whose bit width doesn't fit its net."""
+        found = []
+        for net in self.nets():
+            driver = net.drivers[0] if net.drivers else None
+            if driver is None:
+                continue
+            for load in net.loads:
+                error = width_error(driver, load)
+                if error is not None:
+                    found.append((driver, load, error))
+        return found
+
+    def __contains__(self, pin: Pin) -> bool:
+        return pin in self._net_of
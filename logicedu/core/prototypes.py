@@ -0,0 +1,128 @@
+"""
+Prototype registry for repeated components.
+
+Constructing a component re-runs all of its geometry (shape arcs, pin placement,
+label typesetting). When a scene needs many identical components, e.g. the 64
+full adders of a ripple-carry adder, PrototypeRegistry builds the component once
+per (class, constructor arguments) and hands out deep copies afterwards.
+"""
+
+import enum
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Type, TypeVar
+
+import numpy as np
+from manim import Mobject
+
+from .basics import (
+    ArbitrarySegmentLine,
+    ConnectorLine,
+    _record_wire,
+    _recording_paused,
+)
+
+M = TypeVar("M", bound=Mobject)
+
+
+@dataclass(frozen=True)
+class PrototypeInfo:
+    """Snapshot of the registry counters."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def freeze(value: Any) -> Hashable:
+    """Turn constructor arguments into a hashable key.
+
+    Containers are frozen recursively, arrays by their contents, and anything
+    else unhashable falls back to its repr.
+    """
+    if isinstance(value, (str, int, float, bool, type(None), enum.Enum)):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(freeze(v) for v in value))
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.dtype.str, value.shape, value.tobytes())
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class PrototypeRegistry:
+    """
+    LRU registry of component prototypes keyed on (class, args, kwargs).
+
+    Parameters:
+        maxsize (int): Maximum number of prototypes kept; 0 disables the registry (default: 128)
+
+    Examples:
+        >>> registry = PrototypeRegistry()
+        >>> adders = [registry.create(AND2, color=BLUE) for _ in range(64)]
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._prototypes: "OrderedDict[Hashable, Mobject]" = OrderedDict()
+
+    def create(self, cls: Type[M], *args, **kwargs) -> M:
+        """Return a fresh instance of cls, cloned from its prototype when possible."""
+        if self.maxsize <= 0:
+            self.misses += 1
+            return cls(*args, **kwargs)
+
+        key = (cls, freeze(args), freeze(kwargs))
+        prototype = self._prototypes.get(key)
+        if prototype is not None:
+            self.hits += 1
+            self._prototypes.move_to_end(key)
+            return self._clone(prototype)
+
+        self.misses += 1
+        # The prototype never joins a scene, so keep its wires out of any netlist.
+        with _recording_paused():
+            prototype = cls(*args, **kwargs)
+        self._prototypes[key] = prototype
+        while len(self._prototypes) > self.maxsize:
+            self._prototypes.popitem(last=False)
+        return self._clone(prototype)
+
+    @staticmethod
+    def _clone(prototype: M) -> M:
+        clone = prototype.copy()
+        # Wires inside the clone are recorded as if the clone had been constructed.
+        for mob in clone.get_family():
+            if isinstance(mob, (ConnectorLine, ArbitrarySegmentLine)):
+                _record_wire(mob)
+        return clone
+
+    def info(self) -> PrototypeInfo:
+        return PrototypeInfo(
+            self.hits, self.misses, self.maxsize, len(self._prototypes)
+        )
+
+    def clear(self):
+        """Drop every prototype and reset the counters."""
+        self._prototypes.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._prototypes)
+
+
+prototypes = PrototypeRegistry()
+
+
+def clone(cls: Type[M], *args, **kwargs) -> M:
+    """Shorthand for prototypes.create(); use in place of cls(...) for repeated blocks."""
+    return prototypes.create(cls, *args, **kwargs)
@@ -0,0 +1,534 @@
+"""
+Manhattan wire routing on the GRID lattice.
+
+The Router finds rectilinear paths between points with A* search. Component
+bodies are obstacles, and every bend or crossing with an already routed wire adds
+to the cost of a path, so wires go around blocks instead of through them and keep
+their corners to a minimum. Obstacles and routed wires are kept in hash maps keyed
+by lattice cell, so each step of the search is a constant-time lookup no matter
+how many components or wires the scene holds.
+
+The result of a search is a list of corner points that can be passed straight
+to ArbitrarySegmentLine. route_all() routes every pending connection of a
+Netlist together, ripping up and rerouting wires that end up on top of each other.
+"""
+
+import heapq
+import itertools
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from manim import DL, UR, Line, Mobject
+
+from .basics import (
+    GRID,
+    ArbitrarySegmentLine,
+    Pin,
+    PinSide,
+    VGroupLogicObjectBase,
+    _recording_paused,
+)
+from .netlist import Netlist
+
+Cell = Tuple[int, int]
+
+# Unit steps, indexed by direction number: right, up, left, down.
+_STEPS: Tuple[Cell, ...] = ((1, 0), (0, 1), (-1, 0), (0, -1))
+RIGHT_DIR, UP_DIR, LEFT_DIR, DOWN_DIR = range(4)
+
+# Direction a wire leaves a pin in, by the side of the component the pin is on.
+_EXIT_DIR = {
+    PinSide.RIGHT: RIGHT_DIR,
+    PinSide.TOP: UP_DIR,
+    PinSide.LEFT: LEFT_DIR,
+    PinSide.BOTTOM: DOWN_DIR,
+}
+
+
+def _axis(direction: int) -> int:
+    """0 for horizontal directions, 1 for vertical ones."""
+    return direction % 2
+
+
+class RoutingGrid:
+    """
+    Obstacles and routed wires on a square lattice.
+
+    Parameters:
+        pitch (float): Distance between lattice points (default: GRID)
+        padding (int): Cells the search may stray beyond the obstacles and
+            endpoints (default: 10)
+
+    Attributes:
+        blocked (Set[Cell]): Cells wires may not enter
+        history (Dict[Cell, float]): Extra cost of entering a cell, raised by
+            route_all where nets kept colliding
+        bounds (Optional[Tuple[int, int, int, int]]): min_x, min_y, max_x, max_y of
+            every obstacle and wire cell, or None while the grid is empty
+    """
+
+    def __init__(self, pitch: float = GRID, padding: int = 10):
+        self.pitch = pitch
+        self.padding = padding
+        self.blocked: Set[Cell] = set()
+        self.history: Dict[Cell, float] = {}
+        self.bounds: Optional[Tuple[int, int, int, int]] = None
+        # (x, y, axis) -> keys of the nets whose wires run through the cell on that axis.
+        # Runs are counted per net: branches of a fan-out net share cells, so
+        # ripping one up must leave the others' runs in place.
+        self._wires: Dict[Tuple[int, int, int], Counter] = {}
+
+    def to_cell(self, point) -> Cell:
+        return (
+            int(round(float(point[0]) / self.pitch)),
+            int(round(float(point[1]) / self.pitch)),
+        )
+
+    def to_point(self, cell: Cell) -> np.ndarray:
+        return np.array([cell[0] * self.pitch, cell[1] * self.pitch, 0.0])
+
+    def _extend_bounds(self, min_x: int, min_y: int, max_x: int, max_y: int):
+        if self.bounds is not None:
+            min_x = min(min_x, self.bounds[0])
+            min_y = min(min_y, self.bounds[1])
+            max_x = max(max_x, self.bounds[2])
+            max_y = max(max_y, self.bounds[3])
+        self.bounds = (min_x, min_y, max_x, max_y)
+
+    # Obstacles
+
+    def block_box(self, lower_left, upper_right, margin: int = 0):
+        """Block every cell inside a box, grown by margin cells on each side."""
+        min_x, min_y = self.to_cell(lower_left)
+        max_x, max_y = self.to_cell(upper_right)
+        min_x, min_y, max_x, max_y = (
+            min_x - margin,
+            min_y - margin,
+            max_x + margin,
+            max_y + margin,
+        )
+        self.blocked.update(
+            itertools.product(range(min_x, max_x + 1), range(min_y, max_y + 1))
+        )
+        self._extend_bounds(min_x, min_y, max_x, max_y)
+
+    def add_obstacle(self, mobject: Mobject, margin: int = 0):
+        """
+        Block the area a mobject covers.
+
+        For a component only the body is blocked: its pin lines are blocked up to,
+        but not including, the pin ends so wires can reach them from outside.
+        """
+        if not isinstance(mobject, VGroupLogicObjectBase):
+            self.block_box(mobject.get_corner(DL), mobject.get_corner(UR), margin)
+            return
+
+        for mob in mobject.submobjects:
+            if isinstance(mob, Pin) or not any(m.has_points() for m in mob.get_family()):
+                continue
+            self.block_box(mob.get_corner(DL), mob.get_corner(UR), margin)
+        for pin in mobject.get_owned_pins():
+            start = self.to_cell(pin.line.get_start())
+            end = self.to_cell(pin.line.get_end())
+            for cell in _cells_between(start, end)[:-1]:
+                self.blocked.add(cell)
+
+    def add_obstacles(self, *mobjects: Mobject, margin: int = 0):
+        for mobject in mobjects:
+            self.add_obstacle(mobject, margin)
+
+    # Wires
+
+    def add_path(self, cells: List[Cell], net: Hashable = None):
+        """Record a routed path so later searches pay to cross or overlap it."""
+        for (x, y), axis in _path_axes(cells):
+            self._wires.setdefault((x, y, axis), Counter())[net] += 1
+        if cells:
+            xs = [cell[0] for cell in cells]
+            ys = [cell[1] for cell in cells]
+            self._extend_bounds(min(xs), min(ys), max(xs), max(ys))
+
+    def remove_path(self, cells: List[Cell], net: Hashable = None):
+        """Forget a path recorded with add_path, e.g. to rip it up and route again."""
+        for (x, y), axis in _path_axes(cells):
+            nets = self._wires.get((x, y, axis))
+            if nets is not None and net in nets:
+                nets[net] -= 1
+                if nets[net] <= 0:
+                    del nets[net]
+                if not nets:
+                    del self._wires[(x, y, axis)]
+
+    def wires_at(self, cell: Cell, axis: int) -> Set[Hashable]:
+        """Nets with a wire running through the cell along axis (0: x, 1: y)."""
+        return set(self._wires.get((cell[0], cell[1], axis), ()))
+
+    def usage(self, cell: Cell) -> int:
+        """Number of wire runs through a cell, counting both axes."""
+        return len(self.wires_at(cell, 0)) + len(self.wires_at(cell, 1))
+
+    def overlaps(self, cells: List[Cell], net: Hashable = None) -> List[Cell]:
+        """Cells of a recorded path that run along a wire of another net."""
+        found = []
+        for cell, axis in _path_axes(cells):
+            nets = self.wires_at(cell, axis)
+            if len(nets - {net}) > 0 and cell not in found:
+                found.append(cell)
+        return found
+
+
+def _cells_between(start: Cell, end: Cell) -> List[Cell]:
+    """Cells on the axis-aligned segment from start to end, inclusive."""
+    (x0, y0), (x1, y1) = start, end
+    if x0 != x1 and y0 != y1:
+        raise ValueError(f"Segment {start} -> {end} is not axis-aligned")
+    steps = max(abs(x1 - x0), abs(y1 - y0))
+    dx = (x1 > x0) - (x1 < x0)
+    dy = (y1 > y0) - (y1 < y0)
+    return [(x0 + i * dx, y0 + i * dy) for i in range(steps + 1)]
+
+
+def _path_axes(cells: List[Cell]):
+    """Yield (cell, axis) for every axis each cell of a path is used along."""
+    for a, b in zip(cells, cells[1:]):
+        axis = 0 if a[1] == b[1] else 1
+        yield a, axis
+        yield b, axis
+
+
+def _corners(cells: List[Cell]) -> List[Cell]:
+    """Drop the cells in the middle of straight runs."""
+    if len(cells) < 3:
+        return list(cells)
+    corners = [cells[0]]
+    for prev, cell, nxt in zip(cells, cells[1:], cells[2:]):
+        incoming = (cell[0] - prev[0], cell[1] - prev[1])
+        outgoing = (nxt[0] - cell[0], nxt[1] - cell[1])
+        if incoming != outgoing:
+            corners.append(cell)
+    corners.append(cells[-1])
+    return corners
+
+
+class Router:
+    """
+    A* router for Manhattan wires.
+
+    Each step along the lattice costs 1, plus the grid's history cost for the cell
+    entered. Turning costs bend_cost, crossing a wire
+    of another net costs crossing_cost, and running on top of another net's wire
+    costs overlap_cost. Wires of the same net may share cells for free, so fan-out
+    branches merge naturally.
+
+    Parameters:
+        grid (RoutingGrid): Obstacles and existing wires (default: an empty grid)
+        bend_cost (float): Cost of each corner (default: 5)
+        crossing_cost (float): Cost of crossing another net's wire (default: 10)
+        overlap_cost (float): Cost of each step along another net's wire (default: 100)
+        max_expansions (int): Give up after visiting this many states (default: 200000)
+
+    Examples:
+        >>> router = Router()
+        >>> router.grid.add_obstacles(pc, imem, regfile)
+        >>> vertices = router.route_pins(pc.get_output_by_index(0),
+        ...                              imem.get_input_by_index(0))
+        >>> wire = ArbitrarySegmentLine(*vertices)
+        >>> # or in one go, keeping the pins for the netlist
+        >>> wire = router.connect(pc.get_output_by_index(0), imem.get_input_by_index(0))
+    """
+
+    def __init__(self, grid: Optional[RoutingGrid] = None, **kwargs):
+        self.grid = grid if grid is not None else RoutingGrid()
+        self.bend_cost: float = kwargs.pop("bend_cost", 5)
+        self.crossing_cost: float = kwargs.pop("crossing_cost", 10)
+        self.overlap_cost: float = kwargs.pop("overlap_cost", 100)
+        self.max_expansions: int = kwargs.pop("max_expansions", 200000)
+        if kwargs:
+            raise TypeError(f"Unexpected arguments: {', '.join(kwargs)}")
+
+    def find_path(
+        self,
+        start: Cell,
+        end: Cell,
+        start_dir: Optional[int] = None,
+        end_dir: Optional[int] = None,
+        net: Hashable = None,
+    ) -> List[Cell]:
+        """
+        Return the cheapest path of lattice cells from start to end.
+
+        start_dir forces the direction of the first step and end_dir the direction
+        of the last one. The endpoints themselves may lie on blocked cells.
+
+        Raises:
+            ValueError: If no path exists within the search area
+        """
+        grid = self.grid
+        blocked = grid.blocked
+        wires = grid._wires
+        history = grid.history
+
+        min_x = min(start[0], end[0])
+        min_y = min(start[1], end[1])
+        max_x = max(start[0], end[0])
+        max_y = max(start[1], end[1])
+        if grid.bounds is not None:
+            min_x = min(min_x, grid.bounds[0])
+            min_y = min(min_y, grid.bounds[1])
+            max_x = max(max_x, grid.bounds[2])
+            max_y = max(max_y, grid.bounds[3])
+        min_x -= grid.padding
+        min_y -= grid.padding
+        max_x += grid.padding
+        max_y += grid.padding
+
+        def heuristic(cell: Cell) -> float:
+            return abs(cell[0] - end[0]) + abs(cell[1] - end[1])
+
+        def foreign(key) -> bool:
+            nets = wires.get(key)
+            return bool(nets) and (net is None or len(nets) > 1 or net not in nets)
+
+        if start == end:
+            return [start]
+
+        # States are (cell, direction of the step that reached it); -1 for start.
+        counter = itertools.count()
+        best: Dict[Tuple[Cell, int], float] = {(start, -1): 0.0}
+        came_from: Dict[Tuple[Cell, int], Tuple[Cell, int]] = {}
+        queue = [(heuristic(start), next(counter), 0.0, start, -1)]
+        expansions = 0
+
+        while queue:
+            _, _, cost, cell, direction = heapq.heappop(queue)
+            state = (cell, direction)
+            if cost > best.get(state, float("inf")):
+                continue
+            if cell == end and (end_dir is None or direction == end_dir):
+                return self._unwind(came_from, state)
+            expansions += 1
+            if expansions > self.max_expansions:
+                break
+
+            for new_dir, (dx, dy) in enumerate(_STEPS):
+                if direction == -1:
+                    if start_dir is not None and new_dir != start_dir:
+                        continue
+                elif new_dir == (direction + 2) % 4:
+                    continue
+                nxt = (cell[0] + dx, cell[1] + dy)
+                if not (min_x <= nxt[0] <= max_x and min_y <= nxt[1] <= max_y):
+                    continue
+                if nxt in blocked and nxt != end:
+                    continue
+
+                axis = _axis(new_dir)
+                step = 1.0 + history.get(nxt, 0.0)
+                if direction != -1 and new_dir != direction:
+                    step += self.bend_cost
+                if foreign((nxt[0], nxt[1], axis)):
+                    step += self.overlap_cost
+                if foreign((nxt[0], nxt[1], 1 - axis)):
+                    step += self.crossing_cost
+
+                new_cost = cost + step
+                new_state = (nxt, new_dir)
+                if new_cost < best.get(new_state, float("inf")):
+                    best[new_state] = new_cost
+                    came_from[new_state] = state
+                    heapq.heappush(
+                        queue,
+                        (new_cost + heuristic(nxt), next(counter), new_cost, nxt, new_dir),
+                    )
+
+        raise ValueError(f"No route from {start} to {end}")
+
+    @staticmethod
+    def _unwind(came_from, state) -> List[Cell]:
+        cells = [state[0]]
+        while state in came_from:
+            state = came_from[state]
+            cells.append(state[0])
+        cells.reverse()
+        return cells
+
+    def route(
+        self,
+        start,
+        end,
+        start_dir: Optional[int] = None,
+        end_dir: Optional[int] = None,
+        net: Hashable = None,
+        commit: bool = True,
+    ) -> List[np.ndarray]:
+        """
+        Route between two points and return the corner points of the wire.
+
+        The first and last vertices are the exact start and end points, so the wire
+        meets pins that are slightly off the lattice. With commit the path is
+        recorded in the grid, so later routes avoid crossing it.
+        """
+        cells = self.find_path(
+            self.grid.to_cell(start), self.grid.to_cell(end), start_dir, end_dir, net
+        )
+        if commit:
+            self.grid.add_path(cells, net)
+        return self.vertices(cells, start, end)
+
+    def vertices(self, cells: List[Cell], start, end) -> List[np.ndarray]:
+        """Corner points of a path, with its ends moved onto the exact endpoints."""
+        corners = _corners(cells)
+        vertices = [self.grid.to_point(cell) for cell in corners]
+        vertices[0] = np.array(start, dtype=float)
+        if len(vertices) > 1:
+            vertices[-1] = np.array(end, dtype=float)
+        if len(vertices) == 2:
+            # A straight path between endpoints that are off the lattice by
+            # different amounts gets a dog-leg halfway along, not a slanted run.
+            axis = 0 if corners[0][1] == corners[1][1] else 1
+            start, end = vertices
+            if not np.isclose(start[1 - axis], end[1 - axis]):
+                first, second = start.copy(), end.copy()
+                first[axis] = second[axis] = (start[axis] + end[axis]) / 2
+                vertices[1:1] = [first, second]
+        elif len(vertices) > 2:
+            # Slide the neighbouring corners onto off-lattice endpoints so the
+            # first and last segments stay axis-aligned.
+            first_axis = 0 if corners[0][1] == corners[1][1] else 1
+            vertices[1][1 - first_axis] = vertices[0][1 - first_axis]
+            last_axis = 0 if corners[-2][1] == corners[-1][1] else 1
+            vertices[-2][1 - last_axis] = vertices[-1][1 - last_axis]
+        return vertices
+
+    def find_pin_path(
+        self, start_pin: Pin, end_pin: Pin, net: Hashable = None
+    ) -> List[Cell]:
+        """find_path() between two pin ends, leaving and entering each pin head-on."""
+        return self.find_path(
+            self.grid.to_cell(start_pin.line.get_end()),
+            self.grid.to_cell(end_pin.line.get_end()),
+            start_dir=_EXIT_DIR[start_pin.pin_side],
+            end_dir=(_EXIT_DIR[end_pin.pin_side] + 2) % 4,
+            net=net,
+        )
+
+    def route_pins(
+        self, start_pin: Pin, end_pin: Pin, net: Hashable = None, commit: bool = True
+    ) -> List[np.ndarray]:
+        """Route from one pin end to another, leaving and entering each pin head-on."""
+        cells = self.find_pin_path(start_pin, end_pin, net)
+        if commit:
+            self.grid.add_path(cells, net)
+        return self.vertices(cells, start_pin.line.get_end(), end_pin.line.get_end())
+
+    def connect(self, start_pin: Pin, end_pin: Pin, **kwargs) -> ArbitrarySegmentLine:
+        """Route two pins and return an ArbitrarySegmentLine joining them."""
+        net = kwargs.pop("net", None)
+        vertices = self.route_pins(start_pin, end_pin, net=net)
+        return ArbitrarySegmentLine(
+            *vertices, start_pin=start_pin, end_pin=end_pin, **kwargs
+        )
+
+
+def _record_wire_cells(grid: RoutingGrid, wire: Mobject, net: Hashable):
+    """Record the axis-aligned segments of an already drawn wire in the grid."""
+    for mob in wire.get_family():
+        if not isinstance(mob, Line):
+            continue
+        start = grid.to_cell(mob.get_start())
+        end = grid.to_cell(mob.get_end())
+        if start[0] == end[0] or start[1] == end[1]:
+            grid.add_path(_cells_between(start, end), net)
+
+
+def route_all(
+    netlist: Netlist,
+    router: Optional[Router] = None,
+    obstacles: Iterable[Mobject] = (),
+    **kwargs,
+) -> List[ArbitrarySegmentLine]:
+    """
+    Route every pending connection of a netlist together.
+
+    Pending connections are the ones made with Netlist.connect() and no wire. They
+    are routed shortest first on one shared grid, with the netlist's components and
+    already drawn wires as obstacles. Connections whose wires then run along
+    another net's wire are ripped up, the cells they fought over become more
+    expensive, and they are routed again, for up to max_passes passes. Each new
+    wire is attached to its connection in the netlist.
+
+    Parameters:
+        netlist (Netlist): Netlist with pending connections
+        router (Router): Router whose grid and costs to use (default: a new Router)
+        obstacles (Iterable[Mobject]): Extra mobjects to route around
+        max_passes (int): Rip-up-and-reroute passes (default: 5)
+        history_cost (float): Added to a cell's cost each pass it is congested
+            (default: 3)
+        Remaining kwargs are passed to ArbitrarySegmentLine, e.g. color.
+
+    Returns:
+        List[ArbitrarySegmentLine]: The new wires, in connection order
+
+    Examples:
+        >>> netlist = Netlist()
+        >>> netlist.connect(pc.get_output_by_index(0), imem.get_input_by_index(0))
+        >>> netlist.connect(pc.get_output_by_index(0), adder.get_input_by_index(0))
+        >>> wires = route_all(netlist, color=BLUE)
+        >>> self.add(*wires)
+    """
+    max_passes: int = kwargs.pop("max_passes", 5)
+    history_cost: float = kwargs.pop("history_cost", 3)
+    router = router if router is not None else Router()
+    grid = router.grid
+
+    grid.add_obstacles(*netlist.components, *obstacles)
+    for wire in netlist.wires():
+        _record_wire_cells(grid, wire, netlist.net_of(wire.start_pin))
+
+    pending = netlist.pending_connections()
+    nets = {index: netlist.net_of(start_pin) for index, start_pin, _ in pending}
+    pending.sort(
+        key=lambda item: np.abs(
+            item[1].line.get_end() - item[2].line.get_end()
+        ).sum()
+    )
+
+    paths: Dict[int, List[Cell]] = {}
+
+    def route(index: int, start_pin: Pin, end_pin: Pin):
+        paths[index] = router.find_pin_path(start_pin, end_pin, nets[index])
+        grid.add_path(paths[index], nets[index])
+
+    for item in pending:
+        route(*item)
+
+    for _ in range(max_passes):
+        congested = [
+            item
+            for item in pending
+            if grid.overlaps(paths[item[0]], nets[item[0]])
+        ]
+        if not congested:
+            break
+        for index, _, _ in congested:
+            for cell in grid.overlaps(paths[index], nets[index]):
+                grid.history[cell] = grid.history.get(cell, 0.0) + history_cost
+        for index, _, _ in congested:
+            grid.remove_path(paths[index], nets[index])
+        for item in congested:
+            route(*item)
+
+    wires = []
+    # The wires are attached below; a recording netlist must not add them again.
+    with _recording_paused():
+        for index, start_pin, end_pin in sorted(pending, key=lambda item: item[0]):
+            vertices = router.vertices(
+                paths[index], start_pin.line.get_end(), end_pin.line.get_end()
+            )
+            wire = ArbitrarySegmentLine(
+                *vertices, start_pin=start_pin, end_pin=end_pin, **kwargs
+            )
+            netlist.assign_wire(index, wire)
+            wires.append(wire)
+    return wires
@@ -0,0 +1,352 @@
+"""
+Spatial index over the components, pins and wires of a scene.
+
+Entries are bucketed on a uniform grid of square cells, so point, box and
+nearest-pin queries only look at the few cells around the query instead of
+every mobject in the scene. Overlap checks likewise only compare entries that
+share a cell.
+
+Moves made through a logic object (shift, scale, rotate, move_to, next_to, ...)
+are reported to every index holding it, and the moved entries are re-bucketed
+before the next query. Points changed any other way, e.g. by shifting a plain
+VGroup that contains components or by playing an animation, are not seen;
+call refresh() afterwards.
+"""
+
+import enum
+import itertools
+import math
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from manim import DL, UR, Line, Mobject
+
+from . import basics
+from .basics import (
+    ArbitrarySegmentLine,
+    ConnectorLine,
+    Pin,
+    VGroupLogicObjectBase,
+)
+
+Box = Tuple[float, float, float, float]
+
+
+class EntryKind(enum.Enum):
+    """What an index entry stands for."""
+
+    COMPONENT = 1
+    PIN = 2
+    WIRE = 3
+
+
+class SpatialEntry:
+    """
+    One indexed shape.
+
+    Attributes:
+        item (Mobject): The component, pin or wire the shape belongs to
+        kind (EntryKind): Kind of item
+        shape (Mobject): The mobject whose bounds are indexed: the component, the
+            pin, or one Line segment of the wire
+        box (Box): min_x, min_y, max_x, max_y of the shape when last indexed
+    """
+
+    __slots__ = ("item", "kind", "shape", "box", "cells")
+
+    def __init__(self, item: Mobject, kind: EntryKind, shape: Mobject):
+        self.item = item
+        self.kind = kind
+        self.shape = shape
+        self.box: Box = (0.0, 0.0, 0.0, 0.0)
+        self.cells: List[Tuple[int, int]] = []
+
+    def compute_box(self) -> Box:
+        match self.kind:
+            case EntryKind.PIN:
+                x, y = self.shape.line.get_end()[:2]
+                return (x, y, x, y)
+            case EntryKind.COMPONENT:
+                body = [
+                    mob
+                    for mob in self.shape.submobjects
+                    if not isinstance(mob, Pin)
+                    and any(m.has_points() for m in mob.get_family())
+                ]
+                if body:
+                    lower = np.min([mob.get_corner(DL) for mob in body], axis=0)
+                    upper = np.max([mob.get_corner(UR) for mob in body], axis=0)
+                else:
+                    lower, upper = self.shape.get_corner(DL), self.shape.get_corner(UR)
+            case _:
+                lower, upper = self.shape.get_corner(DL), self.shape.get_corner(UR)
+        return (lower[0], lower[1], upper[0], upper[1])
+
+    def __repr__(self):
+        return f"SpatialEntry({self.kind.name}, {type(self.item).__name__}, box={self.box})"
+
+
+def _boxes_overlap(a: Box, b: Box) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class SpatialIndex:
+    """
+    Uniform-grid index of component bodies, pin ends and wire segments.
+
+    Components are indexed by the bounds of their body (everything except their
+    pins), pins by the point at the end of the pin line, and wires segment by
+    segment, so a long diagonal-free wire doesn't cover the whole scene.
+
+    Parameters:
+        mobjects: Components, pins, wires or groups of them to index
+        cell_size (float): Side of a bucket; about the size of a small gate works
+            well (default: 0.5)
+
+    Examples:
+        >>> index = SpatialIndex(self.all_objects)
+        >>> pin = index.nearest_pin(click_point, max_distance=0.3)
+        >>> index.query_box(LEFT + DOWN, RIGHT + UP, kind=EntryKind.COMPONENT)
+        >>> for a, b in index.overlaps():
+        ...     print(f"{a} overlaps {b}")
+    """
+
+    def __init__(self, *mobjects: Mobject, cell_size: float = 0.5):
+        self.cell_size = cell_size
+        self._entries: Dict[int, SpatialEntry] = {}
+        self._by_item: Dict[int, List[SpatialEntry]] = {}
+        self._buckets: Dict[Tuple[int, int], Set[int]] = {}
+        # Pins only, so nearest_pin() never walks cells holding just wires or boxes.
+        self._pin_buckets: Dict[Tuple[int, int], Set[int]] = {}
+        self._dirty: Set[int] = set()
+        self.add(*mobjects)
+        basics._spatial_indexes.add(self)
+
+    # Building
+
+    def add(self, *mobjects: Mobject):
+        """Index components (with their pins), pins and wires, recursing into groups."""
+        for mobject in mobjects:
+            if isinstance(mobject, VGroupLogicObjectBase):
+                self._add_entry(SpatialEntry(mobject, EntryKind.COMPONENT, mobject))
+                for pin in mobject.get_owned_pins():
+                    self._add_entry(SpatialEntry(pin, EntryKind.PIN, pin))
+            elif isinstance(mobject, Pin):
+                self._add_entry(SpatialEntry(mobject, EntryKind.PIN, mobject))
+            elif isinstance(mobject, (ConnectorLine, ArbitrarySegmentLine)):
+                for segment in mobject.get_family():
+                    if isinstance(segment, Line):
+                        self._add_entry(SpatialEntry(mobject, EntryKind.WIRE, segment))
+            else:
+                self.add(*mobject.submobjects)
+
+    def remove(self, *mobjects: Mobject):
+        """Drop mobjects added with add(), including a component's pins."""
+        for mobject in mobjects:
+            if isinstance(mobject, VGroupLogicObjectBase):
+                self.remove(*mobject.get_owned_pins())
+            elif not isinstance(mobject, (Pin, ConnectorLine, ArbitrarySegmentLine)):
+                self.remove(*mobject.submobjects)
+            for entry in self._by_item.pop(id(mobject), []):
+                self._unbucket(entry)
+                del self._entries[id(entry.shape)]
+                self._dirty.discard(id(entry.shape))
+
+    def _add_entry(self, entry: SpatialEntry):
+        if id(entry.shape) in self._entries:
+            return
+        self._entries[id(entry.shape)] = entry
+        self._by_item.setdefault(id(entry.item), []).append(entry)
+        self._bucket(entry)
+
+    def _cells_for(self, box: Box) -> List[Tuple[int, int]]:
+        size = self.cell_size
+        return list(
+            itertools.product(
+                range(math.floor(box[0] / size), math.floor(box[2] / size) + 1),
+                range(math.floor(box[1] / size), math.floor(box[3] / size) + 1),
+            )
+        )
+
+    def _bucket_maps(self, entry: SpatialEntry) -> List[Dict]:
+        if entry.kind == EntryKind.PIN:
+            return [self._buckets, self._pin_buckets]
+        return [self._buckets]
+
+    def _bucket(self, entry: SpatialEntry):
+        entry.box = entry.compute_box()
+        entry.cells = self._cells_for(entry.box)
+        key = id(entry.shape)
+        for buckets in self._bucket_maps(entry):
+            for cell in entry.cells:
+                buckets.setdefault(cell, set()).add(key)
+
+    def _unbucket(self, entry: SpatialEntry):
+        key = id(entry.shape)
+        for buckets in self._bucket_maps(entry):
+            for cell in entry.cells:
+                bucket = buckets.get(cell)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del buckets[cell]
+
+    # Keeping in sync
+
+    def mark_moved(self, mobject: Mobject):
+        """Note that a mobject moved; its entries are re-bucketed before the next query."""
+        entries = self._entries
+        for mob in mobject.get_family():
+            if id(mob) in entries:
+                self._dirty.add(id(mob))
+
+    def refresh(self):
+        """Re-bucket every entry, e.g. after an animation or moving a plain VGroup."""
+        self._dirty.update(self._entries)
+        self._flush()
+
+    def _flush(self):
+        if not self._dirty:
+            return
+        for key in self._dirty:
+            entry = self._entries[key]
+            self._unbucket(entry)
+            self._bucket(entry)
+        self._dirty.clear()
+
+    # Queries
+
+    def _candidates(self, box: Box) -> Iterator[SpatialEntry]:
+        seen: Set[int] = set()
+        for cell in self._cells_for(box):
+            for key in self._buckets.get(cell, ()):
+                if key not in seen:
+                    seen.add(key)
+                    yield self._entries[key]
+
+    @staticmethod
+    def _unique_items(entries) -> List[Mobject]:
+        found = {}
+        for entry in entries:
+            found.setdefault(id(entry.item), entry.item)
+        return list(found.values())
+
+    def query_box(
+        self, lower_left, upper_right, kind: Optional[EntryKind] = None
+    ) -> List[Mobject]:
+        """Items with a shape overlapping the box, optionally of one kind only."""
+        self._flush()
+        box = (lower_left[0], lower_left[1], upper_right[0], upper_right[1])
+        return self._unique_items(
+            entry
+            for entry in self._candidates(box)
+            if (kind is None or entry.kind == kind) and _boxes_overlap(entry.box, box)
+        )
+
+    def query_point(
+        self, point, kind: Optional[EntryKind] = None, tolerance: float = 0.0
+    ) -> List[Mobject]:
+        """Items whose bounds contain the point, grown by tolerance on each side."""
+        lower = (point[0] - tolerance, point[1] - tolerance)
+        upper = (point[0] + tolerance, point[1] + tolerance)
+        return self.query_box(lower, upper, kind)
+
+    def nearest_pin(self, point, max_distance: Optional[float] = None) -> Optional[Pin]:
+        """
+        The pin whose end is closest to the point, or None if there is none within
+        max_distance. Only the rings of cells that can still hold a closer pin are
+        searched, and never more cells than there are cells holding pins.
+        """
+        self._flush()
+        pins = self._pin_buckets
+        size = self.cell_size
+        px, py = float(point[0]), float(point[1])
+        cx, cy = math.floor(px / size), math.floor(py / size)
+        best: Optional[Pin] = None
+        best_distance = math.inf if max_distance is None else max_distance
+        max_ring = math.inf
+        if max_distance is not None:
+            max_ring = math.ceil(max_distance / size) + 1
+
+        # Stop once the rings have reached every cell holding a pin.
+        found, ring = 0, 0
+        while found < len(pins) and ring <= max_ring:
+            # Every point in ring r is at least (r - 1) * size away.
+            if (ring - 1) * size > best_distance:
+                break
+            if (2 * ring + 1) ** 2 > len(pins):
+                # The rings so far cover more cells than hold pins, so checking
+                # every pin cell is cheaper than walking further out.
+                cells, found = list(pins), len(pins)
+            else:
+                cells = [cell for cell in self._ring(cx, cy, ring) if cell in pins]
+                found += len(cells)
+            for cell in cells:
+                for key in pins[cell]:
+                    entry = self._entries[key]
+                    distance = math.hypot(entry.box[0] - px, entry.box[1] - py)
+                    if distance <= best_distance:
+                        best, best_distance = entry.item, distance
+            ring += 1
+        return best
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> Iterator[Tuple[int, int]]:
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield (x, cy - ring)
+            yield (x, cy + ring)
+        for y in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, y)
+            yield (cx + ring, y)
+
+    def snap_to_pin(self, point, max_distance: float = 0.3) -> np.ndarray:
+        """The end of the nearest pin within max_distance, or the point itself."""
+        pin = self.nearest_pin(point, max_distance)
+        if pin is None:
+            return np.array(point, dtype=float)
+        return pin.line.get_end()
+
+    def overlapping(
+        self, item: Mobject, kind: Optional[EntryKind] = None
+    ) -> List[Mobject]:
+        """Other items whose shapes overlap any shape of item, e.g. wires over a block."""
+        self._flush()
+        found = []
+        for entry in self._by_item.get(id(item), []):
+            found.extend(
+                other
+                for other in self._candidates(entry.box)
+                if other.item is not item
+                and (kind is None or other.kind == kind)
+                and _boxes_overlap(entry.box, other.box)
+            )
+        return self._unique_items(found)
+
+    def overlaps(
+        self, kind: EntryKind = EntryKind.COMPONENT
+    ) -> List[Tuple[Mobject, Mobject]]:
+        """Pairs of distinct items of one kind whose shapes overlap."""
+        self._flush()
+        pairs: Dict[Tuple[int, int], Tuple[Mobject, Mobject]] = {}
+        for bucket in self._buckets.values():
+            entries = [
+                self._entries[key]
+                for key in bucket
+                if self._entries[key].kind == kind
+            ]
+            for a, b in itertools.combinations(entries, 2):
+                if a.item is b.item or not _boxes_overlap(a.box, b.box):
+                    continue
+                key = tuple(sorted((id(a.item), id(b.item))))
+                if key not in pairs:
+                    pairs[key] = (a.item, b.item)
+        return list(pairs.values())
+
+    def __contains__(self, mobject: Mobject) -> bool:
+        return id(mobject) in self._by_item
+
+    def __len__(self) -> int:
+        return len(self._by_item)
@@ -27,6 +27,10 @@ from logicedu import (
     ConnectorLine,
     ArbitrarySegmentLine,
     GRID,
+    MipsDatapath,
+    MipsSimulator,
+    Netlist,
+    encode_instruction,
 )
 from manim import DOWN, UP
 
@@ -167,6 +171,7 @@ class Cod6Fig417(Scene):
         regfile_read_reg1_pin = regfile.get_input_by_label("ReadReg1")
         if regfile_read_reg1_pin is None:
             raise ValueError("ReadReg1 input pin not found")
+        regfile_read_reg1_pin.bit_range = (25, 21)
         read_reg1_wire = ConnectorLine(
             start_pin=imem_inst_pin,
             end_pin=regfile_read_reg1_pin,
@@ -178,6 +183,7 @@ class Cod6Fig417(Scene):
         regfile_read_reg2_pin = regfile.get_input_by_label("ReadReg2")
         if regfile_read_reg2_pin is None:
             raise ValueError("ReadReg2 input pin not found")
+        regfile_read_reg2_pin.bit_range = (20, 16)
         read_reg2_wire = ConnectorLine(
             start_pin=imem_inst_pin,
             end_pin=regfile_read_reg2_pin,
@@ -189,7 +195,11 @@ class Cod6Fig417(Scene):
         regfile_write_reg_pin = regfile.get_input_by_label("WriteReg")
         if regfile_write_reg_pin is None:
             raise ValueError("WriteReg input pin not found")
-        write_reg_mux = Mux(pin_length=0.3, color=WHITE).scale(0.6).shift(LEFT * 3.3)
+        write_reg_mux = (
+            Mux(pin_length=0.3, color=WHITE, bit_width=5).scale(0.6).shift(LEFT * 3.3)
+        )
+        write_reg_mux.get_input_by_index(0).bit_range = (20, 16)
+        write_reg_mux.get_input_by_index(1).bit_range = (15, 11)
         mux_down_len = (
             write_reg_mux.get_output_by_index(0).dot.get_center()[1]
             - regfile_write_reg_pin.dot.get_center()[1]
@@ -258,6 +268,8 @@ class Cod6Fig417(Scene):
             ),
             write_reg_mux.get_input_by_index(2).dot.get_center(),
             color=BLUE,
+            start_pin=control_regdst_pin,
+            end_pin=write_reg_mux.get_input_by_index(2),
         )
         self.add_object(regdst_wire)
         self.play(
@@ -280,6 +292,7 @@ class Cod6Fig417(Scene):
         self.wait(1)
         self.play(sign_extend.animate.scale(0.6).shift(LEFT * 1.8 + DOWN * 2.3))
         self.undim_all()
+        sign_extend.get_input_by_index(0).bit_range = (15, 0)
         inst_sign_extend_bus = ConnectorLine(
             start_pin=imem_inst_pin,
             end_pin=sign_extend.get_input_by_index(0),
@@ -328,7 +341,7 @@ class Cod6Fig417(Scene):
         self.add_object(regfile_read_data1_wire)
 
         # Add ALU1 Mux
-        alu_1_mux = Mux(pin_length=0.3, color=WHITE).scale(0.6)
+        alu_1_mux = Mux(pin_length=0.3, color=WHITE, bit_width=32).scale(0.6)
         alu_1_mux_shift = (
             alu_1_pin.dot.get_center()
             - alu_1_mux.get_output_by_index(0).dot.get_center()
@@ -419,6 +432,8 @@ class Cod6Fig417(Scene):
             ),
             alu_control_inst_pin.dot.get_center(),
             color=WHITE,
+            start_pin=imem_inst_pin,
+            end_pin=alu_control_inst_pin,
         )
         self.add_object(inst_to_alu_control_bus)
         control_aluop_pin = control.get_output_by_label("ALUOp")
@@ -487,7 +502,7 @@ class Cod6Fig417(Scene):
         self.undim_all()
         self.wait(1)
         # Route wires/busses and add writeback mux
-        wbmux = Mux(pin_length=0.3, color=WHITE).scale(0.6).flip(RIGHT)
+        wbmux = Mux(pin_length=0.3, color=WHITE, bit_width=32).scale(0.6).flip(RIGHT)
         wbmux.shift(
             dmem_readdata_pin.dot.get_center()
             - wbmux.get_input_by_index(1).dot.get_center()
@@ -529,6 +544,8 @@ class Cod6Fig417(Scene):
             ),
             dmem_write_data_pin.dot.get_center(),
             color=WHITE,
+            start_pin=regfile_read_data2_pin,
+            end_pin=dmem_write_data_pin,
         )
         self.add_object(regfile_read_data2_to_dmem_write_data_bus)
 
@@ -571,6 +588,8 @@ class Cod6Fig417(Scene):
             ),
             wbmux.get_input_by_index(0).dot.get_center(),
             color=WHITE,
+            start_pin=alu_result_pin,
+            end_pin=wbmux.get_input_by_index(0),
         )
         self.add_object(alu_result_to_wbmux0_bus)
         regfile_write_data_pin = regfile.get_input_by_label("WriteData")
@@ -587,6 +606,8 @@ class Cod6Fig417(Scene):
             ),
             regfile_write_data_pin.dot.get_center(),
             color=WHITE,
+            start_pin=wbmux.get_output_by_index(0),
+            end_pin=regfile_write_data_pin,
         )
         self.add_object(writeback_data_bus)
         self.play(
@@ -681,6 +702,8 @@ class Cod6Fig417(Scene):
             ),
             pc_input_pin.dot.get_center(),
             color=WHITE,
+            start_pin=branch_logic.get_output_by_index(0),
+            end_pin=pc_input_pin,
         )
         self.add_object(next_pc_bus)
         self.play(
@@ -696,3 +719,58 @@ class Cod6Fig417(Scene):
         self.wait(1)
         self.undim_all()
         self.wait(1)
+
+        self.datapath = MipsDatapath(
+            pc=pc_block,
+            adder_plus4=adder_plus4,
+            imem=imem,
+            control=control,
+            regfile=regfile,
+            sign_extend=sign_extend,
+            alu=alu,
+            alu_control=alu_control,
+            dmem=dmem,
+            branch_logic=branch_logic,
+            write_reg_mux=write_reg_mux,
+            alu_src_mux=alu_1_mux,
+            mem_to_reg_mux=wbmux,
+        )
+
+
+class Cod6Fig417Run(Cod6Fig417):
+    """
+    Runs a short program on the Figure 4.17 datapath and steps through its cycles.
+
+    Each shown cycle lights the control wires that are 1, labels the main buses
+    with their values and shows the ALUOp and ALU control codes in binary.
+    """
+
+    # $t1 = mem[0] + mem[1], stored to mem[2]; then loop until $t0 == $t1.
+    program = [
+        encode_instruction("lw", 9, 0, 0),  # lw   $t1, 0($zero)
+        encode_instruction("lw", 10, 4, 0),  # lw   $t2, 4($zero)
+        encode_instruction("add", 9, 9, 10),  # add  $t1, $t1, $t2
+        encode_instruction("sw", 9, 8, 0),  # sw   $t1, 8($zero)
+        encode_instruction("addi", 8, 8, 1),  # addi $t0, $t0, 1
+        encode_instruction("beq", 8, 9, 1),  # beq  $t0, $t1, done
+        encode_instruction("beq", 0, 0, -3),  # beq  $zero, $zero, loop
+    ]
+    data = [2, 3]
+    shown_cycles = range(6)
+
+    def construct(self):
+        super().construct()
+        simulator = MipsSimulator(self.program, data=self.data)
+        trace = simulator.run()
+        netlist = Netlist.from_mobjects(self.all_objects)
+        for cycle in self.shown_cycles:
+            labels = VGroup(
+                trace.value_labels(cycle, self.datapath),
+                self.datapath.control_labels(trace.cycle(cycle)),
+            )
+            self.play(
+                *trace.control_animations(cycle, self.datapath, netlist),
+                FadeIn(labels),
+            )
+            self.wait(1)
+            self.play(FadeOut(labels))
@@ -0,0 +1,76 @@
+"""
+Simulation for LogicEdu circuits.
+
+This module evaluates the logic drawn with LogicEdu components:
+- Levelized, bit-parallel gate simulation
+- Gate and wire delays, with animated signal propagation
+- Static timing analysis: slack and the critical path
+- Truth tables of gates and composite circuits
+- Word-level simulation of buses and datapath blocks
+- Cycle simulation of the single-cycle MIPS datapath
+- Columnar, memory-mappable traces of per-cycle values
+- Event-driven simulation of clocked circuits with DFFs
+- Compilation of gate netlists into straight-line Python functions
+"""
+
+from .engine import (
+    Gate,
+    LogicSimulator,
+    Op,
+    SimulationResult,
+    levelize,
+    pack_bits,
+    unpack_bits,
+)
+from .compiler import CompiledCircuit, compile_netlist
+from .events import EventSimulator
+from .mips import (
+    DecodedInstruction,
+    MipsDatapath,
+    MipsProgram,
+    MipsSimulator,
+    MipsTrace,
+    decode_instructions,
+    encode_instruction,
+)
+from .propagation import SignalPropagation
+from .sta import TimingArc, TimingReport, analyze_timing
+from .timing import DelayModel, Timing, arrival_times
+from .trace import TraceStore
+from .truth_table import TruthTable, gate_truth_table, truth_table
+from .words import AluOp, WordResult, WordSimulator, register_word_model
+
+__all__ = [
+    "AluOp",
+    "CompiledCircuit",
+    "DecodedInstruction",
+    "DelayModel",
+    "EventSimulator",
+    "Gate",
+    "LogicSimulator",
+    "MipsDatapath",
+    "MipsProgram",
+    "MipsSimulator",
+    "MipsTrace",
+    "Op",
+    "SignalPropagation",
+    "SimulationResult",
+    "Timing",
+    "TimingArc",
+    "TimingReport",
+    "TraceStore",
+    "TruthTable",
+    "WordResult",
+    "WordSimulator",
+    "analyze_timing",
+    "arrival_times",
+    "compile_netlist",
+    "decode_instructions",
+    "encode_instruction",
+    "gate_truth_table",
+    "levelize",
+    "pack_bits",
+    "register_word_model",
+    "truth_table",
+    "unpack_bits",
+]
@@ -0,0 +1,269 @@
+"""
+Compiled evaluation of gate netlists.
+
+LogicSimulator interprets the levelized gate list on every call. compile_netlist()
+instead generates one straight-line Python function per circuit, with a
+statement per gate in topological order and a local variable per net:
+
+    def evaluate(n0, n1, m):
+        n2 = (n0 & n1) ^ m
+        n3 = n2 ^ n1
+        return (n0, n1, n2, n3)
+
+The function works on Python integers of any width, one integer holding every
+vector with m the all-ones mask, and on bit-packed uint64 NumPy arrays alike.
+evaluate_packed() joins each net's words into one integer, which beats a NumPy
+call per gate at every width. For a deep circuit evaluated on a few vectors at
+a time, this removes the interpreter's per-level overhead: a 32-bit ripple-carry
+adder evaluates several times faster than with LogicSimulator. For thousands of
+words per net, LogicSimulator's NumPy operation per level is faster.
+
+Functions are cached by a hash of the circuit's structure: in memory for the
+process, and on disk as importable modules if a cache directory is given or
+LOGICEDU_CACHE_DIR is set. Python then keeps their
+bytecode in __pycache__, so a large circuit is only compiled once.
+"""
+
+import hashlib
+import importlib.util
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Callable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..core.netlist import Net, Netlist
+from .engine import (
+    INVERTING_OPS,
+    WORD_BITS,
+    Gate,
+    NetKey,
+    Op,
+    SimulationResult,
+    levelize,
+    pack_bits,
+)
+
+CACHE_DIR_ENV = "LOGICEDU_CACHE_DIR"
+
+# Part of every circuit hash, so functions generated by older code aren't reused.
+_CODEGEN_VERSION = 1
+
+_cache: "OrderedDict[str, Callable]" = OrderedDict()
+_CACHE_SIZE = 128
+
+_OPERATORS = {
+    Op.AND: " & ",
+    Op.NAND: " & ",
+    Op.OR: " | ",
+    Op.NOR: " | ",
+    Op.XOR: " ^ ",
+    Op.XNOR: " ^ ",
+}
+
+
+def _expression(gate: Gate) -> str:
+    names = [f"n{net}" for net in gate.inputs]
+    match gate.op:
+        case Op.MUX:
+            sel, in0, in1 = names
+            return f"({in0} & ({sel} ^ m)) | ({in1} & {sel})"
+        case Op.BUF | Op.INV:
+            expression = names[0]
+        case _:
+            expression = _OPERATORS[gate.op].join(names)
+    if gate.op in INVERTING_OPS:
+        return f"({expression}) ^ m" if len(names) > 1 else f"{expression} ^ m"
+    return expression
+
+
+def generate_source(
+    gates: Sequence[Gate], input_nets: Sequence[int], name: str = "evaluate"
+) -> str:
+    """
+    Source of a function taking the input nets' values and the mask m, and
+    returning the values of the inputs and then of every gate output.
+    """
+    arguments = [f"n{net}" for net in input_nets] + ["m"]
+    lines = [f"def {name}({', '.join(arguments)}):"]
+    for gate in gates:
+        lines.append(f"    n{gate.output} = {_expression(gate)}")
+    results = [f"n{net}" for net in input_nets] + [f"n{g.output}" for g in gates]
+    trailing = "," if len(results) == 1 else ""
+    lines.append(f"    return ({', '.join(results)}{trailing})")
+    return "\n".join(lines) + "\n"
+
+
+def structure_hash(gates: Sequence[Gate], input_nets: Sequence[int]) -> str:
+    """Hash of the gates' functions and wiring and of the input order."""
+    structure = (
+        _CODEGEN_VERSION,
+        [(gate.op.value, gate.inputs, gate.output) for gate in gates],
+        tuple(input_nets),
+    )
+    return hashlib.sha1(repr(structure).encode()).hexdigest()
+
+
+def _load_module(path: str, key: str) -> Callable:
+    spec = importlib.util.spec_from_file_location(f"logicedu_circuit_{key}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.evaluate
+
+
+def _build(source: str, key: str, cache_dir: Optional[str]) -> Callable:
+    if cache_dir is None:
+        namespace = {}
+        exec(compile(source, f"<circuit {key}>", "exec"), namespace)
+        return namespace["evaluate"]
+    path = os.path.join(cache_dir, f"circuit_{key}.py")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first, so other processes never see half.
+        fd, temporary = tempfile.mkstemp(suffix=".py", dir=cache_dir)
+        with os.fdopen(fd, "w") as f:
+            f.write(source)
+        os.replace(temporary, path)
+    return _load_module(path, key)
+
+
+class CompiledCircuit:
+    """
+    A netlist's gates as one generated function.
+
+    AND, OR, XOR and their inverting variants (any number of inputs), BUF, INV
+    and 2-input Mux components are compiled, as in LogicSimulator; outputs of
+    other components are circuit inputs, as are undriven nets.
+
+    Attributes:
+        netlist (Netlist): The compiled netlist
+        key (str): Hash of the circuit's structure
+        source (str): The generated code
+        function (Callable): The generated function; see generate_source()
+        input_nets (List[Net]): Nets the function takes, in argument order
+        nets (List[int]): Net.index of each value the function returns
+    """
+
+    def __init__(self, netlist: Netlist, cache_dir: Optional[str] = None):
+        self.netlist = netlist
+        gates = levelize(netlist)
+        driven = {gate.output for gate in gates}
+        read = sorted({net for gate in gates for net in gate.inputs})
+        inputs = [net for net in read if net not in driven]
+        self.input_nets: List[Net] = [netlist.nets()[net] for net in inputs]
+        self.nets: List[int] = inputs + [gate.output for gate in gates]
+        self._rows = np.array(self.nets, dtype=np.intp)
+        self.num_nets = len(netlist.nets())
+        self.key = structure_hash(gates, inputs)
+        self.source = generate_source(gates, inputs)
+        function = _cache.get(self.key)
+        if function is None:
+            if cache_dir is None:
+                cache_dir = os.environ.get(CACHE_DIR_ENV)
+            function = _build(self.source, self.key, cache_dir)
+            _cache[self.key] = function
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+        else:
+            _cache.move_to_end(self.key)
+        self.function = function
+
+    def _index(self, key: NetKey) -> int:
+        return key.index if isinstance(key, Net) else self.netlist.net_of(key).index
+
+    def _arguments(self, inputs: Mapping[NetKey, object]) -> list:
+        given = {self._index(key): value for key, value in inputs.items()}
+        missing = [net for net in self.input_nets if net.index not in given]
+        if missing:
+            raise ValueError(f"No values given for input nets: {missing}")
+        return [given[net.index] for net in self.input_nets]
+
+    def evaluate_int(
+        self, inputs: Mapping[NetKey, int], num_vectors: int = 1
+    ) -> List[int]:
+        """
+        Evaluate vectors packed into Python integers, vector i in bit i.
+
+        Returns the value of every net, indexed by Net.index.
+        """
+        mask = (1 << num_vectors) - 1
+        values = [0] * self.num_nets
+        outputs = self.function(*self._arguments(inputs), mask)
+        for net, value in zip(self.nets, outputs):
+            values[net] = value & mask
+        return values
+
+    def evaluate_packed(
+        self, inputs: Mapping[NetKey, np.ndarray], num_vectors: Optional[int] = None
+    ) -> SimulationResult:
+        """
+        Evaluate bit-packed uint64 words, like LogicSimulator.evaluate_packed().
+
+        Each net's words are joined into one Python integer, so the function
+        runs once with a big-integer operation per gate rather than a NumPy
+        call per gate. That wins for a few words per net; for thousands,
+        LogicSimulator's one NumPy operation per level is faster.
+        """
+        arguments = [
+            np.asarray(value, dtype=np.uint64) for value in self._arguments(inputs)
+        ]
+        lengths = {a.size for a in arguments if a.ndim}
+        if len(lengths) > 1:
+            raise ValueError(f"Input word arrays differ in length: {sorted(lengths)}")
+        words = lengths.pop() if lengths else 1
+        stacked = np.empty((len(arguments), words), dtype="<u8")
+        for row, value in zip(stacked, arguments):
+            row[:] = value
+        size = words * 8
+        data = memoryview(stacked).cast("B")
+        outputs = self.function(
+            *(
+                int.from_bytes(data[i : i + size], "little")
+                for i in range(0, len(data), size)
+            ),
+            (1 << (size * 8)) - 1,
+        )
+        packed = b"".join(value.to_bytes(size, "little") for value in outputs)
+        values = np.zeros((self.num_nets, words), dtype=np.uint64)
+        values[self._rows] = np.frombuffer(packed, dtype="<u8").reshape(-1, words)
+        if num_vectors is None:
+            num_vectors = words * WORD_BITS
+        return SimulationResult(self.netlist, values, num_vectors)
+
+    def evaluate(self, inputs: Mapping[NetKey, object]) -> SimulationResult:
+        """Evaluate input vectors given as booleans, like LogicSimulator.evaluate()."""
+        arrays = {k: np.asarray(v, dtype=bool) for k, v in inputs.items()}
+        lengths = {a.size for a in arrays.values() if a.ndim > 0}
+        if len(lengths) > 1:
+            raise ValueError(f"Input vectors differ in length: {sorted(lengths)}")
+        num_vectors = lengths.pop() if lengths else 1
+        packed = {
+            k: pack_bits(np.broadcast_to(a, (num_vectors,))) for k, a in arrays.items()
+        }
+        return self.evaluate_packed(packed, num_vectors=num_vectors)
+
+
+def compile_netlist(
+    netlist: Netlist, cache_dir: Optional[str] = None
+) -> CompiledCircuit:
+    """
+    Compile a netlist's gates into a straight-line function.
+
+    Parameters:
+        netlist (Netlist): Connectivity of the circuit
+        cache_dir (str): Directory to keep generated modules in (default: the
+            LOGICEDU_CACHE_DIR environment variable, or memory only)
+
+    Examples:
+        >>> circuit = compile_netlist(netlist)
+        >>> result = circuit.evaluate({a: [0, 1, 0, 1], b: [0, 0, 1, 1]})
+        >>> result.value(y)
+        >>> circuit.evaluate_int({a: 0b1010, b: 0b1100}, num_vectors=4)
+    """
+    return CompiledCircuit(netlist, cache_dir=cache_dir)
+
+
+def clear_cache():
+    """Forget the compiled functions held in memory."""
+    _cache.clear()
@@ -0,0 +1,305 @@
+"""
+Gate-level logic simulation.
+
+LogicSimulator levelizes the gates of a Netlist and evaluates them on bit-packed
+uint64 words: every bit of a word is an independent input vector, so a word
+evaluates 64 vectors at once. Gates on the same level that share a function and
+input count are evaluated together by a single NumPy operation, so the Python
+overhead is per level rather than per gate.
+"""
+
+import enum
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from manim import GREEN, GREY
+
+from ..components.blocks import Mux
+from ..components.logic_gates import BinaryLogic, UnaryLogic
+from ..core.basics import Pin, VGroupLogicBase, VGroupLogicObjectBase
+from ..core.netlist import Net, Netlist
+
+WORD_BITS = 64
+ALL_ONES = np.uint64(0xFFFF_FFFF_FFFF_FFFF)
+
+NetKey = Union[Pin, Net]
+
+
+class Op(enum.Enum):
+    """Boolean function evaluated by a gate."""
+
+    AND = "AND"
+    NAND = "NAND"
+    OR = "OR"
+    NOR = "NOR"
+    XOR = "XOR"
+    XNOR = "XNOR"
+    BUF = "BUF"
+    INV = "INV"
+    # Inputs are (sel, in0, in1).
+    MUX = "MUX"
+
+
+INVERTING_OPS = {Op.NAND, Op.NOR, Op.XNOR, Op.INV}
+
+
+@dataclass
+class Gate:
+    """A component reduced to its function and the nets it reads and drives."""
+
+    component: VGroupLogicObjectBase
+    op: Op
+    inputs: Tuple[int, ...]
+    output: int
+    level: int = 0
+
+
+@dataclass
+class _GateGroup:
+    """Gates on one level with the same op and input count."""
+
+    op: Op
+    inputs: np.ndarray  # (gates, arity) net indices
+    outputs: np.ndarray  # (gates,) net indices
+    gates: List[Gate] = field(default_factory=list)
+
+
+def gate_for(component: VGroupLogicObjectBase, netlist: Netlist) -> Optional[Gate]:
+    """Return the Gate for a component, or None if it has no logic model."""
+    if isinstance(component, (BinaryLogic, UnaryLogic)):
+        op = Op[component.logic_function.name]
+        input_pins = component._get_input_pins()
+    elif isinstance(component, Mux) and component.num_inputs == 2:
+        # Wider muxes need a multi-bit select; WordSimulator models those.
+        op = Op.MUX
+        in0, in1, sel = component._get_input_pins()
+        input_pins = [sel, in0, in1]
+    else:
+        return None
+    output_pin = component._get_output_pins()[0]
+    return Gate(
+        component=component,
+        op=op,
+        inputs=tuple(netlist.net_of(pin).index for pin in input_pins),
+        output=netlist.net_of(output_pin).index,
+    )
+
+
+def levelize(netlist: Netlist) -> List[Gate]:
+    """
+    Return the netlist's gates in topological order with their levels set.
+
+    A gate's level is one more than the highest level among the gates driving its
+    inputs; gates fed only by circuit inputs are level 0.
+    """
+    netlist.nets()  # assigns Net.index
+    gates = [
+        gate
+        for gate in (gate_for(c, netlist) for c in netlist.components)
+        if gate is not None
+    ]
+    driver: Dict[int, Gate] = {}
+    for gate in gates:
+        if gate.output in driver:
+            raise ValueError(
+                f"Net {gate.output} is driven by both "
+                f"{type(driver[gate.output].component).__name__} and "
+                f"{type(gate.component).__name__}"
+            )
+        driver[gate.output] = gate
+
+    fanout: Dict[int, List[Gate]] = {}
+    pending: Dict[int, int] = {}
+    ready: List[Gate] = []
+    for gate in gates:
+        sources = {id(driver[n]): driver[n] for n in gate.inputs if n in driver}
+        pending[id(gate)] = len(sources)
+        for source in sources.values():
+            fanout.setdefault(id(source), []).append(gate)
+        if not sources:
+            ready.append(gate)
+
+    ordered: List[Gate] = []
+    while ready:
+        gate = ready.pop()
+        ordered.append(gate)
+        for sink in fanout.get(id(gate), ()):
+            sink.level = max(sink.level, gate.level + 1)
+            pending[id(sink)] -= 1
+            if pending[id(sink)] == 0:
+                ready.append(sink)
+
+    if len(ordered) != len(gates):
+        raise ValueError("Netlist contains a combinational loop")
+    ordered.sort(key=lambda g: g.level)
+    return ordered
+
+
+def pack_bits(bits) -> np.ndarray:
+    """Pack a sequence of booleans into uint64 words, vector i in bit i % 64 of word i // 64."""
+    bits = np.asarray(bits, dtype=bool).ravel()
+    words = -(-len(bits) // WORD_BITS)
+    packed = np.zeros(words * 8, dtype=np.uint8)
+    packed[: -(-len(bits) // 8)] = np.packbits(bits, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def unpack_bits(words: np.ndarray, count: int) -> np.ndarray:
+    """Inverse of pack_bits: return the first count vectors as booleans."""
+    words = np.ascontiguousarray(words, dtype="<u8")
+    return np.unpackbits(words.view(np.uint8), bitorder="little")[:count].astype(bool)
+
+
+class SimulationResult:
+    """
+    Net values computed by LogicSimulator.
+
+    Attributes:
+        netlist (Netlist): The simulated netlist
+        packed_values (np.ndarray): (nets, words) uint64 array of packed net values
+        num_vectors (int): Number of valid vectors in the packed words
+    """
+
+    def __init__(self, netlist: Netlist, packed_values: np.ndarray, num_vectors: int):
+        self.netlist = netlist
+        self.packed_values = packed_values
+        self.num_vectors = num_vectors
+
+    def _index(self, key: NetKey) -> int:
+        return key.index if isinstance(key, Net) else self.netlist.net_of(key).index
+
+    def packed(self, key: NetKey) -> np.ndarray:
+        """Packed uint64 words for a pin's net."""
+        return self.packed_values[self._index(key)]
+
+    def value(self, key: NetKey) -> np.ndarray:
+        """Boolean value of a pin's net for every vector."""
+        return unpack_bits(self.packed(key), self.num_vectors)
+
+    def wire_values(self, vector: int = 0) -> Dict[VGroupLogicBase, bool]:
+        """Map each wire in the netlist to its value for one input vector."""
+        word, bit = divmod(vector, WORD_BITS)
+        values = {}
+        for net in self.netlist.nets():
+            high = bool((int(self.packed_values[net.index, word]) >> bit) & 1)
+            for wire in net.wires:
+                values[wire] = high
+        return values
+
+    def color_wires(self, vector: int = 0, high_color=GREEN, low_color=GREY):
+        """Color every wire by its value for one input vector; returns the wires."""
+        values = self.wire_values(vector)
+        for wire, high in values.items():
+            wire.set_color(high_color if high else low_color)
+        return list(values)
+
+
+class LogicSimulator:
+    """
+    Evaluates the combinational logic of a Netlist.
+
+    AND, OR, XOR and their inverting variants, BUF, INV and 2-input Mux components
+    are simulated. Outputs of other components (DFFs, memories, wider Muxes, ...)
+    are treated as circuit inputs, as are undriven nets.
+
+    Parameters:
+        netlist (Netlist): Connectivity of the circuit to simulate
+
+    Examples:
+        >>> sim = LogicSimulator(Netlist(wires=[wire], components=[a, b]))
+        >>> result = sim.evaluate({a.get_input_by_index(0): [0, 1, 0, 1],
+        ...                        a.get_input_by_index(1): [0, 0, 1, 1],
+        ...                        b.get_input_by_index(1): 1})
+        >>> result.value(b.get_output_by_index(0))
+    """
+
+    def __init__(self, netlist: Netlist):
+        self.netlist = netlist
+        self.gates = levelize(netlist)
+        self.num_nets = len(netlist.nets())
+        driven = {gate.output for gate in self.gates}
+        read = sorted({net for gate in self.gates for net in gate.inputs})
+        self.input_nets: List[Net] = [
+            netlist.nets()[net] for net in read if net not in driven
+        ]
+        self._groups = self._schedule()
+
+    def _schedule(self) -> List[_GateGroup]:
+        groups: Dict[Tuple[int, Op, int], _GateGroup] = {}
+        for gate in self.gates:
+            key = (gate.level, gate.op, len(gate.inputs))
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = _GateGroup(gate.op, None, None)
+            group.gates.append(gate)
+        ordered = [groups[key] for key in sorted(groups, key=lambda k: k[0])]
+        for group in ordered:
+            group.inputs = np.array([g.inputs for g in group.gates], dtype=np.intp)
+            group.outputs = np.array([g.output for g in group.gates], dtype=np.intp)
+        return ordered
+
+    def _index(self, key: NetKey) -> int:
+        return key.index if isinstance(key, Net) else self.netlist.net_of(key).index
+
+    def evaluate_packed(
+        self, inputs: Mapping[NetKey, np.ndarray], num_vectors: Optional[int] = None
+    ) -> SimulationResult:
+        """
+        Evaluate bit-packed input vectors.
+
+        Parameters:
+            inputs: uint64 word arrays, all of the same length, keyed by pin or net
+            num_vectors: Number of valid vectors (default: 64 per word)
+        """
+        arrays = {self._index(k): np.asarray(v, dtype=np.uint64) for k, v in inputs.items()}
+        missing = [net for net in self.input_nets if net.index not in arrays]
+        if missing:
+            raise ValueError(f"No values given for input nets: {missing}")
+        lengths = {len(a) for a in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Input word arrays differ in length: {sorted(lengths)}")
+        words = lengths.pop() if lengths else 1
+
+        values = np.zeros((self.num_nets, words), dtype=np.uint64)
+        for net, packed in arrays.items():
+            values[net] = packed
+
+        for group in self._groups:
+            operands = values[group.inputs]  # (gates, arity, words)
+            match group.op:
+                case Op.AND | Op.NAND:
+                    out = np.bitwise_and.reduce(operands, axis=1)
+                case Op.OR | Op.NOR:
+                    out = np.bitwise_or.reduce(operands, axis=1)
+                case Op.XOR | Op.XNOR:
+                    out = np.bitwise_xor.reduce(operands, axis=1)
+                case Op.BUF | Op.INV:
+                    out = operands[:, 0]
+                case Op.MUX:
+                    sel, in0, in1 = operands[:, 0], operands[:, 1], operands[:, 2]
+                    out = (in0 & ~sel) | (in1 & sel)
+            if group.op in INVERTING_OPS:
+                out = out ^ ALL_ONES
+            values[group.outputs] = out
+
+        if num_vectors is None:
+            num_vectors = words * WORD_BITS
+        return SimulationResult(self.netlist, values, num_vectors)
+
+    def evaluate(self, inputs: Mapping[NetKey, object]) -> SimulationResult:
+        """
+        Evaluate input vectors given as booleans.
+
+        Each value is a scalar, applied to every vector, or a sequence of 0/1 or
+        booleans; all sequences must have the same length.
+        """
+        arrays = {k: np.asarray(v, dtype=bool) for k, v in inputs.items()}
+        lengths = {a.size for a in arrays.values() if a.ndim > 0}
+        if len(lengths) > 1:
+            raise ValueError(f"Input vectors differ in length: {sorted(lengths)}")
+        num_vectors = lengths.pop() if lengths else 1
+        packed = {
+            k: pack_bits(np.broadcast_to(a, (num_vectors,))) for k, a in arrays.items()
+        }
+        return self.evaluate_packed(packed, num_vectors=num_vectors)
@@ -0,0 +1,285 @@
+"""
+Event-driven simulation of sequential circuits.
+
+LogicSimulator and WordSimulator evaluate every block for every vector, which
+suits combinational logic. In a clocked circuit most nets are quiet most of the
+time, so EventSimulator only does work where something changes. A change on a
+net is an event in a priority queue ordered by time and delta cycle. Applying
+it re-evaluates just the components reading that net, and those schedule events
+for their outputs after their delay. Zero-delay updates at the same time are
+separate delta cycles, so a DFF's new Q is seen after every flop on the same
+clock edge has sampled its D.
+
+Gates (BinaryLogic, UnaryLogic and 2-input Mux) and DFFs of every variant are
+simulated. A DFF captures D on the rising clock edge. R clears Q and S sets it,
+R winning if both are set; they act at once if the DFF's async_reset is set,
+otherwise at the next rising edge. Outputs of other components are circuit
+inputs.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from manim import GREEN, GREY
+
+from ..components.blocks import DFF, DFFVariant
+from ..core.basics import VGroupLogicBase
+from ..core.netlist import Net, Netlist
+from .engine import INVERTING_OPS, NetKey, Op, gate_for
+from .timing import DelayModel
+
+# Delta cycles allowed at one time before the circuit is taken to oscillate.
+MAX_DELTAS = 1000
+
+
+def _gate_function(
+    op: Op, inputs: Tuple[int, ...], values: List[int]
+) -> Callable[[], int]:
+    """A function computing a gate's output from the current net values."""
+    match op:
+        case Op.AND | Op.NAND:
+
+            def function():
+                return int(all(values[i] for i in inputs))
+
+        case Op.OR | Op.NOR:
+
+            def function():
+                return int(any(values[i] for i in inputs))
+
+        case Op.XOR | Op.XNOR:
+
+            def function():
+                return sum(values[i] for i in inputs) & 1
+
+        case Op.MUX:
+            sel, in0, in1 = inputs
+
+            def function():
+                return values[in1] if values[sel] else values[in0]
+
+        case _:
+            (source,) = inputs
+
+            def function():
+                return values[source]
+
+    if op in INVERTING_OPS:
+        return lambda: function() ^ 1
+    return function
+
+
+class EventSimulator:
+    """
+    Simulates a Netlist by scheduling and applying value changes.
+
+    All nets start at 0. Gates are evaluated once at time 0, so e.g. inverter
+    outputs settle to 1 in the first run().
+
+    Parameters:
+        netlist (Netlist): Connectivity of the circuit to simulate
+        delays (DelayModel): Component delays; the DFF delay is clock to Q.
+            Wire delays are not used. (default: none, every update takes one
+            delta cycle)
+
+    Attributes:
+        time (float): Time of the last applied events
+        events (int): Net changes applied so far
+        evaluations (int): Component evaluations so far
+
+    Examples:
+        >>> sim = EventSimulator(netlist)
+        >>> sim.set({flop.r_pin: 1})
+        >>> sim.set({flop.r_pin: 0}, at=5)
+        >>> sim.clock(flop.clk_pin, period=10, cycles=100)
+        >>> sim.watch(flop.q_pin)
+        >>> sim.run()
+        >>> sim.value(flop.q_pin), sim.history(flop.q_pin)
+    """
+
+    def __init__(self, netlist: Netlist, delays: Optional[DelayModel] = None):
+        self.netlist = netlist
+        self.time = 0.0
+        self.events = 0
+        self.evaluations = 0
+        nets = netlist.nets()
+        self._values: List[int] = [0] * len(nets)
+        # Last value scheduled for each net, to skip events that change nothing.
+        self._projected: List[int] = [0] * len(nets)
+        self._fanout: List[List[int]] = [[] for _ in nets]
+        self._processes: List[Callable[[], Optional[int]]] = []
+        self._outputs: List[int] = []
+        self._delays: List[float] = []
+        self._queue: List[Tuple[float, int, int, int, int]] = []
+        self._sequence = itertools.count()
+        self._delta = 0
+        self._history: Dict[int, List[Tuple[float, int]]] = {}
+
+        for component in netlist.components:
+            delay = delays.component_delay(component) if delays else 0.0
+            if isinstance(component, DFF):
+                self._add_flop(component, delay)
+                continue
+            gate = gate_for(component, netlist)
+            if gate is None:
+                continue
+            function = _gate_function(gate.op, gate.inputs, self._values)
+            self._add_process(function, gate.inputs, gate.output, delay)
+            self._schedule(gate.output, function(), delay)
+
+    def _add_process(
+        self,
+        function: Callable[[], Optional[int]],
+        inputs: Sequence[int],
+        output: int,
+        delay: float,
+    ):
+        process = len(self._processes)
+        self._processes.append(function)
+        self._outputs.append(output)
+        self._delays.append(delay)
+        for net in set(inputs):
+            self._fanout[net].append(process)
+
+    def _add_flop(self, flop: DFF, delay: float):
+        values = self._values
+        net = self._index
+        d, q, clk = net(flop.d_pin), net(flop.q_pin), net(flop.clk_pin)
+        reset = net(flop.r_pin) if flop.variant != DFFVariant.DFF else None
+        set_ = net(flop.s_pin) if flop.variant == DFFVariant.DFF_SR else None
+        mask = flop.q_pin.mask
+        last_clock = [0]
+
+        def evaluate() -> Optional[int]:
+            rising = values[clk] and not last_clock[0]
+            last_clock[0] = values[clk]
+            r = reset is not None and values[reset]
+            s = set_ is not None and values[set_]
+            if flop.async_reset and (r or s) or rising:
+                return 0 if r else mask if s else values[d] & mask
+            return None
+
+        inputs = [n for n in (clk, reset, set_) if n is not None]
+        self._add_process(evaluate, inputs, q, delay)
+
+    def _index(self, key: NetKey) -> int:
+        return key.index if isinstance(key, Net) else self.netlist.net_of(key).index
+
+    def _schedule(self, net: int, value: int, delay: float):
+        if value == self._projected[net]:
+            return
+        self._projected[net] = value
+        if delay:
+            entry = (self.time + delay, 0, next(self._sequence), net, value)
+        else:
+            entry = (self.time, self._delta + 1, next(self._sequence), net, value)
+        heapq.heappush(self._queue, entry)
+
+    # Stimulus
+
+    def set(self, inputs: Mapping[NetKey, int], at: Optional[float] = None):
+        """Schedule circuit inputs, keyed by pin or net, to change at a time."""
+        time = self.time if at is None else at
+        if time < self.time:
+            raise ValueError(f"Cannot schedule at {time}, before time {self.time}")
+        for key, value in inputs.items():
+            net = self._index(key)
+            self._projected[net] = value
+            entry = (time, 0, next(self._sequence), net, int(value))
+            heapq.heappush(self._queue, entry)
+
+    def clock(
+        self,
+        key: NetKey,
+        period: float,
+        cycles: int,
+        start: Optional[float] = None,
+    ):
+        """
+        Schedule a clock: low for the first half of each period, rising at its
+        middle. The first period begins at start (default: the current time).
+        """
+        start = self.time if start is None else start
+        for cycle in range(cycles):
+            self.set({key: 1}, at=start + (cycle + 0.5) * period)
+            self.set({key: 0}, at=start + (cycle + 1) * period)
+
+    # Running
+
+    def run(self, until: Optional[float] = None) -> int:
+        """
+        Apply events up to time until (default: until none are left).
+
+        Returns the number of net changes applied.
+
+        Raises:
+            ValueError: If the circuit is still changing after MAX_DELTAS delta
+                cycles at one time
+        """
+        queue, values, fanout = self._queue, self._values, self._fanout
+        processes, outputs, delays = self._processes, self._outputs, self._delays
+        history = self._history
+        start_events = self.events
+        while queue and (until is None or queue[0][0] <= until):
+            time, delta = queue[0][0], queue[0][1]
+            if delta > MAX_DELTAS:
+                raise ValueError(f"Circuit did not settle at time {time}")
+            self.time, self._delta = time, delta
+            triggered: Dict[int, None] = {}
+            while queue and queue[0][0] == time and queue[0][1] == delta:
+                _, _, _, net, value = heapq.heappop(queue)
+                if values[net] == value:
+                    continue
+                values[net] = value
+                self.events += 1
+                if net in history:
+                    history[net].append((time, value))
+                for process in fanout[net]:
+                    triggered[process] = None
+            for process in triggered:
+                self.evaluations += 1
+                value = processes[process]()
+                if value is not None:
+                    self._schedule(outputs[process], value, delays[process])
+        if until is not None and until > self.time:
+            self.time = until
+        return self.events - start_events
+
+    # Results
+
+    def value(self, key: NetKey) -> int:
+        """Current value of a pin's net, or of a Net."""
+        return self._values[self._index(key)]
+
+    def watch(self, *keys: NetKey):
+        """Record every later change of these pins' nets; see history()."""
+        for key in keys:
+            self._history.setdefault(self._index(key), [])
+
+    def history(self, key: NetKey) -> List[Tuple[float, int]]:
+        """(time, value) of each change of a watched net."""
+        return self._history[self._index(key)]
+
+    def apply(self) -> "EventSimulator":
+        """Store the current values in pin.value of every pin in the netlist."""
+        for net in self.netlist.nets():
+            value = self._values[net.index]
+            for pin in net.pins:
+                pin.set_value(value & pin.mask)
+        return self
+
+    def color_wires(self, high_color=GREEN, low_color=GREY) -> List[VGroupLogicBase]:
+        """Color every wire by its net's current value; returns the wires."""
+        wires = []
+        for net in self.netlist.nets():
+            color = high_color if self._values[net.index] else low_color
+            for wire in net.wires:
+                wire.set_color(color)
+                wires.append(wire)
+        return wires
+
+    def __repr__(self):
+        pending = len(self._queue)
+        return f"EventSimulator(time={self.time}, {pending} events pending)"
+
@@ -0,0 +1,751 @@
+"""
+Single-cycle MIPS simulation for the Figure 4.17 datapath.
+
+MipsSimulator runs programs on the datapath drawn by Cod6Fig417. It supports the
+instructions that datapath's control unit decodes (add, sub, and, or, slt, nor,
+lw, sw and beq) plus addi. A MipsProgram holds the instruction words, often a
+memory-mapped image from load_image(), and decodes each word the first time it
+is fetched, so a large program starts at once and each cycle of the run loop is
+a handful of Python integer operations. Only the values that
+depend on machine state are recorded per cycle: the PC, the two register reads
+and the data memory read. Every other signal of the datapath, from the control
+lines to the next PC, is computed from those columns with NumPy when the trace is
+first read.
+
+A MipsTrace drives animations through a MipsDatapath, which names the drawn
+blocks. apply() stores a cycle's values on the pins, and control_animations()
+colors the control wires by their value.
+"""
+
+import enum
+from array import array
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from manim import GREY, YELLOW, UP, Animation, VGroup
+
+from ..components.blocks import (
+    ALUZ,
+    PC,
+    AdderPlus4,
+    AluControl,
+    BranchLogic,
+    ControlUnit,
+    DataMemory,
+    InstructionMemory,
+    Mux,
+    RegisterFile,
+    SignExtend,
+)
+from ..components.storage import MemoryStorage, RegisterStorage, load_image
+from ..core.basics import Pin
+from ..core.label_cache import cached_text
+from ..core.netlist import Netlist
+from .trace import TraceStore
+from .words import AluOp, alu_compute, register_word_model
+
+_MASK = 0xFFFF_FFFF
+_SIGN = 0x8000_0000
+
+
+class Opcode(enum.IntEnum):
+    """Opcodes (inst[31:26]) of the supported instructions."""
+
+    RTYPE = 0x00
+    BEQ = 0x04
+    ADDI = 0x08
+    LW = 0x23
+    SW = 0x2B
+
+
+class Funct(enum.IntEnum):
+    """Function codes (inst[5:0]) of the supported R-type instructions."""
+
+    ADD = 0x20
+    SUB = 0x22
+    AND = 0x24
+    OR = 0x25
+    NOR = 0x27
+    SLT = 0x2A
+
+
+CONTROL_SIGNALS: Tuple[str, ...] = (
+    "RegDst",
+    "ALUSrc",
+    "MemtoReg",
+    "RegWrite",
+    "MemRead",
+    "MemWrite",
+    "Branch",
+    "ALUOp",
+)
+
+# Control unit outputs of each opcode, in CONTROL_SIGNALS order (Figure 4.18).
+# Don't-care outputs are 0.
+CONTROL_TABLE: Dict[int, Tuple[int, ...]] = {
+    Opcode.RTYPE: (1, 0, 0, 1, 0, 0, 0, 0b10),
+    Opcode.LW: (0, 1, 1, 1, 1, 0, 0, 0b00),
+    Opcode.SW: (0, 1, 0, 0, 0, 1, 0, 0b00),
+    Opcode.BEQ: (0, 0, 0, 0, 0, 0, 1, 0b01),
+    Opcode.ADDI: (0, 1, 0, 1, 0, 0, 0, 0b00),
+}
+
+FUNCT_ALU_OPS: Dict[int, AluOp] = {
+    Funct.ADD: AluOp.ADD,
+    Funct.SUB: AluOp.SUB,
+    Funct.AND: AluOp.AND,
+    Funct.OR: AluOp.OR,
+    Funct.NOR: AluOp.NOR,
+    Funct.SLT: AluOp.SLT,
+}
+
+# ALU control output for function codes the ALU doesn't implement.
+INVALID_ALU_OP = 0b1111
+
+# Width of every signal in a MipsTrace.
+SIGNAL_WIDTHS: Dict[str, int] = {
+    "PC": 32,
+    "PCPlus4": 32,
+    "Inst": 32,
+    "RegDst": 1,
+    "ALUSrc": 1,
+    "MemtoReg": 1,
+    "RegWrite": 1,
+    "MemRead": 1,
+    "MemWrite": 1,
+    "Branch": 1,
+    "ALUOp": 2,
+    "ReadData1": 32,
+    "ReadData2": 32,
+    "WriteReg": 5,
+    "Imm": 32,
+    "ALUIn1": 32,
+    "ALUControl": 4,
+    "ALUResult": 32,
+    "Zero": 1,
+    "MemReadData": 32,
+    "WriteData": 32,
+    "BranchTarget": 32,
+    "NextPC": 32,
+}
+TRACE_SIGNALS: Tuple[str, ...] = tuple(SIGNAL_WIDTHS)
+
+# Signals recorded by the run loop; the rest are derived from these.
+RECORDED_SIGNALS: Tuple[str, ...] = ("PC", "ReadData1", "ReadData2", "MemReadData")
+
+# Cycles the run loop buffers before copying them into the trace.
+_CHUNK_CYCLES = 1 << 16
+
+
+def _control_lut() -> np.ndarray:
+    """Control outputs by signal (rows) and opcode (columns)."""
+    lut = np.zeros((len(CONTROL_SIGNALS), 64), dtype=np.uint8)
+    for code, values in CONTROL_TABLE.items():
+        lut[:, code] = values
+    return lut
+
+
+def _alu_control_lut() -> np.ndarray:
+    """ALU control codes by ALUOp (rows) and function code (columns)."""
+    lut = np.full((4, 64), INVALID_ALU_OP, dtype=np.uint8)
+    lut[0b00, :] = AluOp.ADD
+    lut[0b01, :] = AluOp.SUB
+    for code, op in FUNCT_ALU_OPS.items():
+        # ALUOp 1x: R-type, decoded from the function code.
+        lut[0b10:, code] = op
+    return lut
+
+
+# Decoding is one table lookup per column instead of a comparison per opcode.
+_CONTROL_LUT = _control_lut()
+_ALU_CONTROL_LUT = _alu_control_lut()
+
+
+def control_signals(opcode) -> Dict[str, np.ndarray]:
+    """Control unit outputs for each opcode; unsupported opcodes give all zeros."""
+    opcode = np.asarray(opcode).astype(np.intp) & 0x3F
+    rows = _CONTROL_LUT[:, opcode]
+    return {name: rows[i] for i, name in enumerate(CONTROL_SIGNALS)}
+
+
+def alu_control(alu_op, funct) -> np.ndarray:
+    """ALU control codes (AluOp) from the 2-bit ALUOp and the function code."""
+    alu_op = np.asarray(alu_op).astype(np.intp) & 0b11
+    return _ALU_CONTROL_LUT[alu_op, np.asarray(funct).astype(np.intp) & 0x3F]
+
+
+def decode_instructions(words) -> Dict[str, np.ndarray]:
+    """
+    Decode instruction words in bulk: the fields, the Control and ALU Control
+    outputs, and the signals that depend only on the instruction.
+
+    Returns arrays keyed by "Opcode", "Rs", "Rt", "Rd", "Funct", "Inst", "Imm"
+    (sign-extended), "WriteReg", "ALUControl" and each of CONTROL_SIGNALS.
+
+    Examples:
+        >>> decoded = decode_instructions(program.words)
+        >>> decoded["RegWrite"], decoded["ALUControl"] == AluOp.SUB
+    """
+    inst = np.atleast_1d(np.asarray(words).astype(np.uint32))
+    fields = {
+        "Inst": inst,
+        "Opcode": inst >> 26,
+        "Rs": (inst >> 21) & 0x1F,
+        "Rt": (inst >> 16) & 0x1F,
+        "Rd": (inst >> 11) & 0x1F,
+        "Funct": inst & 0x3F,
+        "Imm": (inst & 0xFFFF).astype(np.uint16).view(np.int16).astype(np.uint32),
+    }
+    fields.update(control_signals(fields["Opcode"]))
+    fields["WriteReg"] = np.where(fields["RegDst"], fields["Rd"], fields["Rt"])
+    fields["ALUControl"] = alu_control(fields["ALUOp"], fields["Funct"])
+    return fields
+
+
+def _control_model(component, values, control):
+    (opcode,) = values.values()
+    signals = control_signals(opcode)
+    return {component.get_output_by_label(name): signals[name] for name in signals}
+
+
+def _alu_control_model(component, values, control):
+    seen = {pin.label_str: value for pin, value in values.items()}
+    decode = alu_control(seen["ALUOp"], seen["inst[5:0]"])
+    return {component.get_output_by_label("decode"): decode}
+
+
+register_word_model(ControlUnit, _control_model)
+register_word_model(AluControl, _alu_control_model)
+
+
+def _check_register(number: int) -> int:
+    if not 0 <= number < 32:
+        raise ValueError(f"Register number out of range: {number}")
+    return number
+
+
+def encode_instruction(mnemonic: str, *operands: int) -> int:
+    """
+    Encode one supported instruction. Registers are given by number.
+
+    Examples:
+        >>> encode_instruction("add", 8, 9, 10)  # add $t0, $t1, $t2
+        >>> encode_instruction("lw", 8, 4, 29)  # lw $t0, 4($sp)
+        >>> encode_instruction("beq", 8, 0, -3)  # beq $t0, $zero, -3
+        >>> encode_instruction("addi", 8, 8, 1)  # addi $t0, $t0, 1
+    """
+    name = mnemonic.upper()
+    if name in Funct.__members__:
+        rd, rs, rt = (_check_register(r) for r in operands)
+        return (rs << 21) | (rt << 16) | (rd << 11) | Funct[name]
+    match name:
+        case "LW" | "SW":
+            rt, offset, rs = operands
+        case "BEQ":
+            rs, rt, offset = operands
+        case "ADDI":
+            rt, rs, offset = operands
+        case _:
+            raise ValueError(f"Unsupported instruction: {mnemonic}")
+    if not -(1 << 15) <= offset < (1 << 15):
+        raise ValueError(f"Immediate out of range: {offset}")
+    rs, rt = _check_register(rs), _check_register(rt)
+    return (Opcode[name] << 26) | (rs << 21) | (rt << 16) | (offset & 0xFFFF)
+
+
+@dataclass
+class MipsDatapath:
+    """The drawn blocks of a single-cycle datapath, e.g. Cod6Fig417.datapath."""
+
+    pc: PC
+    adder_plus4: AdderPlus4
+    imem: InstructionMemory
+    control: ControlUnit
+    regfile: RegisterFile
+    sign_extend: SignExtend
+    alu: ALUZ
+    alu_control: AluControl
+    dmem: DataMemory
+    branch_logic: BranchLogic
+    write_reg_mux: Mux
+    alu_src_mux: Mux
+    mem_to_reg_mux: Mux
+
+    def signal_pins(self) -> Dict[str, Pin]:
+        """The output pin driving each trace signal."""
+        pins = {
+            "PC": self.pc.get_output_by_label("PC"),
+            "PCPlus4": self.adder_plus4.result_pin,
+            "Inst": self.imem.get_output_by_label("Inst"),
+            "ReadData1": self.regfile.get_output_by_label("ReadData1"),
+            "ReadData2": self.regfile.get_output_by_label("ReadData2"),
+            "WriteReg": self.write_reg_mux.get_output_by_index(0),
+            "Imm": self.sign_extend.get_output_by_index(0),
+            "ALUIn1": self.alu_src_mux.get_output_by_index(0),
+            "ALUControl": self.alu_control.get_output_by_label("decode"),
+            "ALUResult": self.alu.result_pin,
+            "Zero": self.alu.zero_pin,
+            "MemReadData": self.dmem.get_output_by_label("ReadData"),
+            "WriteData": self.mem_to_reg_mux.get_output_by_index(0),
+            "BranchTarget": self.branch_logic.branch_adder.result_pin,
+            "NextPC": self.branch_logic.get_output_by_index(0),
+        }
+        for name in CONTROL_SIGNALS:
+            pins[name] = self.control.get_output_by_label(name)
+        return pins
+
+    def control_animations(
+        self,
+        values: Mapping[str, int],
+        netlist: Netlist,
+        high_color=YELLOW,
+        low_color=GREY,
+    ) -> List[Animation]:
+        """
+        Color the wires of the control signals (and Zero) in values by whether
+        they are set, e.g. for one instruction of decode_instructions().
+        """
+        pins = self.signal_pins()
+        animations = []
+        for name in CONTROL_SIGNALS + ("Zero",):
+            if name not in values or pins[name] not in netlist:
+                continue
+            color = high_color if values[name] else low_color
+            for wire in netlist.net_of(pins[name]).wires:
+                animations.append(wire.animate.set_color(color))
+        return animations
+
+    def control_labels(
+        self,
+        values: Mapping[str, int],
+        signals: Sequence[str] = ("ALUOp", "ALUControl"),
+        **kwargs,
+    ) -> VGroup:
+        """Binary values of multi-bit control signals, next to their pins."""
+        font_size = kwargs.pop("font_size", 14)
+        color = kwargs.pop("color", YELLOW)
+        pins = self.signal_pins()
+        labels = VGroup()
+        for name in signals:
+            text = format(int(values[name]), f"0{SIGNAL_WIDTHS[name]}b")
+            label = cached_text(text, font_size=font_size, color=color)
+            labels.add(label.next_to(pins[name].dot, UP, buff=0.05))
+        return labels
+
+
+class MipsTrace:
+    """
+    Per-cycle values of the datapath signals, kept in a TraceStore.
+
+    trace["ALUResult"] is a NumPy array with one value per cycle; the signal names
+    are listed in TRACE_SIGNALS. trace[1000:2000] is a trace of those cycles.
+
+    Attributes:
+        program (np.ndarray): Instruction words, starting at text_base; None for
+            a loaded trace
+        text_base (int): Address of the first instruction
+        store (TraceStore): The columns, named after the signals
+        num_cycles (int): Number of cycles traced
+    """
+
+    def __init__(
+        self, program: Optional[np.ndarray], text_base: int, store: TraceStore
+    ):
+        self.program = program
+        self.text_base = text_base
+        self.store = store
+        self.num_cycles = len(store)
+
+    def __len__(self) -> int:
+        return self.num_cycles
+
+    def __getitem__(self, name) -> np.ndarray:
+        if isinstance(name, slice):
+            self._derive()
+            return MipsTrace(self.program, self.text_base, self.store[name])
+        if name not in self.store:
+            if name not in SIGNAL_WIDTHS:
+                raise KeyError(f"Unknown signal: {name}")
+            self._derive()
+        return self.store[name]
+
+    def save(self, path: str):
+        """Save every signal with TraceStore.save(); see load()."""
+        self._derive()
+        self.store.attrs["text_base"] = self.text_base
+        self.store.save(path)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "r") -> "MipsTrace":
+        """Open a saved trace, memory-mapped by default."""
+        store = TraceStore.load(path, mmap_mode=mmap_mode)
+        return cls(None, store.attrs.get("text_base", 0), store)
+
+    def cycle(self, index: int) -> Dict[str, int]:
+        """Every signal's value in one cycle."""
+        return {name: int(self[name][index]) for name in TRACE_SIGNALS}
+
+    def _derive(self):
+        """Compute the combinational signals from the recorded ones."""
+        if all(name in self.store for name in TRACE_SIGNALS):
+            return
+        pc = self.store["PC"].astype(np.uint64)
+        read1 = self.store["ReadData1"].astype(np.uint64)
+        read2 = self.store["ReadData2"].astype(np.uint64)
+        inst = self.program[(pc - np.uint64(self.text_base)) >> np.uint64(2)]
+        decoded = decode_instructions(inst)
+        columns: Dict[str, np.ndarray] = {
+            name: values for name, values in decoded.items() if name in SIGNAL_WIDTHS
+        }
+        imm = decoded["Imm"].astype(np.uint64)
+        columns["ALUIn1"] = np.where(columns["ALUSrc"], imm, read2)
+        result = alu_compute(read1, columns["ALUIn1"], columns["ALUControl"])
+        columns["ALUResult"] = result
+        columns["Zero"] = result == 0
+        columns["WriteData"] = np.where(
+            columns["MemtoReg"], self.store["MemReadData"], result
+        )
+        plus4 = (pc + np.uint64(4)) & np.uint64(_MASK)
+        target = (plus4 + (imm << np.uint64(2))) & np.uint64(_MASK)
+        columns["PCPlus4"] = plus4
+        columns["BranchTarget"] = target
+        taken = (columns["Branch"] == 1) & columns["Zero"]
+        columns["NextPC"] = np.where(taken, target, plus4)
+        for name, values in columns.items():
+            self.store.add_column(name, SIGNAL_WIDTHS[name], values)
+
+    def apply(
+        self, cycle: int, datapath: MipsDatapath, netlist: Optional[Netlist] = None
+    ) -> Dict[str, int]:
+        """
+        Store one cycle's values in pin.value of the pins driving each signal.
+
+        With a netlist, every pin on those nets gets the value it reads too. Returns
+        the cycle's values by signal name.
+        """
+        values = self.cycle(cycle)
+        for name, pin in datapath.signal_pins().items():
+            value = values[name]
+            pin.set_value(value & pin.mask)
+            if netlist is not None and pin in netlist:
+                for load in netlist.net_of(pin).loads:
+                    load.value = load.read(np.atleast_1d(value))
+        return values
+
+    def control_animations(
+        self,
+        cycle: int,
+        datapath: MipsDatapath,
+        netlist: Netlist,
+        high_color=YELLOW,
+        low_color=GREY,
+    ) -> List[Animation]:
+        """Color the wires of every control signal by its value in one cycle."""
+        values = self.apply(cycle, datapath, netlist)
+        return datapath.control_animations(values, netlist, high_color, low_color)
+
+    def value_labels(
+        self,
+        cycle: int,
+        datapath: MipsDatapath,
+        signals: Sequence[str] = ("PC", "Inst", "ALUResult", "WriteData"),
+        **kwargs,
+    ) -> VGroup:
+        """Hex values of the chosen signals in one cycle, next to their pins."""
+        font_size = kwargs.pop("font_size", 14)
+        color = kwargs.pop("color", YELLOW)
+        pins = datapath.signal_pins()
+        labels = VGroup()
+        for name in signals:
+            text = f"{int(self[name][cycle]):#x}"
+            label = cached_text(text, font_size=font_size, color=color)
+            labels.add(label.next_to(pins[name].dot, UP, buff=0.05))
+        return labels
+
+
+_R, _BEQ, _ADDI, _LW, _SW = (int(op) for op in Opcode)
+_OPCODES = frozenset(int(op) for op in Opcode)
+
+_ALU_FUNCTIONS = {
+    AluOp.ADD: lambda a, b: (a + b) & _MASK,
+    AluOp.SUB: lambda a, b: (a - b) & _MASK,
+    AluOp.AND: lambda a, b: a & b,
+    AluOp.OR: lambda a, b: a | b,
+    AluOp.NOR: lambda a, b: ~(a | b) & _MASK,
+    AluOp.SLT: lambda a, b: int((a ^ _SIGN) < (b ^ _SIGN)),
+}
+
+
+class DecodedInstruction(NamedTuple):
+    """The fields of an instruction word that the run loop uses."""
+
+    opcode: int
+    rs: int
+    rt: int
+    dest: int  # register written: rd for R-type, otherwise rt
+    arg: int  # AluOp for R-type, otherwise the sign-extended immediate
+
+
+def decode_instruction(word: int) -> Optional[DecodedInstruction]:
+    """Decode one instruction word; None if it isn't supported."""
+    opcode, funct = word >> 26, word & 0x3F
+    rs, rt, rd = (word >> 21) & 0x1F, (word >> 16) & 0x1F, (word >> 11) & 0x1F
+    if opcode == _R:
+        if word == 0:
+            # nop (sll $0, $0, 0): writes nothing.
+            return DecodedInstruction(_R, 0, 0, 0, AluOp.AND)
+        if funct not in FUNCT_ALU_OPS:
+            return None
+        return DecodedInstruction(_R, rs, rt, rd, FUNCT_ALU_OPS[funct])
+    if opcode not in _OPCODES:
+        return None
+    imm = ((word & 0xFFFF) ^ 0x8000) - 0x8000
+    return DecodedInstruction(opcode, rs, rt, rt, imm)
+
+
+class MipsProgram:
+    """
+    Instruction memory contents, decoded on first fetch.
+
+    The words are not copied: a MemoryStorage, e.g. from load_image(), is used
+    as it is, so a mapped image is only read where the program runs. Each
+    decoded instruction is cached by address.
+
+    Parameters:
+        image: Instruction words, or a MemoryStorage holding them
+        text_base (int): Address of the first word, for a sequence of words
+            (default: 0; a MemoryStorage has its own base)
+
+    Attributes:
+        memory (MemoryStorage): The instruction memory, e.g. for
+            InstructionMemory(storage=program.memory)
+        words (np.ndarray): The instruction words
+        text_base (int): Address of the first word
+        entry (int): Address to start running at
+
+    Examples:
+        >>> program = MipsProgram.load("sum.elf")
+        >>> program.fetch(program.entry)  # DecodedInstruction(opcode=35, ...)
+        >>> MipsSimulator(program).run()
+    """
+
+    def __init__(
+        self, image: Union[MemoryStorage, Sequence[int]], text_base: int = 0
+    ):
+        if not isinstance(image, MemoryStorage):
+            words = np.asarray(image, dtype=np.uint32)
+            image = MemoryStorage(buffer=bytearray(words.tobytes()), base=text_base)
+        self.memory = image
+        self.words = image.words
+        self.text_base = image.base
+        self.entry = image.entry
+        self.decoded: List[Optional[DecodedInstruction]] = [None] * len(self.words)
+
+    @classmethod
+    def load(
+        cls, path: str, text_base: int = 0, byteorder: str = "little"
+    ) -> "MipsProgram":
+        """Open a program image with load_image()."""
+        return cls(load_image(path, base=text_base, byteorder=byteorder))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def fetch(self, pc: int) -> DecodedInstruction:
+        """
+        The decoded instruction at pc.
+
+        Raises:
+            ValueError: If pc is outside the program or the word isn't supported
+        """
+        index = (pc - self.text_base) >> 2
+        if pc & 3 or not 0 <= index < len(self.decoded):
+            raise ValueError(f"No instruction at {pc:#x}")
+        entry = self.decoded[index]
+        if entry is None:
+            word = int(self.words[index])
+            entry = self.decoded[index] = decode_instruction(word)
+            if entry is None:
+                raise ValueError(f"Unsupported instruction {word:#010x} at {pc:#x}")
+        return entry
+
+
+class MipsSimulator:
+    """
+    Runs MIPS programs on the single-cycle datapath of Figure 4.17.
+
+    The run stops when the PC leaves the program. Instruction and data memory are
+    separate, as in the figure, and both are byte addressed.
+
+    Parameters:
+        program: A MipsProgram, a MemoryStorage such as a mapped image, or
+            instruction words loaded at text_base
+        data: Initial data memory words, loaded at data_base
+        memory_words (int): Size of the data memory in words (default: 65536)
+        text_base (int): Address of the first instruction word (default: 0)
+        data_base (int): Address of the first data word (default: 0)
+        register_file (RegisterStorage): Registers to run on, e.g. a
+            RegisterFile block's storage (default: new zeroed registers)
+        data_memory (MemoryStorage): Data memory to run on, e.g. a DataMemory
+            block's storage or a mapped image; memory_words and data_base are
+            then taken from it (default: new zeroed memory)
+
+    Attributes:
+        instructions (MipsProgram): The program and its decoded instructions
+        program (np.ndarray): The instruction words
+        register_file (RegisterStorage): The registers
+        data_memory (MemoryStorage): The data memory
+        registers (np.ndarray): The 32 register values; register 0 stays 0
+        memory (np.ndarray): Data memory words
+        pc (int): Address of the next instruction, first the program's entry
+        cycles (int): Cycles run so far
+
+    Examples:
+        >>> program = [
+        ...     encode_instruction("addi", 8, 0, 5),  # addi $t0, $zero, 5
+        ...     encode_instruction("add", 9, 8, 8),  # add $t1, $t0, $t0
+        ... ]
+        >>> sim = MipsSimulator(program)
+        >>> trace = sim.run()
+        >>> sim.registers[9], trace["ALUResult"]
+    """
+
+    def __init__(
+        self,
+        program: Union[MipsProgram, MemoryStorage, Sequence[int]],
+        data: Optional[Sequence[int]] = None,
+        memory_words: int = 1 << 16,
+        text_base: int = 0,
+        data_base: int = 0,
+        register_file: Optional[RegisterStorage] = None,
+        data_memory: Optional[MemoryStorage] = None,
+    ):
+        if not isinstance(program, MipsProgram):
+            program = MipsProgram(program, text_base=text_base)
+        self.instructions = program
+        self.program = program.words
+        self.text_base = program.text_base
+        self.register_file = register_file or RegisterStorage()
+        if data_memory is None:
+            data_memory = MemoryStorage(memory_words * 4, base=data_base)
+        self.data_memory = data_memory
+        self.data_base = data_memory.base
+        self.registers = self.register_file.values
+        self.memory = data_memory.words
+        if data is not None:
+            data_memory.load(np.asarray(data, dtype=np.uint32))
+        self.pc = program.entry
+        self.cycles = 0
+
+    @property
+    def halted(self) -> bool:
+        """True once the PC has left the program."""
+        index = (self.pc - self.text_base) >> 2
+        return self.pc % 4 != 0 or not 0 <= index < len(self.program)
+
+    def run(self, max_cycles: int = 1_000_000) -> MipsTrace:
+        """
+        Execute until the PC leaves the program or max_cycles cycles have run.
+
+        Raises:
+            ValueError: On an unsupported instruction, a load or store outside
+                data memory or a store to read-only data memory; the state is
+                kept up to that instruction
+        """
+        regs = self.registers.tolist()
+        # Native-order memory is used in place, so a mapped image isn't copied.
+        writeable = self.memory.flags.writeable
+        in_place = self.memory.dtype.isnative and writeable
+        memory = memoryview(self.memory) if in_place else self.memory.tolist()
+        decoded, count = self.instructions.decoded, len(self.program)
+        fetch = self.instructions.fetch
+        text_base, data_base, words = self.text_base, self.data_base, len(memory)
+        store = TraceStore(
+            {name: SIGNAL_WIDTHS[name] for name in RECORDED_SIGNALS},
+            capacity=min(max_cycles, _CHUNK_CYCLES),
+        )
+        # The loop appends to small buffers, flushed into the store in chunks.
+        buffers = [array("I") for _ in RECORDED_SIGNALS]
+        add_pc, add_read1, add_read2, add_load = (b.append for b in buffers)
+
+        def flush():
+            if buffers[0]:
+                store.extend(
+                    {
+                        name: np.frombuffer(buffer, dtype=np.uint32)
+                        for name, buffer in zip(RECORDED_SIGNALS, buffers)
+                    }
+                )
+                for buffer in buffers:
+                    del buffer[:]
+
+        pc = self.pc
+        remaining = max_cycles
+        try:
+            while remaining > 0:
+                chunk = min(remaining, _CHUNK_CYCLES)
+                for _ in range(chunk):
+                    index = (pc - text_base) >> 2
+                    if pc & 3 or not 0 <= index < count:
+                        break
+                    entry = decoded[index]
+                    if entry is None:
+                        entry = fetch(pc)
+                    kind, rs, rt, dest, arg = entry
+                    a, b = regs[rs], regs[rt]
+                    loaded = 0
+                    next_pc = pc + 4
+                    if kind == _R:
+                        if dest:
+                            regs[dest] = _ALU_FUNCTIONS[arg](a, b)
+                    elif kind == _ADDI:
+                        if dest:
+                            regs[dest] = (a + arg) & _MASK
+                    elif kind == _BEQ:
+                        if a == b:
+                            next_pc = (next_pc + (arg << 2)) & _MASK
+                    else:
+                        address = (a + arg) & _MASK
+                        word = (address - data_base) >> 2
+                        if address & 3 or not 0 <= word < words:
+                            raise ValueError(
+                                f"Bad data address {address:#x} at {pc:#x}"
+                            )
+                        if kind == _LW:
+                            loaded = memory[word]
+                            if dest:
+                                regs[dest] = loaded
+                        elif writeable:
+                            memory[word] = b
+                        else:
+                            raise ValueError(
+                                f"Store to read-only data memory at {pc:#x}"
+                            )
+                    add_pc(pc)
+                    add_read1(a)
+                    add_read2(b)
+                    add_load(loaded)
+                    pc = next_pc
+                ran = len(buffers[0])
+                flush()
+                remaining -= ran
+                if ran < chunk:
+                    break
+        finally:
+            flush()
+            self.pc = pc
+            self.registers[:] = regs
+            if writeable and not in_place:
+                self.memory[:] = memory
+            self.cycles += len(store)
+        return MipsTrace(self.program, self.text_base, store)
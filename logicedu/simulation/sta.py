@@ -0,0 +1,228 @@
+"""
+Static timing analysis.
+
+analyze_timing() turns a netlist into a graph of timing arcs between nets, one
+arc from each input to each output of every combinational component, and walks it
+once forward for arrival times and once backward for required times. Registers
+(DFF, PC) and the write ports of RegisterFile and DataMemory cut the graph: their
+inputs are endpoints captured at the clock edge and their outputs start new paths.
+That makes single-cycle and pipelined datapaths comparable: inserting DFFs splits
+one long path into shorter ones and the minimum clock period drops.
+
+The report is a Timing, so it can drive SignalPropagation directly.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from manim import RED, Mobject
+
+from ..components.blocks import DFF, PC, DataMemory, RegisterFile
+from ..core.basics import Pin, PinType, VGroupLogicObjectBase
+from ..core.netlist import Netlist
+from .engine import NetKey
+from .timing import DelayModel, Timing
+
+# Components whose inputs are all captured at the clock edge.
+SEQUENTIAL_TYPES: Tuple[type, ...] = (DFF, PC)
+
+# Inputs that are written at the clock edge instead of being read through.
+REGISTERED_INPUTS: Dict[type, Tuple[str, ...]] = {
+    RegisterFile: ("WriteReg", "WriteData", "RegWrite"),
+    DataMemory: ("WriteData", "MemWrite"),
+}
+
+
+@dataclass
+class TimingArc:
+    """A path through one component, from an input pin to an output pin."""
+
+    component: VGroupLogicObjectBase
+    input_pin: Pin
+    output_pin: Pin
+    delay: float
+
+
+def _registered(component: VGroupLogicObjectBase) -> Tuple[str, ...]:
+    for cls in type(component).__mro__:
+        if cls in REGISTERED_INPUTS:
+            return REGISTERED_INPUTS[cls]
+    return ()
+
+
+class TimingReport(Timing):
+    """
+    Results of analyze_timing().
+
+    Attributes:
+        net_arrival (np.ndarray): Time each net settles, by Net.index
+        required (np.ndarray): Latest time each net may settle, by Net.index
+        slack (np.ndarray): required - net_arrival, by Net.index
+        clock_period (float): Period the required times are computed for
+        critical_delay (float): Minimum clock period, including setup time
+        critical_path (List[TimingArc]): The slowest path, in signal order
+        endpoint (Optional[Pin]): Register input the critical path ends at, or None
+            if it ends at an unconnected output
+    """
+
+    def __init__(
+        self,
+        netlist: Netlist,
+        model: DelayModel,
+        net_arrival: np.ndarray,
+        required: np.ndarray,
+        clock_period: float,
+        critical_delay: float,
+        critical_path: List[TimingArc],
+        endpoint: Optional[Pin],
+    ):
+        super().__init__(netlist, model, net_arrival)
+        self.required = required
+        self.slack = required - net_arrival
+        self.clock_period = clock_period
+        self.critical_delay = critical_delay
+        self.critical_path = critical_path
+        self.endpoint = endpoint
+
+    @property
+    def worst_slack(self) -> float:
+        return float(self.slack.min()) if len(self.slack) else 0.0
+
+    def net_slack(self, key: NetKey) -> float:
+        return float(self.slack[self._index(key)])
+
+    def path_mobjects(self) -> List[Mobject]:
+        """Components and wires on the critical path, e.g. for FocusController."""
+        found: Dict[int, Mobject] = {}
+        pins = [arc.input_pin for arc in self.critical_path]
+        if self.endpoint is not None:
+            pins.append(self.endpoint)
+        for pin in pins:
+            net = self.netlist.net_of(pin)
+            driver = net.driver
+            if driver is not None and driver.owner is not None:
+                found.setdefault(id(driver.owner), driver.owner)
+            for wire in net.wires:
+                if pin is wire.end_pin or pin is wire.start_pin:
+                    found.setdefault(id(wire), wire)
+            if pin.owner is not None:
+                found.setdefault(id(pin.owner), pin.owner)
+        return list(found.values())
+
+    def highlight(self, color=RED) -> List[Mobject]:
+        """Color the critical path's wires and components; returns them."""
+        mobjects = self.path_mobjects()
+        for mob in mobjects:
+            mob.set_color(color)
+        return mobjects
+
+
+def analyze_timing(
+    netlist: Netlist,
+    model: Optional[DelayModel] = None,
+    clock_period: Optional[float] = None,
+) -> TimingReport:
+    """
+    Compute arrival times, required times, slack and the critical path.
+
+    Parameters:
+        netlist (Netlist): Circuit to analyse
+        model (DelayModel): Gate, component and wire delays (default: DelayModel())
+        clock_period (float): Period to compute slack against (default: the
+            critical delay, so the worst slack is 0)
+
+    Raises:
+        ValueError: If the netlist has a combinational loop
+    """
+    model = model if model is not None else DelayModel()
+    nets = netlist.nets()
+    wires = Timing(netlist, model, np.zeros(len(nets)))
+    arrival = np.zeros(len(nets))
+    arcs: List[TimingArc] = []
+    captures: List[Pin] = []
+
+    for component in netlist.components:
+        pins = netlist.pins_of(component)
+        inputs = [pin for pin in pins if pin.pin_type == PinType.INPUT]
+        outputs = [pin for pin in pins if pin.pin_type == PinType.OUTPUT]
+        delay = model.component_delay(component)
+        if isinstance(component, SEQUENTIAL_TYPES):
+            captures.extend(inputs)
+            for pin in outputs:
+                arrival[netlist.net_of(pin).index] = delay
+            continue
+        registered = _registered(component)
+        for pin in inputs:
+            if pin.label_str in registered:
+                captures.append(pin)
+                continue
+            to_pin = wires.pin_wire_delay(pin) + delay
+            for out in outputs:
+                arcs.append(TimingArc(component, pin, out, to_pin))
+
+    # Order the arcs so every arc comes after all arcs into its source net.
+    sources = [netlist.net_of(arc.input_pin).index for arc in arcs]
+    targets = [netlist.net_of(arc.output_pin).index for arc in arcs]
+    arcs_from: Dict[int, List[int]] = {}
+    pending = np.zeros(len(nets), dtype=int)
+    for i, (source, target) in enumerate(zip(sources, targets)):
+        arcs_from.setdefault(source, []).append(i)
+        pending[target] += 1
+    ready = [net for net in range(len(nets)) if pending[net] == 0]
+    order: List[int] = []
+    while ready:
+        net = ready.pop()
+        for i in arcs_from.get(net, ()):
+            order.append(i)
+            pending[targets[i]] -= 1
+            if pending[targets[i]] == 0:
+                ready.append(targets[i])
+    if len(order) != len(arcs):
+        raise ValueError("Netlist contains a combinational loop")
+
+    # Forward: latest arrival at every net, remembering the arc that set it.
+    via = np.full(len(nets), -1)
+    for i in order:
+        time = arrival[sources[i]] + arcs[i].delay
+        if time > arrival[targets[i]]:
+            arrival[targets[i]] = time
+            via[targets[i]] = i
+
+    # Endpoints: register inputs, plus nets that feed nothing.
+    endpoints: List[Tuple[float, int, Optional[Pin]]] = []
+    captured = set()
+    for pin in captures:
+        net = netlist.net_of(pin).index
+        captured.add(net)
+        margin = wires.pin_wire_delay(pin) + model.setup_time
+        endpoints.append((margin, net, pin))
+    for net in range(len(nets)):
+        if net not in arcs_from and net not in captured:
+            endpoints.append((0.0, net, None))
+
+    critical_delay, end_net, endpoint = 0.0, None, None
+    for margin, net, pin in endpoints:
+        if end_net is None or arrival[net] + margin > critical_delay:
+            critical_delay, end_net, endpoint = arrival[net] + margin, net, pin
+    critical_delay = float(critical_delay)
+    period = critical_delay if clock_period is None else clock_period
+
+    # Backward: earliest required time at every net.
+    required = np.full(len(nets), np.inf)
+    for margin, net, _ in endpoints:
+        required[net] = min(required[net], period - margin)
+    for i in reversed(order):
+        latest = required[targets[i]] - arcs[i].delay
+        required[sources[i]] = min(required[sources[i]], latest)
+
+    path: List[TimingArc] = []
+    net = end_net
+    while net is not None and via[net] >= 0:
+        path.append(arcs[via[net]])
+        net = sources[via[net]]
+    path.reverse()
+
+    return TimingReport(
+        netlist, model, arrival, required, period, critical_delay, path, endpoint
+    )
@@ -0,0 +1,203 @@
+"""
+Signal timing for LogicEdu circuits.
+
+A DelayModel gives every simulated gate a delay by function, every other block
+a delay by component type, and every wire a delay proportional to its drawn
+length. arrival_times() walks the levelized gates once and returns when each
+net's driver switches and when the signal reaches each input pin, which is what
+the propagation animation uses to decide when a pulse enters and leaves every
+wire. sta.analyze_timing() does the same across all components, with slack.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+from manim import Line
+
+from ..components.blocks import (
+    ALUZ,
+    DFF,
+    PC,
+    Adder,
+    AluControl,
+    BranchLogic,
+    ControlUnit,
+    DataMemory,
+    InstructionMemory,
+    Mux,
+    RegisterFile,
+    ShiftLeft,
+    SignExtend,
+)
+from ..components.logic_gates import BinaryLogic, UnaryLogic
+from ..core.basics import Pin, PinType, VGroupLogicBase, VGroupLogicObjectBase
+from ..core.netlist import Net, Netlist
+from .engine import NetKey, Op, levelize
+
+DEFAULT_GATE_DELAYS: Dict[Op, float] = {
+    Op.BUF: 1.0,
+    Op.INV: 0.5,
+    Op.NAND: 1.0,
+    Op.NOR: 1.0,
+    Op.AND: 1.5,
+    Op.OR: 1.5,
+    Op.XOR: 2.0,
+    Op.XNOR: 2.0,
+    Op.MUX: 2.0,
+}
+
+# Roughly in proportion to the single-cycle example in Patterson & Hennessy,
+# with a 2-input gate taking about 1 unit.
+DEFAULT_COMPONENT_DELAYS: Dict[type, float] = {
+    Mux: 2.0,
+    Adder: 10.0,
+    ALUZ: 20.0,
+    RegisterFile: 10.0,
+    InstructionMemory: 20.0,
+    DataMemory: 20.0,
+    ControlUnit: 5.0,
+    AluControl: 3.0,
+    BranchLogic: 2.0,
+    SignExtend: 0.5,
+    ShiftLeft: 0.0,
+    # For registers, the clock-to-output delay.
+    PC: 3.0,
+    DFF: 3.0,
+}
+
+
+@dataclass
+class DelayModel:
+    """
+    Delays in arbitrary time units.
+
+    Attributes:
+        gate_delays (Dict[Op, float]): Delay of each gate function
+        component_delays (Dict[type, float]): Delay of other components by class;
+            subclasses use their closest listed base class. For registers this is
+            the clock-to-output delay.
+        wire_delay (float): Delay per scene unit of wire length (default: 0.5)
+        setup_time (float): Time a register input must be stable before the clock
+            edge (default: 1)
+        default_delay (float): Delay of unlisted components (default: 1)
+    """
+
+    gate_delays: Dict[Op, float] = field(
+        default_factory=lambda: dict(DEFAULT_GATE_DELAYS)
+    )
+    component_delays: Dict[type, float] = field(
+        default_factory=lambda: dict(DEFAULT_COMPONENT_DELAYS)
+    )
+    wire_delay: float = 0.5
+    setup_time: float = 1.0
+    default_delay: float = 1.0
+
+    def gate_delay(self, op: Op) -> float:
+        return self.gate_delays.get(op, self.default_delay)
+
+    def component_delay(self, component: VGroupLogicObjectBase) -> float:
+        """Delay from the inputs to the outputs of a component."""
+        if isinstance(component, (BinaryLogic, UnaryLogic)):
+            return self.gate_delay(Op[component.logic_function.name])
+        for cls in type(component).__mro__:
+            if cls in self.component_delays:
+                return self.component_delays[cls]
+        return self.default_delay
+
+
+def wire_segments(wire: VGroupLogicBase) -> List[Line]:
+    """The Lines of a ConnectorLine or ArbitrarySegmentLine, in order from start_pin."""
+    return [mob for mob in wire.get_family() if isinstance(mob, Line)]
+
+
+def wire_length(wire: VGroupLogicBase) -> float:
+    return float(sum(segment.get_length() for segment in wire_segments(wire)))
+
+
+def wire_drives_forward(wire: VGroupLogicBase) -> bool:
+    """True if the wire was drawn from the driving side (start_pin is not an input)."""
+    return wire.start_pin is None or wire.start_pin.pin_type != PinType.INPUT
+
+
+class Timing:
+    """
+    Arrival times computed by arrival_times().
+
+    Attributes:
+        netlist (Netlist): The analysed netlist
+        model (DelayModel): Delays used
+        net_arrival (np.ndarray): Time each net's driver switches, by Net.index
+    """
+
+    def __init__(self, netlist: Netlist, model: DelayModel, net_arrival: np.ndarray):
+        self.netlist = netlist
+        self.model = model
+        self.net_arrival = net_arrival
+
+    def _index(self, key: NetKey) -> int:
+        return key.index if isinstance(key, Net) else self.netlist.net_of(key).index
+
+    def arrival(self, key: NetKey) -> float:
+        """Time the driver of a pin's net (or of a Net) switches."""
+        return float(self.net_arrival[self._index(key)])
+
+    def wire_delay(self, wire: VGroupLogicBase) -> float:
+        return wire_length(wire) * self.model.wire_delay
+
+    def wire_start(self, wire: VGroupLogicBase) -> float:
+        """Time the signal enters a wire: the arrival time of its net."""
+        return self.arrival(wire.start_pin)
+
+    def pin_wire_delay(self, pin: Pin) -> float:
+        """Delay of the slowest wire ending at an input pin (0 for outputs)."""
+        if pin.pin_type != PinType.INPUT:
+            return 0.0
+        return max(
+            (
+                self.wire_delay(wire)
+                for wire in self.netlist.net_of(pin).wires
+                if pin is wire.end_pin or pin is wire.start_pin
+            ),
+            default=0.0,
+        )
+
+    def pin_arrival(self, pin: Pin) -> float:
+        """Time the signal reaches a pin, after the wires that end at it."""
+        return self.arrival(pin) + self.pin_wire_delay(pin)
+
+    @property
+    def total(self) -> float:
+        """Time the last wire finishes switching."""
+        ends = [float(self.net_arrival.max())] if len(self.net_arrival) else [0.0]
+        for wire in self.netlist.wires():
+            ends.append(self.wire_start(wire) + self.wire_delay(wire))
+        return max(ends)
+
+
+def arrival_times(
+    netlist: Netlist,
+    model: Optional[DelayModel] = None,
+    input_times: Optional[Mapping[NetKey, float]] = None,
+) -> Timing:
+    """
+    Propagate arrival times through the netlist's gates in topological order.
+
+    Circuit inputs (undriven nets and outputs of components without a logic model)
+    switch at time 0 unless given in input_times. A gate's output switches its
+    delay after the last of its input pins is reached.
+    """
+    model = model if model is not None else DelayModel()
+    gates = levelize(netlist)
+    nets = netlist.nets()
+    timing = Timing(netlist, model, np.zeros(len(nets)))
+    for key, time in (input_times or {}).items():
+        timing.net_arrival[timing._index(key)] = time
+
+    for gate in gates:
+        ready = max(
+            (timing.pin_arrival(pin) for pin in gate.component._get_input_pins()),
+            default=0.0,
+        )
+        timing.net_arrival[gate.output] = ready + model.gate_delay(gate.op)
+    return timing
@@ -0,0 +1,269 @@
+"""
+Columnar storage for per-cycle signal values.
+
+A TraceStore keeps one preallocated NumPy array per signal, in the smallest
+unsigned type that holds the signal's width, so a 1-bit control line costs one
+byte per cycle. Columns only grow at the end: append() records one cycle and
+extend() many, and the arrays double in size when full. store[100:200] returns
+a store that shares the arrays. save() writes one .npy file per column, and
+load() maps them back with np.load(mmap_mode="r"). A long trace can then be
+reopened and read at any cycle without simulating it again or loading it into
+memory.
+"""
+
+import json
+import os
+from typing import Dict, Hashable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from ..core.basics import Pin, word_dtype
+from ..core.netlist import Net
+
+# A column is keyed by the Pin or Net it records, or by a name.
+TraceKey = Union[Pin, Net, str]
+
+_META_FILE = "trace.json"
+
+
+def _default_name(key: Hashable) -> str:
+    if isinstance(key, str):
+        return key
+    if isinstance(key, Pin):
+        owner = type(key.owner).__name__ if key.owner is not None else "Pin"
+        return f"{owner}.{key.label_str}"
+    if isinstance(key, Net):
+        return f"net{key.index}"
+    return str(key)
+
+
+class TraceStore:
+    """
+    Per-cycle values of a set of signals, one preallocated column each.
+
+    Parameters:
+        columns: Bit width of each column, keyed by Pin, Net or name
+        capacity (int): Cycles to preallocate (default: 1024)
+        names: Names to save columns under (default: "Owner.label" for pins,
+            "net<index>" for nets; duplicates get a numeric suffix)
+        attrs (dict): JSON-serializable metadata saved with the trace
+
+    Attributes:
+        names (List[str]): Column names, in column order
+        widths (List[int]): Column bit widths, in column order
+        attrs (dict): Metadata saved with the trace
+
+    Examples:
+        >>> store = TraceStore({q_pin: 1, "count": 8})
+        >>> store.append({q_pin: 1, "count": 3})
+        >>> store.extend({"count": np.arange(4, 100)})  # q_pin holds its value
+        >>> store["count"][10:20], store.row(50)
+        >>> store.save("counter.trace")
+        >>> TraceStore.load("counter.trace")[1000:2000]  # memory-mapped
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Mapping[TraceKey, int]] = None,
+        capacity: int = 1024,
+        names: Optional[Mapping[TraceKey, str]] = None,
+        attrs: Optional[dict] = None,
+    ):
+        self.attrs = dict(attrs or {})
+        self.names: List[str] = []
+        self.widths: List[int] = []
+        self._keys: List[TraceKey] = []
+        self._index: Dict[Hashable, int] = {}
+        self._data: List[np.ndarray] = []
+        self._length = 0
+        self._capacity = max(1, capacity)
+        self._read_only = False
+        names = dict(names or {})
+        for key, bit_width in (columns or {}).items():
+            self.add_column(key, bit_width, name=names.get(key))
+
+    # Columns
+
+    def add_column(
+        self,
+        key: TraceKey,
+        bit_width: int,
+        values: Optional[np.ndarray] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Add a column. Its past cycles are values if given (one per recorded
+        cycle), otherwise 0.
+        """
+        if key in self._index:
+            raise ValueError(f"Trace already has a column for {key}")
+        name = name or _default_name(key)
+        suffix = 1
+        unique = name
+        while unique in self._index:
+            unique = f"{name}_{suffix}"
+            suffix += 1
+        column = np.zeros(self._capacity, dtype=word_dtype(bit_width))
+        if values is not None:
+            values = self._checked(values, bit_width, self._length)
+            column[: self._length] = values
+        self._index[key] = len(self._data)
+        self._index.setdefault(unique, len(self._data))
+        self._keys.append(key)
+        self.names.append(unique)
+        self.widths.append(bit_width)
+        self._data.append(column)
+
+    def _column(self, key: Hashable) -> int:
+        try:
+            return self._index[key]
+        except (KeyError, TypeError):
+            raise KeyError(f"No column for {key}") from None
+
+    def __contains__(self, key: Hashable) -> bool:
+        try:
+            return key in self._index
+        except TypeError:
+            return False
+
+    def keys(self) -> List[TraceKey]:
+        return list(self._keys)
+
+    # Recording
+
+    def __len__(self) -> int:
+        return self._length
+
+    @staticmethod
+    def _checked(values, bit_width: int, length: int) -> np.ndarray:
+        values = np.broadcast_to(np.asarray(values), (length,))
+        if length and values.dtype.kind in "iu":
+            if values.min() < 0 or int(values.max()) > (1 << bit_width) - 1:
+                raise ValueError(f"Value out of range for a {bit_width}-bit column")
+        return values
+
+    def _reserve(self, length: int):
+        if self._read_only:
+            raise ValueError("Cannot record into a read-only trace")
+        if length <= self._capacity:
+            return
+        capacity = max(length, 2 * self._capacity)
+        for i, column in enumerate(self._data):
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self._length] = column[: self._length]
+            self._data[i] = grown
+        self._capacity = capacity
+
+    def append(self, values: Mapping[TraceKey, int]):
+        """Record one cycle. Columns not in values hold their last value."""
+        self.extend({key: [value] for key, value in values.items()}, length=1)
+
+    def extend(
+        self, values: Mapping[TraceKey, object], length: Optional[int] = None
+    ):
+        """
+        Record many cycles: values maps keys to one value per cycle (or a scalar
+        for every cycle). Columns not in values hold their last value.
+        """
+        arrays = {
+            self._column(key): np.asarray(value) for key, value in values.items()
+        }
+        if length is None:
+            lengths = {a.size for a in arrays.values() if a.ndim}
+            if len(lengths) > 1:
+                raise ValueError(f"Columns differ in length: {sorted(lengths)}")
+            length = lengths.pop() if lengths else 1
+        start, end = self._length, self._length + length
+        self._reserve(end)
+        for i, column in enumerate(self._data):
+            if i in arrays:
+                column[start:end] = self._checked(arrays[i], self.widths[i], length)
+            else:
+                column[start:end] = column[start - 1] if start else 0
+        self._length = end
+
+    # Reading
+
+    def __getitem__(self, key) -> Union[np.ndarray, "TraceStore"]:
+        """A column by key or name, or a range of cycles as a TraceStore."""
+        if isinstance(key, slice):
+            return self._view(key)
+        return self._data[self._column(key)][: self._length]
+
+    def _view(self, cycles: slice) -> "TraceStore":
+        start, stop, step = cycles.indices(self._length)
+        view = TraceStore.__new__(TraceStore)
+        view.attrs = dict(self.attrs)
+        view.names = list(self.names)
+        view.widths = list(self.widths)
+        view._keys = list(self._keys)
+        view._index = dict(self._index)
+        view._data = [column[start:stop:step] for column in self._data]
+        view._length = len(range(start, stop, step))
+        view._capacity = view._length
+        view._read_only = True
+        return view
+
+    def row(self, cycle: int) -> Dict[str, int]:
+        """Every column's value in one cycle, by name."""
+        if not -self._length <= cycle < self._length:
+            raise IndexError(f"Cycle {cycle} out of range for {self._length} cycles")
+        return {
+            name: int(column[cycle % self._length])
+            for name, column in zip(self.names, self._data)
+        }
+
+    def apply(self, cycle: int) -> "TraceStore":
+        """Store one cycle's values in pin.value of every Pin column."""
+        for key, column in zip(self._keys, self._data):
+            if isinstance(key, Pin):
+                key.set_value(column[cycle % self._length] & key.mask)
+        return self
+
+    # Persistence
+
+    def save(self, path: str):
+        """Write the trace to a directory: one .npy per column plus trace.json."""
+        os.makedirs(path, exist_ok=True)
+        files = []
+        for i, column in enumerate(self._data):
+            files.append(f"column{i}.npy")
+            np.save(os.path.join(path, files[-1]), column[: self._length])
+        meta = {
+            "length": self._length,
+            "names": self.names,
+            "widths": self.widths,
+            "files": files,
+            "attrs": self.attrs,
+        }
+        with open(os.path.join(path, _META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "r") -> "TraceStore":
+        """
+        Open a saved trace. Columns are keyed by name.
+
+        With the default mmap_mode="r", columns are memory-mapped and the store
+        is read-only. Pass mmap_mode=None to load them into memory and keep
+        recording.
+        """
+        with open(os.path.join(path, _META_FILE)) as f:
+            meta = json.load(f)
+        store = cls(attrs=meta["attrs"])
+        for name, width, file in zip(meta["names"], meta["widths"], meta["files"]):
+            column = np.load(os.path.join(path, file), mmap_mode=mmap_mode)
+            store._index[name] = len(store._data)
+            store._keys.append(name)
+            store.names.append(name)
+            store.widths.append(width)
+            store._data.append(column)
+        store._length = meta["length"]
+        store._capacity = store._length
+        store._read_only = mmap_mode is not None
+        if not store._read_only:
+            store._data = [np.array(column) for column in store._data]
+        return store
+
+    def __repr__(self):
+        return f"TraceStore({len(self.names)} columns, {self._length} cycles)"
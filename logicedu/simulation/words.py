@@ -0,0 +1,397 @@
+"""
+Word-level simulation of datapath blocks.
+
+LogicSimulator works on single-bit nets. WordSimulator evaluates blocks such as
+ALUZ, Adder, Mux, SignExtend and ShiftLeft on whole bus values instead: every
+net holds one unsigned integer per cycle, as wide as the pin driving it, and
+every block is a single NumPy expression over all cycles at once. An input pin
+with a bit_range (e.g. ControlUnit's "inst[31:26]") reads just those bits of
+its net.
+
+Models are looked up by component class in WORD_MODELS; register_word_model()
+adds models for other blocks. A RegisterFile, DataMemory or InstructionMemory
+given storage reads it combinationally; writes happen at clock edges, through
+the block's write_ports().
+"""
+
+import enum
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..components.blocks import (
+    ALUZ,
+    Adder,
+    AdderPlus4,
+    DataMemory,
+    InstructionMemory,
+    Mux,
+    RegisterFile,
+    ShiftLeft,
+    SignExtend,
+)
+from ..components.logic_gates import BinaryLogic, LogicType, UnaryLogic
+from ..core.basics import Pin, PinType, VGroupLogicObjectBase
+from ..core.netlist import Net, Netlist
+from .engine import NetKey
+from .trace import TraceStore
+
+# A model maps the values of a component's input pins, and an optional control
+# value for blocks without a control pin (ALUZ), to the values of its outputs.
+WordFunction = Callable[
+    [VGroupLogicObjectBase, Dict[Pin, np.ndarray], Optional[np.ndarray]],
+    Dict[Pin, np.ndarray],
+]
+
+
+@dataclass
+class WordModel:
+    """
+    A behavioral model and the input pins it reads (None: every input pin). If
+    when is given, the model only applies to components for which it is true.
+    """
+
+    function: WordFunction
+    reads: Optional[Tuple[str, ...]] = None
+    when: Optional[Callable[[VGroupLogicObjectBase], bool]] = None
+
+
+WORD_MODELS: Dict[type, WordModel] = {}
+
+
+def register_word_model(
+    component_class: type,
+    function: WordFunction,
+    reads: Optional[Tuple[str, ...]] = None,
+    when: Optional[Callable[[VGroupLogicObjectBase], bool]] = None,
+):
+    """Use function to simulate component_class and its subclasses."""
+    WORD_MODELS[component_class] = WordModel(function, reads, when)
+
+
+def model_for(component: VGroupLogicObjectBase) -> Optional[WordModel]:
+    for cls in type(component).__mro__:
+        model = WORD_MODELS.get(cls)
+        if model is not None and (model.when is None or model.when(component)):
+            return model
+    return None
+
+
+class AluOp(enum.IntEnum):
+    """ALU control codes, as produced by the MIPS ALU control unit."""
+
+    AND = 0b0000
+    OR = 0b0001
+    ADD = 0b0010
+    SUB = 0b0110
+    SLT = 0b0111
+    NOR = 0b1100
+
+
+def _inputs(component: VGroupLogicObjectBase, values: Dict[Pin, np.ndarray]):
+    return [values[pin] for pin in component.get_owned_pins() if pin in values]
+
+
+def _output(component: VGroupLogicObjectBase, index: int = 0) -> Pin:
+    pins = component.get_owned_pins()
+    return [pin for pin in pins if pin.pin_type == PinType.OUTPUT][index]
+
+
+def _gate(component, values, control):
+    operands = [v.astype(np.uint64) for v in _inputs(component, values)]
+    match component.logic_function:
+        case LogicType.AND | LogicType.NAND:
+            out = np.bitwise_and.reduce(operands)
+        case LogicType.OR | LogicType.NOR:
+            out = np.bitwise_or.reduce(operands)
+        case LogicType.XOR | LogicType.XNOR:
+            out = np.bitwise_xor.reduce(operands)
+        case _:
+            out = operands[0]
+    if component.logic_function in (
+        LogicType.NAND,
+        LogicType.NOR,
+        LogicType.XNOR,
+        LogicType.INV,
+    ):
+        out = ~out
+    return {_output(component): out}
+
+
+def _mux(component, values, control):
+    pins = [p for p in component.get_owned_pins() if p in values]
+    sel = next(values[p] for p in pins if p.label_str == "sel").astype(np.intp)
+    data = np.stack([values[p] for p in pins if p.label_str != "sel"])
+    sel = np.minimum(sel, len(data) - 1)
+    return {_output(component): data[sel, np.arange(data.shape[1])]}
+
+
+def _adder(component, values, control):
+    in0, in1 = _inputs(component, values)
+    return {component.result_pin: in0.astype(np.uint64) + in1}
+
+
+def _adder_plus4(component, values, control):
+    return {component.result_pin: values[component.input0_pin].astype(np.uint64) + 4}
+
+
+def _sign_extend(component, values, control):
+    (pin,) = [p for p in component.get_owned_pins() if p in values]
+    sign = np.uint64(1 << (pin.bit_width - 1))
+    value = values[pin].astype(np.uint64)
+    return {_output(component): (value ^ sign) - sign}
+
+
+def _shift_left(component, values, control):
+    (value,) = _inputs(component, values)
+    return {_output(component): value.astype(np.uint64) << np.uint64(component.amount)}
+
+
+def alu_compute(a, b, op, bit_width: int = 32) -> np.ndarray:
+    """Result of the ALU operations op (AluOp codes) on a and b, bit_width wide."""
+    a = np.asarray(a).astype(np.uint64)
+    b = np.asarray(b).astype(np.uint64)
+    op = np.broadcast_to(op, np.broadcast(a, b).shape)
+    sign = np.uint64(1 << (bit_width - 1))
+    # Compare as signed by flipping the sign bits.
+    less = (a ^ sign) < (b ^ sign)
+    result = np.select(
+        [
+            op == AluOp.AND,
+            op == AluOp.OR,
+            op == AluOp.ADD,
+            op == AluOp.SUB,
+            op == AluOp.SLT,
+            op == AluOp.NOR,
+        ],
+        [a & b, a | b, a + b, a - b, less.astype(np.uint64), ~(a | b)],
+        default=np.uint64(0),
+    )
+    return result & np.uint64((1 << bit_width) - 1)
+
+
+def _alu(component, values, control):
+    op = AluOp.ADD if control is None else control
+    result = alu_compute(
+        values[component.input0_pin],
+        values[component.input1_pin],
+        op,
+        component.result_pin.bit_width,
+    )
+    return {component.result_pin: result, component.zero_pin: result == 0}
+
+
+def _storage_read(component, values, control):
+    outputs = component.read_ports({pin.label_str: v for pin, v in values.items()})
+    return {
+        component.get_output_by_label(label): value
+        for label, value in outputs.items()
+    }
+
+
+def _has_storage(component) -> bool:
+    return component.storage is not None
+
+
+register_word_model(BinaryLogic, _gate)
+register_word_model(UnaryLogic, _gate)
+register_word_model(Mux, _mux)
+register_word_model(Adder, _adder)
+register_word_model(AdderPlus4, _adder_plus4, reads=("in0",))
+register_word_model(SignExtend, _sign_extend)
+register_word_model(ShiftLeft, _shift_left)
+register_word_model(ALUZ, _alu)
+register_word_model(
+    RegisterFile, _storage_read, reads=("ReadReg1", "ReadReg2"), when=_has_storage
+)
+register_word_model(
+    DataMemory, _storage_read, reads=("Addr", "MemRead"), when=_has_storage
+)
+register_word_model(
+    InstructionMemory, _storage_read, reads=("RAddr",), when=_has_storage
+)
+
+
+class WordResult:
+    """
+    Net values computed by WordSimulator.
+
+    Attributes:
+        netlist (Netlist): The simulated netlist
+        net_values (Dict[int, np.ndarray]): uint64 values of each net, by Net.index
+        num_cycles (int): Number of values per net
+    """
+
+    def __init__(
+        self, netlist: Netlist, net_values: Dict[int, np.ndarray], num_cycles: int
+    ):
+        self.netlist = netlist
+        self.net_values = net_values
+        self.num_cycles = num_cycles
+
+    def value(self, key: NetKey) -> np.ndarray:
+        """Values seen by a pin (applying its bit_range and width), or of a Net."""
+        if isinstance(key, Net):
+            return self.net_values[key.index]
+        return key.read(self.net_values[self.netlist.net_of(key).index])
+
+    def to_trace(self, keys: Optional[Sequence[NetKey]] = None) -> TraceStore:
+        """The values as a TraceStore with a column per pin or net (default: nets)."""
+        if keys is None:
+            nets = self.netlist.nets()
+            keys = [nets[index] for index in sorted(self.net_values)]
+        store = TraceStore(capacity=self.num_cycles)
+        for key in keys:
+            if isinstance(key, Net):
+                width = max((pin.bit_width for pin in key.pins), default=64)
+            else:
+                width = key.bit_width
+            store.add_column(key, width)
+        store.extend(
+            {key: self.value(key) for key in keys}, length=self.num_cycles
+        )
+        return store
+
+
+class WordSimulator:
+    """
+    Evaluates the datapath blocks of a Netlist on bus-wide values.
+
+    Components without a word model (registers, memories without storage,
+    ...) are left out; their outputs are circuit inputs, like undriven nets.
+
+    Parameters:
+        netlist (Netlist): Connectivity of the circuit to simulate
+
+    Examples:
+        >>> sim = WordSimulator(netlist)
+        >>> result = sim.evaluate(
+        ...     {alu.input0_pin: [1, 2, 3], alu.input1_pin: 5},
+        ...     controls={alu: AluOp.SUB},
+        ... )
+        >>> result.value(alu.result_pin)
+        >>> alu.result_pin.value  # also stored on every simulated pin
+    """
+
+    def __init__(self, netlist: Netlist):
+        self.netlist = netlist
+        netlist.nets()
+        self.components: List[VGroupLogicObjectBase] = []
+        self._reads: Dict[int, List[Pin]] = {}
+        driver_of: Dict[int, VGroupLogicObjectBase] = {}
+        for component in netlist.components:
+            model = model_for(component)
+            if model is None:
+                continue
+            self.components.append(component)
+            self._reads[id(component)] = [
+                pin
+                for pin in netlist.pins_of(component)
+                if pin.pin_type == PinType.INPUT
+                and (model.reads is None or pin.label_str in model.reads)
+            ]
+            for pin in netlist.pins_of(component):
+                if pin.pin_type == PinType.OUTPUT:
+                    driver_of[netlist.net_of(pin).index] = component
+        self._order(driver_of)
+        read = {
+            netlist.net_of(pin).index
+            for component in self.components
+            for pin in self._reads[id(component)]
+        }
+        self.input_nets: List[Net] = [
+            netlist.nets()[net] for net in sorted(read) if net not in driver_of
+        ]
+
+    def _order(self, driver_of: Dict[int, VGroupLogicObjectBase]):
+        """Sort the components so every block comes after the blocks it reads."""
+        pending: Dict[int, int] = {}
+        sinks: Dict[int, List[VGroupLogicObjectBase]] = {}
+        ready = []
+        for component in self.components:
+            sources = {
+                id(driver_of[net]): driver_of[net]
+                for net in (
+                    self.netlist.net_of(pin).index
+                    for pin in self._reads[id(component)]
+                )
+                if net in driver_of
+            }
+            pending[id(component)] = len(sources)
+            for source in sources.values():
+                sinks.setdefault(id(source), []).append(component)
+            if not sources:
+                ready.append(component)
+        ordered = []
+        while ready:
+            component = ready.pop()
+            ordered.append(component)
+            for sink in sinks.get(id(component), ()):
+                pending[id(sink)] -= 1
+                if pending[id(sink)] == 0:
+                    ready.append(sink)
+        if len(ordered) != len(self.components):
+            raise ValueError("Netlist contains a combinational loop")
+        self.components = ordered
+
+    def _index(self, key: NetKey) -> int:
+        return key.index if isinstance(key, Net) else self.netlist.net_of(key).index
+
+    def evaluate(
+        self,
+        inputs: Mapping[NetKey, object],
+        controls: Optional[Mapping[VGroupLogicObjectBase, object]] = None,
+    ) -> WordResult:
+        """
+        Evaluate the blocks for one or more cycles.
+
+        Parameters:
+            inputs: Integer values keyed by pin or net; a scalar applies to every
+                cycle, and all sequences must have the same length. A pin with a
+                bit_range is given the bits it reads.
+            controls: Control values of blocks without a control pin, e.g.
+                {alu: AluOp.SUB}; ALUZ adds when not given
+
+        Raises:
+            ValueError: If an input net has no value, or a value doesn't fit the
+                width of the pin it is given for
+        """
+        arrays: Dict[int, np.ndarray] = {}
+        for key, value in inputs.items():
+            value = np.atleast_1d(np.asarray(value))
+            index = self._index(key)
+            if isinstance(key, Pin):
+                value = key.set_value(value).value.astype(np.uint64)
+                if key.bit_range is not None:
+                    # The pin sees only its slice; place it there on the bus.
+                    value = value << np.uint64(key.bit_range[1])
+                    if index in arrays:
+                        value = value | arrays[index]
+            arrays[index] = value.astype(np.uint64)
+        missing = [net for net in self.input_nets if net.index not in arrays]
+        if missing:
+            raise ValueError(f"No values given for input nets: {missing}")
+        lengths = {a.size for a in arrays.values() if a.size != 1}
+        if len(lengths) > 1:
+            raise ValueError(f"Input values differ in length: {sorted(lengths)}")
+        cycles = lengths.pop() if lengths else 1
+        values = {net: np.broadcast_to(a, (cycles,)) for net, a in arrays.items()}
+        controls = controls or {}
+
+        for component in self.components:
+            pins = self._reads[id(component)]
+            seen = {
+                pin: pin.read(values[self.netlist.net_of(pin).index]) for pin in pins
+            }
+            control = controls.get(component)
+            if control is not None:
+                control = np.asarray(control)
+            model = model_for(component)
+            for pin, out in model.function(component, seen, control).items():
+                out = np.asarray(out).astype(np.uint64) & np.uint64(pin.mask)
+                values[self.netlist.net_of(pin).index] = out
+                pin.value = out.astype(pin.dtype)
+            for pin, value in seen.items():
+                pin.value = value
+        return WordResult(self.netlist, values, cycles)
@@ -2,15 +2,27 @@
 Utility functions for LogicEdu.
 
 This module contains helper functions for common animation patterns
-and circuit construction utilities.
+and circuit construction utilities, plus a construction-time profiler.
 """
 
 from .animation_helpers import (
     dim_all_objects,
     undim_all_objects,
 )
+from .focus import (
+    FocusController,
+    FocusTransition,
+)
+from .profiling import (
+    ConstructionProfiler,
+    ProfileStat,
+)
 
 __all__ = [
     "dim_all_objects",
     "undim_all_objects",
+    "FocusController",
+    "FocusTransition",
+    "ConstructionProfiler",
+    "ProfileStat",
 ]
@@ -0,0 +1,201 @@
+"""
+Fast focus and dimming for whole scenes.
+
+dim_all()/undim_all() on components walk their parts one set_opacity() call at a
+time, which adds up when a scene dims dozens of blocks at every step. A
+FocusController collects the leaf mobjects of a scene once, remembers their
+original opacities, and from then on works with an array holding one opacity
+factor per leaf. Focusing on a few objects builds the new factor array with numpy
+and only writes the leaves whose factor actually changed.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from manim import Animation, AnimationGroup, Mobject, VMobject
+
+from ..core.baking import BakedComponent
+from ..core.basics import PinType
+
+
+def _unbaked(component: Mobject) -> Mobject:
+    """The component a netlist knows about: the source of a baked component."""
+    return component.source if isinstance(component, BakedComponent) else component
+
+
+class FocusController:
+    """
+    Dim everything in a scene except the objects in focus.
+
+    Parameters:
+        mobjects: The scene's top-level mobjects (or one VGroup holding them)
+        dim_value (float): Opacity factor of dimmed objects (default: 0.3)
+
+    Attributes:
+        roots (List[Mobject]): The mobjects passed in
+        leaves (List[VMobject]): Every VMobject with points below the roots
+        factors (np.ndarray): Current opacity factor of each leaf
+
+    Examples:
+        >>> focus = FocusController(self.all_objects)
+        >>> focus.focus(regfile, alu)
+        >>> self.play(focus.animate_focus_path(netlist, pc, imem, regfile))
+        >>> self.play(focus.animate_undim())
+    """
+
+    def __init__(self, *mobjects: Mobject, dim_value: float = 0.3):
+        self.roots: List[Mobject] = list(mobjects)
+        self.dim_value = dim_value
+        self.refresh()
+
+    def refresh(self):
+        """Collect the leaves again, e.g. after adding objects or restyling them."""
+        self.leaves: List[VMobject] = []
+        for root in self.roots:
+            for mob in root.family_members_with_points():
+                if isinstance(mob, VMobject):
+                    self.leaves.append(mob)
+        self._index_of: Dict[int, int] = {
+            id(leaf): i for i, leaf in enumerate(self.leaves)
+        }
+        self._base_stroke = [leaf.stroke_rgbas[:, 3].copy() for leaf in self.leaves]
+        self._base_fill = [leaf.fill_rgbas[:, 3].copy() for leaf in self.leaves]
+        self._indices: Dict[int, np.ndarray] = {}
+        self.factors = np.ones(len(self.leaves))
+
+    def indices(self, *mobjects: Mobject) -> np.ndarray:
+        """Leaf indices of the given mobjects, computed once per mobject."""
+        parts = []
+        for mob in mobjects:
+            found = self._indices.get(id(mob))
+            if found is None:
+                found = np.array(
+                    [
+                        self._index_of[id(leaf)]
+                        for leaf in mob.family_members_with_points()
+                        if id(leaf) in self._index_of
+                    ],
+                    dtype=np.intp,
+                )
+                self._indices[id(mob)] = found
+            parts.append(found)
+        if not parts:
+            return np.zeros(0, dtype=np.intp)
+        return np.unique(np.concatenate(parts))
+
+    def apply(self, factors: np.ndarray, indices: Optional[np.ndarray] = None):
+        """
+        Set the opacity factors of the leaves at indices (default: all leaves).
+
+        Only leaves whose factor changes are touched.
+        """
+        if indices is None:
+            indices = np.arange(len(self.leaves))
+        mask = factors != self.factors[indices]
+        changed = indices[mask]
+        new = factors[mask]
+        for i, factor in zip(changed.tolist(), new.tolist()):
+            leaf = self.leaves[i]
+            stroke = leaf.stroke_rgbas.copy()
+            stroke[:, 3] = self._base_stroke[i] * factor
+            leaf.stroke_rgbas = stroke
+            fill = leaf.fill_rgbas.copy()
+            fill[:, 3] = self._base_fill[i] * factor
+            leaf.fill_rgbas = fill
+        self.factors[changed] = new
+
+    # Targets
+
+    def focus_factors(self, *mobjects: Mobject) -> np.ndarray:
+        """Factors that dim everything except the given mobjects."""
+        factors = np.full(len(self.leaves), self.dim_value)
+        factors[self.indices(*mobjects)] = 1.0
+        return factors
+
+    def path_mobjects(self, netlist, *components: Mobject) -> List[Mobject]:
+        """
+        The components of a path plus the wires joining each one to the next.
+
+        components lists the path in signal order, e.g. pc, imem, regfile, alu.
+        """
+        path: List[Mobject] = list(components)
+        for source, sink in zip(components, components[1:]):
+            sink = _unbaked(sink)
+            for pin in netlist.pins_of(_unbaked(source)):
+                if pin.pin_type != PinType.OUTPUT:
+                    continue
+                net = netlist.net_of(pin)
+                if any(load.owner is sink for load in net.loads):
+                    path.extend(net.wires)
+        return path
+
+    # Immediate changes
+
+    def focus(self, *mobjects: Mobject):
+        """Dim everything except the given mobjects."""
+        self.apply(self.focus_factors(*mobjects))
+
+    def focus_path(self, netlist, *components: Mobject):
+        """Dim everything except a signal path; see path_mobjects()."""
+        self.focus(*self.path_mobjects(netlist, *components))
+
+    def dim_all(self):
+        self.apply(np.full(len(self.leaves), self.dim_value))
+
+    def undim_all(self):
+        self.apply(np.ones(len(self.leaves)))
+
+    # Animations
+
+    def animate_to(self, factors: np.ndarray, **kwargs) -> AnimationGroup:
+        """Animate from the current factors to new ones; kwargs go to each Animation."""
+        return AnimationGroup(
+            *(FocusTransition(self, root, factors, **kwargs) for root in self.roots)
+        )
+
+    def animate_focus(self, *mobjects: Mobject, **kwargs) -> AnimationGroup:
+        return self.animate_to(self.focus_factors(*mobjects), **kwargs)
+
+    def animate_focus_path(self, netlist, *components: Mobject, **kwargs):
+        return self.animate_focus(*self.path_mobjects(netlist, *components), **kwargs)
+
+    def animate_dim(self, **kwargs) -> AnimationGroup:
+        return self.animate_to(np.full(len(self.leaves), self.dim_value), **kwargs)
+
+    def animate_undim(self, **kwargs) -> AnimationGroup:
+        return self.animate_to(np.ones(len(self.leaves)), **kwargs)
+
+
+class FocusTransition(Animation):
+    """
+    Fade the leaves of one root of a FocusController to new opacity factors.
+
+    Built by FocusController.animate_to(), one per root, so the scene redraws the
+    roots themselves rather than a copy.
+    """
+
+    def __init__(
+        self,
+        controller: FocusController,
+        root: Mobject,
+        factors: Sequence[float],
+        **kwargs,
+    ):
+        self.controller = controller
+        self.leaf_indices = controller.indices(root)
+        self.target = np.asarray(factors, dtype=float)[self.leaf_indices]
+        super().__init__(root, **kwargs)
+
+    def begin(self):
+        self.start = self.controller.factors[self.leaf_indices].copy()
+        super().begin()
+
+    def create_starting_mobject(self) -> Mobject:
+        # Opacities are interpolated from self.start; no copy of the root is needed.
+        return self.mobject
+
+    def interpolate_mobject(self, alpha: float):
+        t = self.rate_func(alpha)
+        self.controller.apply(
+            self.start + (self.target - self.start) * t, self.leaf_indices
+        )
@@ -0,0 +1,230 @@
+"""
+Construction-time profiling for LogicEdu scenes.
+
+The profiler wraps the __init__ of every LogicEdu component, pin and wire class,
+plus a few manim hot spots (Text, ArcPolygon, Line.put_start_and_end_on), and
+records how long each takes, how much of that is spent in its own code rather
+than in nested calls, and how many objects of each class get built. Nothing is
+patched until a profiler is entered, so there is no cost when it isn't used.
+
+Results can be printed as a table or written in the collapsed-stack format
+understood by flamegraph.pl, speedscope and inferno.
+
+Setting the LOGICEDU_PROFILE environment variable profiles a whole run:
+LOGICEDU_PROFILE=1 prints the table at exit, and any other value is used as the
+path of a collapsed-stack file to write.
+"""
+
+import atexit
+import functools
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class ProfileStat:
+    """
+    Timings for one profiled function.
+
+    Attributes:
+        calls (int): Number of calls
+        total_s (float): Time from entry to exit, not counting recursive re-entry
+        self_s (float): Time not spent in other profiled functions
+    """
+
+    calls: int = 0
+    total_s: float = 0.0
+    self_s: float = 0.0
+
+
+def _logic_classes() -> List[type]:
+    """Every LogicEdu class built on VGroupLogicBase, after importing the components."""
+    from ..components import blocks, logic_gates  # noqa: F401 - registers subclasses
+    from ..core.basics import VGroupLogicBase
+
+    found = []
+    pending = [VGroupLogicBase]
+    while pending:
+        cls = pending.pop()
+        if cls not in found:
+            found.append(cls)
+            pending.extend(cls.__subclasses__())
+    return found
+
+
+def _default_phases() -> List[Tuple[type, str]]:
+    from manim import ArcPolygon, Line, Text
+
+    return [
+        (Text, "__init__"),
+        (ArcPolygon, "__init__"),
+        (Line, "put_start_and_end_on"),
+    ]
+
+
+class ConstructionProfiler:
+    """
+    Record per-class and per-phase construction timings.
+
+    Parameters:
+        classes (Iterable[type]): Classes whose own __init__ to time
+            (default: every subclass of VGroupLogicBase)
+        phases (Iterable[Tuple[type, str]]): Extra (class, method name) pairs to time
+            (default: Text and ArcPolygon construction and Line.put_start_and_end_on)
+
+    Attributes:
+        stats (Dict[str, ProfileStat]): Timings keyed by "Class.method"
+        objects (Dict[str, int]): Number of instances built, keyed by class name
+        stacks (Dict[Tuple[str, ...], float]): Self time per call stack, for flame graphs
+
+    Examples:
+        >>> with ConstructionProfiler() as profiler:
+        ...     scene.construct()
+        >>> print(profiler.report(limit=15))
+        >>> profiler.write_collapsed("construct.folded")
+    """
+
+    _active: Optional["ConstructionProfiler"] = None
+
+    def __init__(
+        self,
+        classes: Optional[Iterable[type]] = None,
+        phases: Optional[Iterable[Tuple[type, str]]] = None,
+    ):
+        self._classes = list(classes) if classes is not None else None
+        self._phases = list(phases) if phases is not None else None
+        self._patched: List[Tuple[type, str, Callable]] = []
+        # Each frame is [name, start time, time spent in profiled children].
+        self._stack: List[list] = []
+        self._initializing: set = set()
+        self.stats: Dict[str, ProfileStat] = {}
+        self.objects: Dict[str, int] = {}
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+
+    # Patching
+
+    def __enter__(self) -> "ConstructionProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def start(self):
+        if ConstructionProfiler._active is not None:
+            raise RuntimeError("Another ConstructionProfiler is already running")
+        ConstructionProfiler._active = self
+        classes = self._classes if self._classes is not None else _logic_classes()
+        phases = self._phases if self._phases is not None else _default_phases()
+        targets = [(cls, "__init__") for cls in classes] + phases
+        for owner, attr in targets:
+            # Only wrap methods the class defines itself; inherited ones are timed
+            # under the class that defines them.
+            if attr not in owner.__dict__:
+                continue
+            original = owner.__dict__[attr]
+            setattr(owner, attr, self._wrap(f"{owner.__name__}.{attr}", original, attr))
+            self._patched.append((owner, attr, original))
+
+    def stop(self):
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched.clear()
+        if ConstructionProfiler._active is self:
+            ConstructionProfiler._active = None
+
+    def _wrap(self, name: str, func: Callable, attr: str) -> Callable:
+        profiler = self
+        counts_objects = attr == "__init__"
+
+        @functools.wraps(func)
+        def wrapper(obj, *args, **kwargs):
+            outermost_init = counts_objects and id(obj) not in profiler._initializing
+            if outermost_init:
+                profiler._initializing.add(id(obj))
+                cls_name = type(obj).__name__
+                profiler.objects[cls_name] = profiler.objects.get(cls_name, 0) + 1
+            frame = [name, time.perf_counter(), 0.0]
+            profiler._stack.append(frame)
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - frame[1]
+                profiler._stack.pop()
+                if outermost_init:
+                    profiler._initializing.discard(id(obj))
+                profiler._record(frame, elapsed)
+
+        return wrapper
+
+    def _record(self, frame: list, elapsed: float):
+        name, _, children = frame
+        stat = self.stats.setdefault(name, ProfileStat())
+        stat.calls += 1
+        self_time = elapsed - children
+        stat.self_s += self_time
+        if all(outer[0] != name for outer in self._stack):
+            stat.total_s += elapsed
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        path = tuple(outer[0] for outer in self._stack) + (name,)
+        self.stacks[path] = self.stacks.get(path, 0.0) + self_time
+
+    # Reporting
+
+    def report(self, sort: str = "self_s", limit: Optional[int] = None) -> str:
+        """A table of the profiled functions, slowest first by sort (self_s or total_s)."""
+        rows = sorted(self.stats.items(), key=lambda item: -getattr(item[1], sort))
+        if limit is not None:
+            rows = rows[:limit]
+        lines = [f"{'function':44s} {'calls':>8s} {'total ms':>10s} {'self ms':>10s}"]
+        for name, stat in rows:
+            lines.append(
+                f"{name:44s} {stat.calls:8d} {stat.total_s * 1000:10.1f} "
+                f"{stat.self_s * 1000:10.1f}"
+            )
+        if self.objects:
+            lines.append("")
+            lines.append(f"{'objects built':44s} {'count':>8s}")
+            for cls_name, count in sorted(self.objects.items(), key=lambda i: -i[1]):
+                lines.append(f"{cls_name:44s} {count:8d}")
+        return "\n".join(lines)
+
+    def collapsed(self) -> List[str]:
+        """Collapsed-stack lines ("a;b;c microseconds") for flame graph tools."""
+        return [
+            f"{';'.join(path)} {max(1, round(seconds * 1e6))}"
+            for path, seconds in sorted(self.stacks.items())
+        ]
+
+    def write_collapsed(self, path: str):
+        with open(path, "w") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+
+    def reset(self):
+        self.stats.clear()
+        self.objects.clear()
+        self.stacks.clear()
+
+
+def enable_from_env() -> Optional[ConstructionProfiler]:
+    """Start a profiler for the whole run if LOGICEDU_PROFILE is set; see module docs."""
+    target = os.environ.get("LOGICEDU_PROFILE")
+    if not target or ConstructionProfiler._active is not None:
+        return None
+    profiler = ConstructionProfiler()
+    profiler.start()
+
+    def finish():
+        profiler.stop()
+        if target == "1":
+            print(profiler.report(), file=sys.stderr)
+        else:
+            profiler.write_collapsed(target)
+
+    atexit.register(finish)
+    return profiler
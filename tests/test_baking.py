@@ -0,0 +1,62 @@
+import copy
+
+import numpy as np
+from manim import RIGHT, UP
+
+from logicedu.components.blocks import RegisterFile
+from logicedu.components.logic_gates import AND2, OR2
+from logicedu.core.baking import BakedComponent
+from logicedu.core.basics import ConnectorLine
+from logicedu.core.netlist import Netlist
+
+
+class TestBake:
+    def test_reduces_mobject_count(self):
+        """A baked component renders far fewer mobjects than the original."""
+        regfile = RegisterFile()
+        baked = regfile.bake()
+        assert isinstance(baked, BakedComponent)
+        assert len(baked.family_members_with_points()) < len(
+            regfile.family_members_with_points()
+        ) / 3
+        assert len(baked.paths) <= 3
+        assert np.allclose(baked.get_center(), regfile.get_center())
+
+    def test_pin_lookups_follow_moves(self):
+        """Pins stay reachable and move with the baked component."""
+        gate = AND2()
+        baked = gate.bake()
+        pin = baked.get_output_by_index(0)
+        assert pin is gate.get_output_by_index(0)
+        end = pin.line.get_end().copy()
+        baked.shift(UP)
+        assert np.allclose(pin.line.get_end(), end + UP)
+        baked.scale(2)
+        assert np.allclose(baked.get_center(), gate.get_center())
+
+    def test_dim_and_undim(self):
+        """Dimming scales the opacity of the merged paths and restores it."""
+        baked = RegisterFile().bake()
+        before = [(p.get_stroke_opacity(), p.get_fill_opacity()) for p in baked.paths]
+        baked.dim_all()
+        assert all(p.get_stroke_opacity() < 1 for p in baked.paths)
+        baked.undim_all()
+        after = [(p.get_stroke_opacity(), p.get_fill_opacity()) for p in baked.paths]
+        assert before == after
+
+    def test_netlist_uses_source(self):
+        """Netlists see the source component behind a baked one."""
+        a = AND2()
+        b = OR2().shift(RIGHT * 3)
+        baked = b.bake()
+        wire = ConnectorLine(a.get_output_by_index(0), baked.get_input_by_index(0))
+        netlist = Netlist.from_mobjects(a, baked, wire)
+        assert b in netlist.successors(a)
+        assert baked not in netlist.components
+
+    def test_copy(self):
+        """Copies of a baked component get their own source and pins."""
+        baked = AND2().bake()
+        copied = copy.deepcopy(baked)
+        assert copied.source is not baked.source
+        assert copied.get_input_by_index(0).owner is copied.source
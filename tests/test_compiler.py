@@ -0,0 +1,98 @@
+"""
+Tests for compiled circuit evaluation.
+"""
+
+import numpy as np
+import pytest
+
+from logicedu.components.blocks import Mux
+from logicedu.components.logic_gates import AND2, INV, NAND2, NOR2, OR2, XNOR2, XOR2
+from logicedu.core import Netlist
+from logicedu.simulation import LogicSimulator, compile_netlist
+from logicedu.simulation import compiler
+
+
+def random_circuit(num_gates, seed=0):
+    """Gates whose inputs come from earlier gates or new circuit inputs."""
+    rng = np.random.default_rng(seed)
+    classes = [AND2, NAND2, OR2, NOR2, XOR2, XNOR2, INV, Mux]
+    gates = [classes[i]() for i in rng.integers(0, len(classes), num_gates)]
+    netlist = Netlist(components=gates)
+    for i, gate in enumerate(gates):
+        for pin in gate._get_input_pins():
+            if i and rng.random() < 0.7:
+                source = gates[rng.integers(0, i)]
+                netlist.connect(source._get_output_pins()[0], pin)
+    return gates, netlist
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    compiler.clear_cache()
+    yield
+    compiler.clear_cache()
+
+
+class TestCompiledCircuit:
+    """Test generated evaluation functions."""
+
+    def test_matches_interpreter(self):
+        """Compiled and interpreted evaluation agree on every net."""
+        gates, netlist = random_circuit(200)
+        circuit = compile_netlist(netlist)
+        simulator = LogicSimulator(netlist)
+        rng = np.random.default_rng(1)
+        inputs = {
+            net: rng.integers(0, 2, 300).astype(bool) for net in circuit.input_nets
+        }
+        expected = simulator.evaluate(inputs).packed_values
+        assert np.array_equal(circuit.evaluate(inputs).packed_values, expected)
+
+    def test_integers(self):
+        """One Python integer carries every vector."""
+        nand, mux = NAND2(), Mux()
+        netlist = Netlist(components=[nand, mux])
+        netlist.connect(nand.get_output_by_index(0), mux.get_input_by_index(1))
+        circuit = compile_netlist(netlist)
+        values = circuit.evaluate_int(
+            {
+                nand.get_input_by_index(0): 0b1100,
+                nand.get_input_by_index(1): 0b1010,
+                mux.get_input_by_index(0): 0b0000,
+                mux.get_input_by_index(2): 0b1111,
+            },
+            num_vectors=4,
+        )
+        assert values[netlist.net_of(mux.get_output_by_index(0)).index] == 0b0111
+        assert circuit.source.startswith("def evaluate(")
+
+    def test_memory_cache(self):
+        """Circuits with the same structure share one function."""
+        first = compile_netlist(random_circuit(50)[1])
+        second = compile_netlist(random_circuit(50)[1])
+        other = compile_netlist(random_circuit(50, seed=2)[1])
+        assert first.key == second.key != other.key
+        assert first.function is second.function
+
+    def test_disk_cache(self, tmp_path):
+        """Generated modules are kept on disk and reused after a restart."""
+        gates, netlist = random_circuit(30)
+        circuit = compile_netlist(netlist, cache_dir=tmp_path)
+        assert (tmp_path / f"circuit_{circuit.key}.py").read_text() == circuit.source
+        compiler.clear_cache()
+        again = compile_netlist(random_circuit(30)[1], cache_dir=tmp_path)
+        assert again.function is not circuit.function
+        assert again.function.__code__.co_filename.endswith(f"{circuit.key}.py")
+
+    def test_environment_cache_dir(self, tmp_path, monkeypatch):
+        """LOGICEDU_CACHE_DIR turns on the disk cache."""
+        monkeypatch.setenv("LOGICEDU_CACHE_DIR", str(tmp_path))
+        circuit = compile_netlist(Netlist(components=[INV()]))
+        assert (tmp_path / f"circuit_{circuit.key}.py").exists()
+
+    def test_missing_input(self):
+        """Every circuit input must be given a value."""
+        gate = AND2()
+        circuit = compile_netlist(Netlist(components=[gate]))
+        with pytest.raises(ValueError, match="No values given"):
+            circuit.evaluate({gate.get_input_by_index(0): 1})
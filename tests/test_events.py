@@ -0,0 +1,134 @@
+"""
+Tests for the event-driven simulator.
+"""
+
+import pytest
+
+from logicedu.components.blocks import DFF, DFFVariant
+from logicedu.components.logic_gates import AND2, INV, XOR2
+from logicedu.core import Netlist
+from logicedu.simulation import DelayModel, EventSimulator
+
+
+def shift_register(length, variant=DFFVariant.DFF, **kwargs):
+    """DFFs in a chain sharing one clock (and reset, for DFF_R)."""
+    flops = [DFF(variant, **kwargs) for _ in range(length)]
+    netlist = Netlist(components=flops)
+    for a, b in zip(flops, flops[1:]):
+        netlist.connect(a.q_pin, b.d_pin)
+        netlist.connect(a.clk_pin, b.clk_pin)
+        if variant != DFFVariant.DFF:
+            netlist.connect(a.r_pin, b.r_pin)
+    return flops, netlist
+
+
+def counter(bits):
+    """A synchronous counter: bit i flips when the bits below it are all 1."""
+    flops = [DFF() for _ in range(bits)]
+    inverter = INV()
+    xors = [XOR2() for _ in range(bits - 1)]
+    ands = [AND2() for _ in range(bits - 2)]
+    netlist = Netlist(components=flops + [inverter] + xors + ands)
+    netlist.connect(flops[0].q_pin, inverter.get_input_by_index(0))
+    netlist.connect(inverter.get_output_by_index(0), flops[0].d_pin)
+    carry = flops[0].q_pin
+    for i, xor in enumerate(xors, start=1):
+        if i > 1:
+            gate = ands[i - 2]
+            netlist.connect(carry, gate.get_input_by_index(0))
+            netlist.connect(flops[i - 1].q_pin, gate.get_input_by_index(1))
+            carry = gate.get_output_by_index(0)
+        netlist.connect(flops[i].q_pin, xor.get_input_by_index(0))
+        netlist.connect(carry, xor.get_input_by_index(1))
+        netlist.connect(xor.get_output_by_index(0), flops[i].d_pin)
+        netlist.connect(flops[0].clk_pin, flops[i].clk_pin)
+    return flops, netlist
+
+
+class TestEventSimulator:
+    """Test clocked simulation of DFFs and gates."""
+
+    def test_shift_register(self):
+        """Each flop samples its D before the previous flop's Q changes."""
+        flops, netlist = shift_register(4)
+        sim = EventSimulator(netlist)
+        sim.set({flops[0].d_pin: 1})
+        sim.set({flops[0].d_pin: 0}, at=15)
+        sim.clock(flops[0].clk_pin, period=10, cycles=3)
+        sim.run()
+        assert [sim.value(f.q_pin) for f in flops] == [0, 0, 1, 0]
+
+    def test_toggle(self):
+        """An inverter feeding D back makes Q toggle on every rising edge."""
+        flops, netlist = counter(1)
+        sim = EventSimulator(netlist)
+        sim.watch(flops[0].q_pin)
+        sim.clock(flops[0].clk_pin, period=10, cycles=4)
+        sim.run()
+        assert sim.history(flops[0].q_pin) == [(5, 1), (15, 0), (25, 1), (35, 0)]
+
+    def test_counter(self):
+        """Eleven rising edges count a 4-bit counter to 11."""
+        flops, netlist = counter(4)
+        sim = EventSimulator(netlist)
+        sim.clock(flops[0].clk_pin, period=10, cycles=11)
+        sim.run()
+        assert sum(sim.value(f.q_pin) << i for i, f in enumerate(flops)) == 11
+
+    def test_async_reset(self):
+        """An asynchronous reset clears Q without a clock edge."""
+        flops, netlist = shift_register(2, DFFVariant.DFF_R)
+        sim = EventSimulator(netlist)
+        sim.set({flops[0].d_pin: 1})
+        sim.clock(flops[0].clk_pin, period=10, cycles=2)
+        sim.run()
+        assert sim.value(flops[1].q_pin) == 1
+        sim.set({flops[0].r_pin: 1}, at=30)
+        sim.run(until=31)
+        assert sim.value(flops[0].q_pin) == sim.value(flops[1].q_pin) == 0
+
+    def test_sync_reset_and_set(self):
+        """A synchronous reset or set waits for the edge; reset wins."""
+        flop = DFF(DFFVariant.DFF_SR, async_reset=False, bit_width=4)
+        sim = EventSimulator(Netlist(components=[flop]))
+        sim.set({flop.s_pin: 1})
+        sim.run()
+        assert sim.value(flop.q_pin) == 0
+        sim.clock(flop.clk_pin, period=10, cycles=1)
+        sim.run()
+        assert sim.value(flop.q_pin) == 0b1111
+        sim.set({flop.r_pin: 1})
+        sim.clock(flop.clk_pin, period=10, cycles=1)
+        sim.run()
+        assert sim.value(flop.q_pin) == 0
+
+    def test_delays(self):
+        """With a DelayModel, Q changes its clock-to-output delay after the edge."""
+        flops, netlist = counter(1)
+        sim = EventSimulator(netlist, DelayModel(component_delays={DFF: 3.0}))
+        sim.watch(flops[0].q_pin, flops[0].d_pin)
+        sim.clock(flops[0].clk_pin, period=10, cycles=1)
+        sim.run()
+        assert sim.history(flops[0].q_pin) == [(8, 1)]
+        # D settles to 1 through the inverter at time 0.5, then falls after Q.
+        assert sim.history(flops[0].d_pin) == [(0.5, 1), (8.5, 0)]
+
+    def test_sparse_activity(self):
+        """Idle parts of a circuit cost nothing."""
+        flops, netlist = shift_register(200)
+        sim = EventSimulator(netlist)
+        sim.clock(flops[0].clk_pin, period=10, cycles=50)
+        sim.run()
+        # Only the clock changes: one flop evaluation per flop per edge.
+        assert sim.events == 100
+        assert sim.evaluations == 100 * 200
+
+    def test_oscillation(self):
+        """A zero-delay loop that never settles raises ValueError."""
+        inverter = INV()
+        netlist = Netlist(components=[inverter])
+        netlist.connect(
+            inverter.get_output_by_index(0), inverter.get_input_by_index(0)
+        )
+        with pytest.raises(ValueError, match="settle"):
+            EventSimulator(netlist).run()
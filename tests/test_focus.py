@@ -0,0 +1,76 @@
+import numpy as np
+from manim import RIGHT, VGroup
+
+from logicedu.components.logic_gates import AND2, INV, OR2
+from logicedu.core.basics import ConnectorLine
+from logicedu.core.netlist import Netlist
+from logicedu.utils.focus import FocusController, FocusTransition
+
+
+def _chain():
+    with Netlist() as netlist:
+        a = AND2()
+        b = OR2().shift(RIGHT * 3)
+        c = INV().shift(RIGHT * 6)
+        ab = ConnectorLine(a.get_output_by_index(0), b.get_input_by_index(0))
+        bc = ConnectorLine(b.get_output_by_index(0), c.get_input_by_index(0))
+    return netlist, VGroup(a, b, c, ab, bc), (a, b, c, ab, bc)
+
+
+def _stroke_opacity(mob):
+    return max(leaf.get_stroke_opacity() for leaf in mob.family_members_with_points())
+
+
+class TestFocusController:
+    def test_collects_leaves(self):
+        """Leaves are the VMobjects with points below the roots."""
+        _, scene, _ = _chain()
+        focus = FocusController(scene)
+        assert len(focus.leaves) == len(scene.family_members_with_points())
+        assert np.all(focus.factors == 1)
+
+    def test_focus_and_undim(self):
+        """Focusing dims everything else; undim restores the original opacities."""
+        _, scene, (a, b, c, ab, bc) = _chain()
+        focus = FocusController(scene, dim_value=0.25)
+        focus.focus(b)
+        assert _stroke_opacity(b) == 1
+        assert np.isclose(_stroke_opacity(a), 0.25)
+        assert np.isclose(_stroke_opacity(ab), 0.25)
+        focus.undim_all()
+        assert _stroke_opacity(a) == 1 and _stroke_opacity(ab) == 1
+
+    def test_only_changed_leaves_are_written(self):
+        """Re-applying the same focus touches no leaves."""
+        _, scene, (a, *_) = _chain()
+        focus = FocusController(scene)
+        focus.focus(a)
+        arrays = [leaf.stroke_rgbas for leaf in focus.leaves]
+        focus.focus(a)
+        assert all(
+            leaf.stroke_rgbas is array for leaf, array in zip(focus.leaves, arrays)
+        )
+
+    def test_focus_path(self):
+        """A netlist path keeps its components and the wires between them bright."""
+        netlist, scene, (a, b, c, ab, bc) = _chain()
+        focus = FocusController(scene)
+        assert focus.path_mobjects(netlist, a, b) == [a, b, ab]
+        focus.focus_path(netlist, a, b)
+        assert _stroke_opacity(ab) == 1
+        assert _stroke_opacity(bc) < 1 and _stroke_opacity(c) < 1
+
+    def test_animation(self):
+        """Focus animations interpolate the factors of each root."""
+        _, scene, (a, *_) = _chain()
+        focus = FocusController(scene)
+        animation = focus.animate_focus(a, run_time=0.5)
+        (transition,) = animation.animations
+        assert isinstance(transition, FocusTransition)
+        assert transition.mobject is scene
+        transition.begin()
+        transition.interpolate(0.5)
+        assert 0.3 < focus.factors.min() < 1
+        transition.finish()
+        assert np.isclose(focus.factors.min(), 0.3)
+        assert np.all(focus.factors[focus.indices(a)] == 1)
@@ -0,0 +1,66 @@
+"""
+Tests for the label cache.
+"""
+
+from manim import BLUE, WHITE
+
+from logicedu.core import Pin, PinSide, LabelCache, label_cache
+
+
+class TestLabelCache:
+    """Test LabelCache functionality."""
+
+    def test_hits_and_misses(self):
+        """Test that repeated labels are typeset once."""
+        cache = LabelCache()
+        cache.get("32", font_size=14)
+        cache.get("32", font_size=14)
+        cache.get("32", font_size=18)
+        info = cache.info()
+        assert info.hits == 1
+        assert info.misses == 2
+        assert info.currsize == 2
+
+    def test_color_is_part_of_key(self):
+        """Test that the same text in a different color is a separate entry."""
+        cache = LabelCache()
+        cache.get("RegWrite", color=WHITE)
+        cache.get("RegWrite", color=BLUE)
+        assert cache.info().misses == 2
+
+    def test_returns_independent_copies(self):
+        """Test that moving a returned label doesn't move the cached one."""
+        cache = LabelCache()
+        first = cache.get("ReadData1")
+        first.shift([1, 0, 0])
+        second = cache.get("ReadData1")
+        assert first is not second
+        assert second.get_center()[0] != first.get_center()[0]
+
+    def test_lru_eviction(self):
+        """Test that the least recently used label is evicted first."""
+        cache = LabelCache(maxsize=2)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+        assert len(cache) == 2
+        cache.get("a")
+        assert cache.info().hits == 2
+        cache.get("b")
+        assert cache.info().misses == 4
+
+    def test_disabled_cache(self):
+        """Test that maxsize=0 disables caching."""
+        cache = LabelCache(maxsize=0)
+        cache.get("5")
+        cache.get("5")
+        assert cache.info().misses == 2
+        assert len(cache) == 0
+
+    def test_pins_share_bus_text(self):
+        """Test that Pins reuse the typeset bit-width label."""
+        Pin(pin_side=PinSide.LEFT, bit_width=32)
+        before = label_cache.info().hits
+        Pin(pin_side=PinSide.LEFT, bit_width=32)
+        assert label_cache.info().hits == before + 1
@@ -0,0 +1,47 @@
+"""
+Tests for the lazily resolved package exports.
+"""
+
+import subprocess
+import sys
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip()
+
+
+class TestLazyImports:
+    """Test that importing the package defers component construction."""
+
+    def test_import_does_not_load_components(self):
+        """Test that `import logicedu` imports neither Manim nor the components."""
+        out = run_python(
+            "import sys, logicedu; "
+            "print('manim' in sys.modules, "
+            "'logicedu.components.logic_gates' in sys.modules)"
+        )
+        assert out == "False False"
+
+    def test_unknown_attribute(self):
+        """Test that unknown names still raise AttributeError."""
+        out = run_python(
+            "import logicedu\n"
+            "try:\n"
+            "    logicedu.NotAComponent\n"
+            "except AttributeError:\n"
+            "    print('ok')\n"
+        )
+        assert out == "ok"
+
+    def test_all_gates_built_once(self):
+        """Test that all_gates is built on first access and then reused."""
+        import logicedu
+        from logicedu.components import logic_gates
+
+        gates = logicedu.all_gates
+        assert len(gates) == 8
+        assert logic_gates.all_gates is gates
+        assert logicedu.make_all_gates() is not gates
@@ -0,0 +1,76 @@
+"""
+Tests for logic gate construction.
+"""
+
+import numpy as np
+import pytest
+
+from logicedu.components.logic_gates import (
+    AND2,
+    NAND2,
+    OR2,
+    XOR2,
+    LogicType,
+    ShapeFactory,
+)
+from logicedu.core import Netlist
+from logicedu.simulation import truth_table
+
+
+class TestWideGates:
+    """Test gates with more than three inputs."""
+
+    @pytest.mark.parametrize("num_inputs", [2, 3, 4, 8, 16])
+    def test_pin_spacing(self, num_inputs):
+        """Test that inputs are evenly spaced and centered on the output."""
+        gate = AND2(num_inputs=num_inputs)
+        ends = np.array([pin.line.get_end() for pin in gate._get_input_pins()])
+        assert len(ends) == num_inputs
+        steps = -np.diff(ends[:, 1])
+        assert np.allclose(steps, ShapeFactory.between_pins(num_inputs))
+        output_y = gate.get_output_by_index(0).line.get_end()[1]
+        assert ends[:, 1].mean() == pytest.approx(output_y)
+
+    def test_extension_lines(self):
+        """Test that only gates wider than three inputs get extension lines."""
+        narrow = AND2(num_inputs=3)
+        assert len(narrow.extension) == 0
+        assert narrow.extension not in narrow.submobjects
+        gate = OR2(num_inputs=8)
+        top, bottom = gate.extension
+        pins = gate._get_input_pins()
+        assert top.get_top()[1] > pins[0].line.get_end()[1]
+        assert bottom.get_bottom()[1] < pins[-1].line.get_end()[1]
+        # Pins beyond the body end on the extension line.
+        assert pins[0].line.get_start()[0] == pytest.approx(top.get_start()[0])
+        assert len(XOR2(num_inputs=8).extension) == 4
+
+    def test_shape_is_cached(self):
+        """Test that the gate body is copied from one prototype per shape."""
+        ShapeFactory._shapes.clear()
+        first, second = NAND2(num_inputs=8), AND2(num_inputs=4)
+        OR2()
+        assert first.shape is not second.shape
+        assert np.allclose(first.shape.points, second.shape.points)
+        assert sorted(key[0].value for key in ShapeFactory._shapes) == ["AND", "OR"]
+
+    def test_shape_cache_is_bounded(self, monkeypatch):
+        """Test that only the most recently used shapes are kept."""
+        ShapeFactory._shapes.clear()
+        monkeypatch.setattr(ShapeFactory, "_SHAPES_SIZE", 2)
+        for color in ["#FF0000", "#00FF00", "#FF0000", "#0000FF"]:
+            ShapeFactory.cached_shape(LogicType.AND, color=color)
+        colors = [dict(key[1])["color"] for key in ShapeFactory._shapes]
+        assert colors == ["#FF0000", "#0000FF"]
+        ShapeFactory._shapes.clear()
+
+    def test_simulates(self):
+        """Test that a wide gate computes over all its inputs."""
+        table = truth_table(Netlist(components=[NAND2(num_inputs=8)]))
+        assert table.minterms().size == 255
+        assert not table.output()[-1]
+
+    def test_too_few_inputs(self):
+        """Test that a BinaryLogic gate needs two inputs."""
+        with pytest.raises(ValueError, match="at least 2"):
+            AND2(num_inputs=1)
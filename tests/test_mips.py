@@ -0,0 +1,193 @@
+"""
+Tests for the single-cycle MIPS simulator.
+"""
+
+import numpy as np
+import pytest
+
+from logicedu.components.blocks import AluControl, ControlUnit
+from logicedu.core import Netlist
+from logicedu.components.storage import MemoryStorage
+from logicedu.simulation import (
+    AluOp,
+    MipsProgram,
+    MipsSimulator,
+    MipsTrace,
+    WordSimulator,
+    decode_instructions,
+    encode_instruction,
+)
+from logicedu.simulation.mips import INVALID_ALU_OP, alu_control, control_signals
+
+
+def sum_program():
+    """Sum mem[0] down to 1 into $t1 and store it at mem[1]."""
+    return [
+        encode_instruction("lw", 8, 0, 0),  # lw   $t0, 0($zero)
+        encode_instruction("beq", 8, 0, 3),  # loop: beq $t0, $zero, done
+        encode_instruction("add", 9, 9, 8),  # add  $t1, $t1, $t0
+        encode_instruction("addi", 8, 8, -1),  # addi $t0, $t0, -1
+        encode_instruction("beq", 0, 0, -4),  # beq  $zero, $zero, loop
+        encode_instruction("sw", 9, 4, 0),  # done: sw $t1, 4($zero)
+    ]
+
+
+class TestMipsSimulator:
+    """Test running programs on the single-cycle datapath."""
+
+    def test_sum_loop(self):
+        """A counting loop leaves the right values in registers and memory."""
+        sim = MipsSimulator(sum_program(), data=[10])
+        trace = sim.run()
+        assert sim.halted
+        assert sim.registers[9] == 55
+        assert sim.memory[1] == 55
+        assert len(trace) == sim.cycles == 1 + 4 * 10 + 1 + 1
+
+    def test_trace_is_consistent(self):
+        """Every cycle's NextPC is the following cycle's PC."""
+        trace = MipsSimulator(sum_program(), data=[10]).run()
+        assert np.array_equal(trace["NextPC"][:-1], trace["PC"][1:])
+        adds = trace["ALUControl"] == AluOp.ADD
+        assert adds.any()
+
+    def test_derived_signals(self):
+        """Loads set the memory control lines and write the loaded value."""
+        trace = MipsSimulator(sum_program(), data=[10]).run(max_cycles=1)
+        values = trace.cycle(0)
+        assert values["MemRead"] == 1 and values["MemtoReg"] == 1
+        assert values["RegDst"] == 0 and values["WriteReg"] == 8
+        assert values["WriteData"] == values["MemReadData"] == 10
+        assert values["NextPC"] == 4
+
+    def test_signed_operations(self):
+        """Negative immediates, sub and slt behave as signed."""
+        program = [
+            encode_instruction("addi", 8, 0, -5),
+            encode_instruction("slt", 9, 8, 0),
+            encode_instruction("sub", 10, 0, 8),
+            encode_instruction("nor", 11, 0, 0),
+        ]
+        sim = MipsSimulator(program)
+        trace = sim.run()
+        assert sim.registers.tolist()[8:12] == [0xFFFFFFFB, 1, 5, 0xFFFFFFFF]
+        assert trace["ALUResult"].tolist() == [0xFFFFFFFB, 1, 5, 0xFFFFFFFF]
+
+    def test_register_zero_is_constant(self):
+        """Writes to $zero are ignored."""
+        sim = MipsSimulator([encode_instruction("addi", 0, 0, 7)])
+        sim.run()
+        assert sim.registers[0] == 0
+
+    def test_errors(self):
+        """Unsupported instructions and bad addresses raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported"):
+            MipsSimulator([0xFFFFFFFF]).run()
+        with pytest.raises(ValueError, match="address"):
+            MipsSimulator([encode_instruction("lw", 8, 2, 0)]).run()
+        with pytest.raises(ValueError):
+            encode_instruction("jal", 1, 2, 3)
+
+    def test_max_cycles_and_resume(self):
+        """Runs stop after max_cycles and continue from the same PC."""
+        sim = MipsSimulator(sum_program(), data=[10])
+        first = sim.run(max_cycles=5)
+        assert len(first) == 5 and not sim.halted
+        second = sim.run()
+        assert second["PC"][0] == first["NextPC"][-1]
+        assert sim.registers[9] == 55
+
+    def test_trace_save_and_load(self, tmp_path):
+        """Saved traces keep every signal and can be sliced."""
+        trace = MipsSimulator(sum_program(), data=[10]).run()
+        trace.save(tmp_path / "sum")
+        loaded = MipsTrace.load(tmp_path / "sum")
+        assert len(loaded) == len(trace)
+        assert loaded[2:4].cycle(1) == trace.cycle(3)
+        assert isinstance(loaded["ALUResult"], np.memmap)
+
+    def test_program_decodes_on_fetch(self):
+        """Instructions are decoded when first fetched and then cached."""
+        program = MipsProgram(sum_program(), text_base=0x400000)
+        assert program.decoded == [None] * 6
+        first = program.fetch(0x400004)
+        assert (first.opcode, first.rs, first.rt, first.arg) == (4, 8, 0, 3)
+        assert program.fetch(0x400004) is first
+        assert program.decoded.count(None) == 5
+        with pytest.raises(ValueError, match="No instruction"):
+            program.fetch(0x400018)
+        with pytest.raises(ValueError, match="Unsupported"):
+            MipsProgram([0xFFFFFFFF]).fetch(0)
+
+    def test_run_from_image(self):
+        """A big-endian image runs in place from its entry point."""
+        words = np.array([0] + sum_program(), dtype=">u4")
+        image = MemoryStorage(buffer=bytearray(words.tobytes()), byteorder="big")
+        image.entry = 4
+        sim = MipsSimulator(image, data=[10])
+        trace = sim.run()
+        assert sim.registers[9] == 55 and trace["PC"][0] == 4
+        assert trace["Inst"][0] == sum_program()[0]
+
+    def test_many_cycles(self):
+        """Long loops run in one call."""
+        sim = MipsSimulator(sum_program(), data=[50_000])
+        trace = sim.run(max_cycles=10_000_000)
+        assert len(trace) == 4 * 50_000 + 3
+        assert sim.registers[9] == 50_000 * 50_001 // 2
+
+
+class TestControlModels:
+    """Test the word models of the control blocks."""
+
+    def test_control_table(self):
+        """R-type, lw, sw and beq decode as in Figure 4.18."""
+        signals = control_signals(np.array([0x00, 0x23, 0x2B, 0x04]))
+        assert signals["RegDst"].tolist() == [1, 0, 0, 0]
+        assert signals["RegWrite"].tolist() == [1, 1, 0, 0]
+        assert signals["MemWrite"].tolist() == [0, 0, 1, 0]
+        assert signals["ALUOp"].tolist() == [2, 0, 0, 1]
+
+    def test_alu_control_table(self):
+        """ALUOp selects add, subtract or the function code's operation."""
+        codes = alu_control([0, 1, 2, 2, 3], [0x2A, 0x2A, 0x2A, 0x3F, 0x22])
+        assert codes.tolist() == [
+            AluOp.ADD,
+            AluOp.SUB,
+            AluOp.SLT,
+            INVALID_ALU_OP,
+            AluOp.SUB,
+        ]
+
+    def test_decode_instructions(self):
+        """Whole programs decode to fields and control columns at once."""
+        decoded = decode_instructions(sum_program())
+        assert decoded["Opcode"].tolist() == [0x23, 4, 0, 8, 4, 0x2B]
+        assert decoded["RegWrite"].tolist() == [1, 0, 1, 1, 0, 0]
+        assert decoded["WriteReg"].tolist() == [8, 0, 9, 8, 0, 9]
+        assert decoded["Imm"][3] == 0xFFFFFFFF
+        assert decoded["ALUControl"].tolist() == [
+            AluOp.ADD,
+            AluOp.SUB,
+            AluOp.ADD,
+            AluOp.ADD,
+            AluOp.SUB,
+            AluOp.ADD,
+        ]
+
+    def test_word_simulator(self):
+        """WordSimulator drives ALU Control from the Control unit."""
+        control, alu_control = ControlUnit(), AluControl()
+        netlist = Netlist(components=[control, alu_control])
+        netlist.connect(
+            control.get_output_by_label("ALUOp"),
+            alu_control.get_input_by_label("ALUOp"),
+        )
+        result = WordSimulator(netlist).evaluate(
+            {
+                control.get_input_by_label("inst[31:26]"): [0x00, 0x00, 0x04],
+                alu_control.get_input_by_label("inst[5:0]"): [0x22, 0x2A, 0x20],
+            }
+        )
+        decode = alu_control.get_output_by_label("decode")
+        assert result.value(decode).tolist() == [AluOp.SUB, AluOp.SLT, AluOp.SUB]
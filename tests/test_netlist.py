@@ -0,0 +1,130 @@
+"""
+Tests for netlist extraction.
+"""
+
+from manim import VGroup
+
+from logicedu.components.blocks import BranchLogic, Mux
+from logicedu.components.logic_gates import AND2, OR2
+from logicedu.core import (
+    ArbitrarySegmentLine,
+    ConnectorLine,
+    Netlist,
+    PinType,
+    PrototypeRegistry,
+)
+
+
+class TestNetlist:
+    """Test Netlist functionality."""
+
+    def test_pins_know_their_component(self):
+        """Test that components claim the pins they add."""
+        gate = AND2()
+        assert all(pin.owner is gate for pin in gate.pins)
+        assert gate.get_owned_pins() == gate.pins
+
+    def test_connected_pins_share_a_net(self):
+        """Test that a wire joins its pins into one net with one driver."""
+        a, b = AND2(), OR2()
+        wire = ConnectorLine(a.get_output_by_index(0), b.get_input_by_index(0))
+        netlist = Netlist(wires=[wire])
+        net = netlist.net_of(b.get_input_by_index(0))
+        assert net is netlist.net_of(a.get_output_by_index(0))
+        assert net.driver is a.get_output_by_index(0)
+        assert net.wires == [wire]
+        # Unconnected pins of both components get their own nets.
+        assert len(netlist.nets()) == 5
+
+    def test_arbitrary_segment_line_with_pins(self):
+        """Test that ArbitrarySegmentLine connections are recorded when pins are given."""
+        a, b = AND2(), OR2()
+        start = a.get_output_by_index(0)
+        end = b.get_input_by_index(1)
+        wire = ArbitrarySegmentLine(
+            start.dot.get_center(),
+            end.dot.get_center(),
+            start_pin=start,
+            end_pin=end,
+        )
+        netlist = Netlist(wires=[wire])
+        assert netlist.net_of(start) is netlist.net_of(end)
+
+    def test_copying_a_wire_keeps_pin_references(self):
+        """Test that copying a wire doesn't copy the components it connects."""
+        a, b = AND2(), OR2()
+        wire = ConnectorLine(a.get_output_by_index(0), b.get_input_by_index(0))
+        copied = wire.copy()
+        assert copied.start_pin is wire.start_pin
+        assert copied.end_pin is wire.end_pin
+
+    def test_copying_a_component_moves_pin_owner(self):
+        """Test that a copied component owns its copied pins."""
+        gate = AND2()
+        copied = gate.copy()
+        assert copied.get_input_by_index(0).owner is copied
+
+
+class TestNetlistRecording:
+    """Test recording and the indexed queries."""
+
+    def test_records_wires_made_inside_block(self):
+        """Test that wires created while the netlist is active are recorded."""
+        a, b, c = AND2(), OR2(), OR2()
+        outside = ConnectorLine(a.get_output_by_index(0), c.get_input_by_index(1))
+        with Netlist() as netlist:
+            wire1 = ConnectorLine(a.get_output_by_index(0), b.get_input_by_index(0))
+            wire2 = ConnectorLine(a.get_output_by_index(0), c.get_input_by_index(0))
+        assert netlist.wires() == [wire1, wire2]
+        assert outside not in netlist.wires()
+
+    def test_fanout_fanin_and_driver(self):
+        """Test fan-out, fan-in and driver queries."""
+        a, b, c = AND2(), OR2(), OR2()
+        out = a.get_output_by_index(0)
+        with Netlist() as netlist:
+            ConnectorLine(out, b.get_input_by_index(0))
+            ConnectorLine(out, c.get_input_by_index(1))
+        assert netlist.fanout(out) == [b.get_input_by_index(0), c.get_input_by_index(1)]
+        assert netlist.driver(c.get_input_by_index(1)) is out
+        assert netlist.fanin(b) == [out, None]
+        assert netlist.successors(a) == [b, c]
+        assert netlist.predecessors(c) == [a]
+        assert len(netlist.connected_pins(out)) == 3
+
+    def test_pin_lookup_by_label(self):
+        """Test that pins are indexed by component and label."""
+        mux = Mux()
+        netlist = Netlist(components=[mux])
+        assert netlist.pin(mux, "sel") is mux.get_input_by_label("sel")
+        assert netlist.pin(mux, "1", PinType.OUTPUT) is mux.get_output_by_index(0)
+        assert netlist.pin(mux, "missing") is None
+
+    def test_merging_nets(self):
+        """Test that joining two nets keeps every pin, driver and wire."""
+        a, b, c = AND2(), OR2(), OR2()
+        netlist = Netlist()
+        netlist.connect(b.get_input_by_index(0), c.get_input_by_index(0))
+        netlist.connect(a.get_output_by_index(0), c.get_input_by_index(0))
+        net = netlist.net_of(b.get_input_by_index(0))
+        assert net.driver is a.get_output_by_index(0)
+        assert len(net.loads) == 2
+        assert net in netlist.nets()
+
+    def test_from_mobjects(self):
+        """Test building a netlist from a group of scene objects."""
+        a, b = AND2(), OR2()
+        wire = ConnectorLine(a.get_output_by_index(0), b.get_input_by_index(0))
+        netlist = Netlist.from_mobjects(VGroup(a, b, wire))
+        assert netlist.components == [a, b]
+        assert netlist.wires() == [wire]
+
+    def test_cloned_components_record_inner_wires(self):
+        """Test that prototypes stay out of the netlist but their clones' wires don't."""
+        registry = PrototypeRegistry()
+        with Netlist() as netlist:
+            branch = registry.create(BranchLogic)
+        assert netlist.wires() == [branch.mux_sel_wire]
+        assert netlist.driver(branch.mux2.get_input_by_index(2)) is (
+            branch.and2.get_output_by_index(0)
+        )
@@ -0,0 +1,79 @@
+import copy
+
+from logicedu.components.blocks import RegisterFile
+from logicedu.components.logic_gates import AND2, INV
+from logicedu.core.basics import Pin, PinList, PinSide, PinType, VGroupLogicObjectBase
+
+
+def _pins():
+    return [
+        Pin(pin_side=PinSide.LEFT, pin_type=PinType.INPUT, label="A"),
+        Pin(pin_side=PinSide.LEFT, pin_type=PinType.INPUT, label="B"),
+        Pin(pin_side=PinSide.RIGHT, pin_type=PinType.OUTPUT, label="Y"),
+    ]
+
+
+class TestPinList:
+    def test_append_indexes_incrementally(self):
+        """Appended pins show up in the type lists and label dictionaries."""
+        a, b, y = _pins()
+        pins = PinList()
+        for pin in (a, b, y):
+            pins.append(pin)
+        assert pins.inputs == [a, b]
+        assert pins.outputs == [y]
+        assert pins.inputs_by_label == {"A": a, "B": b}
+        assert pins.outputs_by_label["Y"] is y
+
+    def test_other_mutations_reindex(self):
+        """Removing, inserting and replacing pins keep the indexes in sync."""
+        a, b, y = _pins()
+        pins = PinList([a, b, y])
+        pins.remove(a)
+        assert pins.inputs == [b]
+        assert "A" not in pins.by_label
+        pins.insert(0, a)
+        assert pins.inputs == [a, b]
+        pins[2] = a
+        assert pins.outputs == []
+
+    def test_first_label_wins(self):
+        """Duplicate labels resolve to the first pin, as the linear search did."""
+        first = Pin(pin_side=PinSide.LEFT, pin_type=PinType.INPUT, label="0")
+        second = Pin(pin_side=PinSide.RIGHT, pin_type=PinType.OUTPUT, label="0")
+        pins = PinList([first, second])
+        assert pins.by_label["0"] is first
+        assert pins.outputs_by_label["0"] is second
+
+    def test_deepcopy_keeps_indexes(self):
+        """Copied components get a PinList indexing the copied pins."""
+        gate = AND2()
+        copied = copy.deepcopy(gate)
+        assert isinstance(copied.pins, PinList)
+        assert copied.get_input_by_index(0) is copied.pins[0]
+        assert copied.get_input_by_index(0) is not gate.get_input_by_index(0)
+
+
+class TestComponentLookup:
+    def test_plain_list_assignment_is_wrapped(self):
+        """Assigning a plain list to pins still gives indexed lookups."""
+        obj = VGroupLogicObjectBase()
+        obj.pins = _pins()
+        assert isinstance(obj.pins, PinList)
+        assert obj.get_input_count() == 2
+        assert obj.get_output_by_label("Y") is obj.pins[2]
+
+    def test_get_pins_bulk(self):
+        """get_pins returns pins in label order, with None for unknown labels."""
+        regfile = RegisterFile()
+        read1, write, missing = regfile.get_pins(
+            ["ReadReg1", "WriteReg", "nope"], PinType.INPUT
+        )
+        assert read1 is regfile.get_input_by_label("ReadReg1")
+        assert write is regfile.get_input_by_label("WriteReg")
+        assert missing is None
+
+    def test_gate_counts(self):
+        """Gates use the shared indexes for their counts."""
+        assert AND2().get_input_count() == 2
+        assert INV().get_output_count() == 1
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+from manim import Text
+
+from logicedu.components.blocks import GenRectangle
+from logicedu.components.logic_gates import AND2, BinaryLogic, ShapeFactory
+from logicedu.core.basics import ConnectorLine, Pin
+from logicedu.utils.profiling import ConstructionProfiler
+
+
+class TestConstructionProfiler:
+    def test_records_classes_and_phases(self):
+        """Component constructors and manim phases are timed and counted."""
+        ShapeFactory._shapes.clear()
+        with ConstructionProfiler() as profiler:
+            a = AND2()
+            b = AND2()
+            ConnectorLine(a.get_output_by_index(0), b.get_input_by_index(0))
+        assert profiler.objects["AND2"] == 2
+        assert profiler.objects["Pin"] == 6
+        assert profiler.objects["ConnectorLine"] == 1
+        assert profiler.stats["BinaryLogic.__init__"].calls == 2
+        assert profiler.stats["Pin.__init__"].calls == 6
+        # The gate body is built once and copied for the second gate.
+        assert profiler.stats["ArcPolygon.__init__"].calls == 1
+        stat = profiler.stats["BinaryLogic.__init__"]
+        assert 0 < stat.self_s <= stat.total_s
+
+    def test_patches_are_removed(self):
+        """Leaving the context restores the original methods."""
+        originals = (Pin.__init__, BinaryLogic.__init__, Text.__init__)
+        with ConstructionProfiler():
+            assert Pin.__init__ is not originals[0]
+        assert (Pin.__init__, BinaryLogic.__init__, Text.__init__) == originals
+
+    def test_selected_classes(self):
+        """Only the given classes and phases are timed."""
+        with ConstructionProfiler(classes=[GenRectangle], phases=[]) as profiler:
+            AND2()
+        assert profiler.stats == {}
+
+    def test_collapsed_stacks(self, tmp_path):
+        """Collapsed output nests pins under the gate that builds them."""
+        with ConstructionProfiler() as profiler:
+            AND2()
+        path = tmp_path / "profile.folded"
+        profiler.write_collapsed(str(path))
+        lines = path.read_text().splitlines()
+        assert any(
+            line.startswith("AND2.__init__;BinaryLogic.__init__;")
+            and "Pin.__init__" in line
+            for line in lines
+        )
+        for line in lines:
+            stack, value = line.rsplit(" ", 1)
+            assert int(value) > 0 and stack
+
+    def test_report(self):
+        """The report lists functions and object counts."""
+        with ConstructionProfiler() as profiler:
+            AND2()
+        report = profiler.report(limit=3)
+        assert "calls" in report and "AND2" in report
+
+    def test_env_var(self, tmp_path):
+        """LOGICEDU_PROFILE writes a collapsed profile when the run exits."""
+        path = tmp_path / "run.folded"
+        env = dict(os.environ, LOGICEDU_PROFILE=str(path))
+        subprocess.run(
+            [sys.executable, "-c", "import logicedu; logicedu.AND2()"],
+            check=True,
+            env=env,
+            capture_output=True,
+        )
+        assert "Pin.__init__" in path.read_text()
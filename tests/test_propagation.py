@@ -0,0 +1,83 @@
+"""
+Tests for signal timing and the propagation animation.
+"""
+
+import pytest
+from manim import LEFT, RIGHT, UP
+
+from logicedu.components.logic_gates import AND2, INV
+from logicedu.core import ConnectorLine, Netlist
+from logicedu.simulation import (
+    DelayModel,
+    LogicSimulator,
+    Op,
+    SignalPropagation,
+    arrival_times,
+)
+
+
+def inverter_chain():
+    inv = INV().shift(LEFT * 3)
+    and_ = AND2().shift(RIGHT * 3 + UP)
+    wire = ConnectorLine(
+        inv.get_output_by_index(0), and_.get_input_by_index(0), manhatten=True
+    )
+    return inv, and_, wire, Netlist(wires=[wire], components=[inv, and_])
+
+
+class TestArrivalTimes:
+    """Test arrival time propagation."""
+
+    def test_gate_and_wire_delays(self):
+        """Test that a gate's output waits for its inputs' wires."""
+        inv, and_, wire, netlist = inverter_chain()
+        model = DelayModel(gate_delays={Op.INV: 1.0, Op.AND: 2.0}, wire_delay=0.5)
+        timing = arrival_times(netlist, model)
+        inv_out = timing.arrival(inv.get_output_by_index(0))
+        assert inv_out == pytest.approx(1.0)
+        expected = inv_out + timing.wire_delay(wire)
+        assert timing.pin_arrival(and_.get_input_by_index(0)) == pytest.approx(expected)
+        assert timing.arrival(and_.get_output_by_index(0)) == pytest.approx(
+            expected + 2.0
+        )
+        assert timing.total == pytest.approx(expected + 2.0)
+
+    def test_input_times(self):
+        """Test that circuit inputs can switch late."""
+        inv, and_, _, netlist = inverter_chain()
+        timing = arrival_times(
+            netlist, DelayModel(wire_delay=0), {and_.get_input_by_index(1): 10}
+        )
+        assert timing.arrival(and_.get_output_by_index(0)) == pytest.approx(11.5)
+
+
+class TestSignalPropagation:
+    """Test the batched propagation animation."""
+
+    def test_segments_fill_in_order(self):
+        """Test that segments light up one after another along the wire."""
+        _, _, wire, netlist = inverter_chain()
+        animation = SignalPropagation(arrival_times(netlist))
+        assert len(animation.overlays) == len(animation.starts) == 3
+        assert list(animation.starts[1:]) == pytest.approx(list(animation.ends[:-1]))
+
+        animation.begin()
+        for overlay in animation.overlays:
+            assert overlay.get_length() == pytest.approx(0)
+        middle = (animation.starts[1] + animation.ends[1]) / 2
+        animation.interpolate(middle / animation.total_time)
+        lengths = [overlay.get_length() for overlay in animation.overlays]
+        assert lengths[0] == pytest.approx(animation.sources[0].get_length())
+        assert lengths[1] == pytest.approx(animation.sources[1].get_length() / 2)
+        assert lengths[2] == pytest.approx(0)
+
+    def test_colors_follow_values(self):
+        """Test that a simulation result picks the wire color."""
+        inv, and_, _, netlist = inverter_chain()
+        result = LogicSimulator(netlist).evaluate(
+            {inv.get_input_by_index(0): 0, and_.get_input_by_index(1): 0}
+        )
+        animation = SignalPropagation(
+            arrival_times(netlist), result, high_color="#FF0000", low_color="#0000FF"
+        )
+        assert animation.overlays[0].get_stroke_color().to_hex() == "#FF0000"
@@ -0,0 +1,52 @@
+"""
+Tests for the prototype registry.
+"""
+
+import numpy as np
+from manim import BLUE, RIGHT
+
+from logicedu.components.blocks import DFF, DFFVariant, Mux
+from logicedu.components.logic_gates import AND2
+from logicedu.core import PrototypeRegistry
+
+
+class TestPrototypeRegistry:
+    """Test PrototypeRegistry functionality."""
+
+    def test_clones_share_geometry(self):
+        """Test that clones match a freshly constructed component."""
+        registry = PrototypeRegistry()
+        first = registry.create(AND2, color=BLUE)
+        second = registry.create(AND2, color=BLUE)
+        fresh = AND2(color=BLUE)
+        assert registry.info().hits == 1
+        assert registry.info().misses == 1
+        assert np.allclose(second.get_center(), fresh.get_center())
+        assert first is not second
+
+    def test_clones_are_independent(self):
+        """Test that moving a clone doesn't move other clones or their pins."""
+        registry = PrototypeRegistry()
+        first = registry.create(Mux, num_inputs=4)
+        second = registry.create(Mux, num_inputs=4)
+        first.shift(RIGHT * 2)
+        assert not np.allclose(first.get_center(), second.get_center())
+        # Pins in the clone refer to the clone's own submobjects.
+        assert first.get_output_by_index(0) in first.submobjects
+        assert first.get_output_by_index(0) is not second.get_output_by_index(0)
+
+    def test_kwargs_are_part_of_key(self):
+        """Test that different constructor arguments build different prototypes."""
+        registry = PrototypeRegistry()
+        registry.create(DFF, variant=DFFVariant.DFF)
+        registry.create(DFF, variant=DFFVariant.DFF_R)
+        registry.create(DFF, variant=DFFVariant.DFF_R)
+        assert registry.info().misses == 2
+        assert registry.info().hits == 1
+
+    def test_lru_eviction(self):
+        """Test that the registry keeps at most maxsize prototypes."""
+        registry = PrototypeRegistry(maxsize=1)
+        registry.create(Mux, num_inputs=2)
+        registry.create(Mux, num_inputs=3)
+        assert len(registry) == 1
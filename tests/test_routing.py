@@ -0,0 +1,224 @@
+import numpy as np
+import pytest
+from manim import DOWN, LEFT, RIGHT, UP
+
+from logicedu.components.logic_gates import AND2, OR2
+from logicedu.core.basics import ArbitrarySegmentLine
+from logicedu.core.netlist import Netlist
+from logicedu.core.routing import Router, RoutingGrid, _cells_between, route_all
+
+
+def _is_manhattan(vertices):
+    return all(
+        np.isclose(a[0], b[0]) or np.isclose(a[1], b[1])
+        for a, b in zip(vertices, vertices[1:])
+    )
+
+
+class TestRoutingGrid:
+    def test_block_box(self):
+        """Cells inside a box, plus the margin, are blocked."""
+        grid = RoutingGrid()
+        grid.block_box((0, 0, 0), (0.2, 0.1, 0), margin=1)
+        assert (-1, -1) in grid.blocked
+        assert (3, 2) in grid.blocked
+        assert (4, 0) not in grid.blocked
+        assert grid.bounds == (-1, -1, 3, 2)
+
+    def test_component_pin_ends_stay_open(self):
+        """A component's body and pin lines are blocked, its pin ends are not."""
+        gate = AND2()
+        grid = RoutingGrid()
+        grid.add_obstacle(gate)
+        assert grid.to_cell(gate.get_center()) in grid.blocked
+        for pin in gate.pins:
+            assert grid.to_cell(pin.line.get_end()) not in grid.blocked
+            assert grid.to_cell(pin.line.get_start()) in grid.blocked
+
+    def test_remove_path(self):
+        """Ripping up a path clears its wire usage."""
+        grid = RoutingGrid()
+        cells = [(0, 0), (1, 0), (1, 1)]
+        grid.add_path(cells, net="a")
+        assert grid.usage((1, 0)) == 2
+        grid.remove_path(cells, net="a")
+        assert grid.usage((1, 0)) == 0
+
+    def test_remove_branch(self):
+        """Removing one branch of a net keeps the runs it shares with another."""
+        grid = RoutingGrid()
+        trunk = [(0, 0), (1, 0), (2, 0), (3, 0)]
+        grid.add_path(trunk + [(3, 1)], net="n")
+        grid.add_path(trunk + [(3, -1)], net="n")
+        grid.remove_path(trunk + [(3, -1)], net="n")
+        assert grid.wires_at((1, 0), 0) == {"n"}
+        assert grid.overlaps(trunk, "m") == trunk
+        assert grid.wires_at((3, -1), 1) == set()
+
+
+class TestRouter:
+    def test_straight_route(self):
+        """An unobstructed horizontal route is a single segment."""
+        vertices = Router().route((0, 0, 0), (1, 0, 0))
+        assert len(vertices) == 2
+
+    def test_routes_around_obstacle(self):
+        """Paths detour around blocked cells with as few bends as possible."""
+        router = Router()
+        router.grid.block_box((0.4, -0.5, 0), (0.6, 0.5, 0))
+        cells = router.find_path((0, 0), (10, 0))
+        assert not set(cells) & router.grid.blocked
+        assert cells[0] == (0, 0) and cells[-1] == (10, 0)
+        vertices = router.route((0, 0, 0), (1, 0, 0), commit=False)
+        assert len(vertices) == 4
+        assert _is_manhattan(vertices)
+
+    def test_avoids_crossing_other_nets(self):
+        """A route prefers a detour to crossing another net's wire."""
+        router = Router(crossing_cost=50)
+        router.grid.add_path([(5, y) for y in range(-3, 4)], net="other")
+        cells = router.find_path((0, 0), (10, 0), net="mine")
+        crossed = [cell for cell in cells if router.grid.wires_at(cell, 1)]
+        assert crossed == []
+
+    def test_same_net_overlap_is_free(self):
+        """Wires of the same net may share cells without penalty."""
+        router = Router()
+        router.grid.add_path([(x, 0) for x in range(0, 11)], net="n")
+        cells = router.find_path((0, 0), (10, 0), net="n")
+        assert len(cells) == 11
+
+    def test_no_route(self):
+        """A walled-in endpoint raises ValueError."""
+        router = Router()
+        for cell in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            router.grid.blocked.add(cell)
+        with pytest.raises(ValueError, match="No route"):
+            router.find_path((0, 0), (5, 5))
+
+    @pytest.mark.parametrize(
+        "offset", [(0, 0.03), (0, -0.04), (0.5, 0.03), (0.02, 0.87), (-0.03, -0.61)]
+    )
+    def test_off_lattice_pins(self, offset):
+        """Pins off the lattice are joined by axis-aligned segments only."""
+        and_gate = AND2().shift(UP * 0.4 - AND2().get_output_by_index(0).line.get_end())
+        or_gate = OR2()
+        or_gate.shift(
+            and_gate.get_output_by_index(0).line.get_end()
+            + RIGHT * 0.8
+            + np.array([*offset, 0])
+            - or_gate.get_input_by_index(0).line.get_end()
+        )
+        router = Router()
+        start = and_gate.get_output_by_index(0)
+        end = or_gate.get_input_by_index(0)
+        vertices = router.route_pins(start, end)
+        assert np.allclose(vertices[0], start.line.get_end())
+        assert np.allclose(vertices[-1], end.line.get_end())
+        assert _is_manhattan(vertices)
+
+    def test_connect_pins(self):
+        """connect() routes between pins head-on and records the pins on the wire."""
+        and_gate = AND2().shift(LEFT * 4)
+        or_gate = OR2().shift(RIGHT * 4 + UP)
+        router = Router()
+        router.grid.add_obstacles(and_gate, or_gate)
+        start = and_gate.get_output_by_index(0)
+        end = or_gate.get_input_by_index(0)
+        wire = router.connect(start, end)
+        assert isinstance(wire, ArbitrarySegmentLine)
+        assert wire.start_pin is start and wire.end_pin is end
+        assert np.allclose(wire.vertices[0], start.line.get_end())
+        assert np.allclose(wire.vertices[-1], end.line.get_end())
+        assert _is_manhattan(wire.vertices)
+        # Leaves the output to the right and enters the input from the left.
+        assert wire.vertices[1][0] > wire.vertices[0][0]
+        assert wire.vertices[-2][0] < wire.vertices[-1][0]
+
+
+class TestRouteAll:
+    def _parallel_gates(self):
+        sources = [AND2().shift(LEFT * 4 + UP * y) for y in (1.5, 0, -1.5)]
+        sinks = [OR2().shift(RIGHT * 4 + UP * y) for y in (-1.5, 0, 1.5)]
+        return sources, sinks
+
+    def test_routes_pending_connections(self):
+        """Every pending connection gets a wire attached in the netlist."""
+        sources, sinks = self._parallel_gates()
+        netlist = Netlist()
+        for source, sink in zip(sources, sinks):
+            netlist.connect(source.get_output_by_index(0), sink.get_input_by_index(0))
+        wires = route_all(netlist)
+        assert len(wires) == 3
+        assert netlist.pending_connections() == []
+        assert netlist.wires() == wires
+        for wire, (start, end, attached) in zip(wires, netlist.connections):
+            assert attached is wire
+            assert wire.start_pin is start and wire.end_pin is end
+            assert _is_manhattan(wire.vertices)
+            assert wire in netlist.net_of(start).wires
+
+    def test_nets_do_not_overlap(self):
+        """Crossing wires of different nets never share a run."""
+        sources, sinks = self._parallel_gates()
+        netlist = Netlist()
+        for source, sink in zip(sources, sinks):
+            netlist.connect(source.get_output_by_index(0), sink.get_input_by_index(0))
+        router = Router()
+        wires = route_all(netlist, router)
+        grid = router.grid
+        for wire in wires:
+            cells = [grid.to_cell(vertex) for vertex in wire.vertices]
+            path = [cells[0]]
+            for a, b in zip(cells, cells[1:]):
+                path.extend(_cells_between(a, b)[1:])
+            assert grid.overlaps(path, netlist.net_of(wire.start_pin)) == []
+
+    def test_rip_up_keeps_fan_out_siblings(self):
+        """Ripping up one branch of a net leaves the runs of its other branches."""
+        source = AND2().shift(LEFT * 4)
+        near, far = OR2().shift(RIGHT * 4 + UP * 1.5), OR2().shift(RIGHT * 4 + DOWN)
+        # Another net leaves from right in front of the far branch's pin, so that
+        # branch is ripped up on every pass.
+        blocker = AND2()
+        blocker.shift(
+            far.get_input_by_index(0).line.get_end()
+            + LEFT * 0.1
+            - blocker.get_output_by_index(0).line.get_end()
+        )
+        netlist = Netlist()
+        netlist.connect(source.get_output_by_index(0), near.get_input_by_index(0))
+        netlist.connect(source.get_output_by_index(0), far.get_input_by_index(0))
+        netlist.connect(
+            blocker.get_output_by_index(0),
+            OR2().shift(RIGHT * 4 + DOWN * 4).get_input_by_index(0),
+        )
+        net = netlist.net_of(source.get_output_by_index(0))
+        router = Router()
+        grid = router.grid
+        remove_path = grid.remove_path
+        after_rip_up = []
+
+        def spy(cells, ripped=None):
+            remove_path(cells, ripped)
+            if ripped is net:
+                after_rip_up.append({key: set(n) for key, n in grid._wires.items()})
+
+        grid.remove_path = spy
+        wires = route_all(netlist, router)
+        assert after_rip_up
+        vertices = [grid.to_cell(vertex) for vertex in wires[0].vertices]
+        for a, b in zip(vertices, vertices[1:]):
+            axis = 0 if a[1] == b[1] else 1
+            for x, y in _cells_between(a, b):
+                assert all(net in runs[(x, y, axis)] for runs in after_rip_up)
+
+    def test_recording_netlist_does_not_duplicate(self):
+        """Routing inside a recording block attaches wires without new connections."""
+        sources, sinks = self._parallel_gates()
+        with Netlist() as netlist:
+            netlist.connect(
+                sources[0].get_output_by_index(0), sinks[0].get_input_by_index(0)
+            )
+            route_all(netlist)
+        assert len(netlist.connections) == 1
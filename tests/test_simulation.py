@@ -0,0 +1,128 @@
+"""
+Tests for the gate-level simulator.
+"""
+
+import numpy as np
+import pytest
+
+from logicedu.components.blocks import Mux
+from logicedu.components.logic_gates import AND2, INV, NAND2, OR2, XNOR2, XOR2
+from logicedu.core import ConnectorLine, Netlist
+from logicedu.simulation import (
+    EventSimulator,
+    LogicSimulator,
+    compile_netlist,
+    pack_bits,
+    unpack_bits,
+)
+
+
+def half_adder():
+    xor, and_ = XOR2(), AND2()
+    wires = [
+        ConnectorLine(xor.get_input_by_index(0), and_.get_input_by_index(0)),
+        ConnectorLine(xor.get_input_by_index(1), and_.get_input_by_index(1)),
+    ]
+    return xor, and_, Netlist(wires=wires, components=[xor, and_])
+
+
+class TestLogicSimulator:
+    """Test LogicSimulator functionality."""
+
+    @pytest.mark.parametrize(
+        "gate_class, expected",
+        [
+            (AND2, [0, 0, 0, 1]),
+            (NAND2, [1, 1, 1, 0]),
+            (OR2, [0, 1, 1, 1]),
+            (XOR2, [0, 1, 1, 0]),
+            (XNOR2, [1, 0, 0, 1]),
+        ],
+    )
+    def test_gate_functions(self, gate_class, expected):
+        """Test each two-input gate against its truth table."""
+        gate = gate_class()
+        sim = LogicSimulator(Netlist(components=[gate]))
+        result = sim.evaluate(
+            {
+                gate.get_input_by_index(0): [0, 1, 0, 1],
+                gate.get_input_by_index(1): [0, 0, 1, 1],
+            }
+        )
+        assert result.value(gate.get_output_by_index(0)).tolist() == expected
+
+    def test_half_adder(self):
+        """Test a small circuit against NumPy on many random vectors."""
+        xor, and_, netlist = half_adder()
+        rng = np.random.default_rng(0)
+        a, b = rng.integers(0, 2, (2, 1000)).astype(bool)
+        result = LogicSimulator(netlist).evaluate(
+            {xor.get_input_by_index(0): a, xor.get_input_by_index(1): b}
+        )
+        assert np.array_equal(result.value(xor.get_output_by_index(0)), a ^ b)
+        assert np.array_equal(result.value(and_.get_output_by_index(0)), a & b)
+
+    def test_levels_and_mux(self):
+        """Test that gates are levelized and a Mux selects its inputs."""
+        inv, mux = INV(), Mux()
+        wire = ConnectorLine(inv.get_output_by_index(0), mux.get_input_by_index(1))
+        sim = LogicSimulator(Netlist(wires=[wire], components=[inv, mux]))
+        assert [gate.level for gate in sim.gates] == [0, 1]
+        result = sim.evaluate(
+            {
+                inv.get_input_by_index(0): 0,
+                mux.get_input_by_index(0): 0,
+                mux.get_input_by_index(2): [0, 1],
+            }
+        )
+        assert result.value(mux.get_output_by_index(0)).tolist() == [False, True]
+
+    def test_wide_mux_is_an_input(self):
+        """Test that a Mux with more than 2 inputs drives a circuit input."""
+        mux, inv = Mux(num_inputs=5), INV()
+        wire = ConnectorLine(mux.get_output_by_index(0), inv.get_input_by_index(0))
+        netlist = Netlist(wires=[wire], components=[mux, inv])
+        for sim in (LogicSimulator(netlist), compile_netlist(netlist)):
+            result = sim.evaluate({mux.get_output_by_index(0): [0, 1]})
+            assert result.value(inv.get_output_by_index(0)).tolist() == [True, False]
+        events = EventSimulator(netlist)
+        events.set({mux.get_output_by_index(0): 1})
+        events.run()
+        assert events.value(inv.get_output_by_index(0)) == 0
+
+    def test_missing_input(self):
+        """Test that every circuit input must be given a value."""
+        gate = AND2()
+        sim = LogicSimulator(Netlist(components=[gate]))
+        with pytest.raises(ValueError, match="No values given"):
+            sim.evaluate({gate.get_input_by_index(0): 1})
+
+    def test_combinational_loop(self):
+        """Test that loops are reported."""
+        a, b = AND2(), AND2()
+        wires = [
+            ConnectorLine(a.get_output_by_index(0), b.get_input_by_index(0)),
+            ConnectorLine(b.get_output_by_index(0), a.get_input_by_index(0)),
+        ]
+        with pytest.raises(ValueError, match="combinational loop"):
+            LogicSimulator(Netlist(wires=wires))
+
+    def test_wire_colors(self):
+        """Test that wires take the value of their net."""
+        xor, and_, netlist = half_adder()
+        result = LogicSimulator(netlist).evaluate(
+            {xor.get_input_by_index(0): [1, 0], xor.get_input_by_index(1): [1, 1]}
+        )
+        assert set(result.wire_values(0).values()) == {True}
+        assert set(result.wire_values(1).values()) == {False, True}
+
+
+class TestBitPacking:
+    """Test pack_bits/unpack_bits."""
+
+    def test_round_trip(self):
+        bits = np.random.default_rng(1).integers(0, 2, 200).astype(bool)
+        words = pack_bits(bits)
+        assert words.dtype == np.uint64
+        assert len(words) == 4
+        assert np.array_equal(unpack_bits(words, 200), bits)
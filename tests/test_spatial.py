@@ -0,0 +1,120 @@
+import numpy as np
+from manim import DOWN, LEFT, ORIGIN, RIGHT, UP, VGroup
+
+from logicedu.components.logic_gates import AND2, OR2
+from logicedu.core.basics import ConnectorLine
+from logicedu.core.spatial import EntryKind, SpatialIndex
+
+
+def _scene():
+    and_gate = AND2().shift(LEFT * 3)
+    or_gate = OR2().shift(RIGHT * 3)
+    wire = ConnectorLine(
+        and_gate.get_output_by_index(0), or_gate.get_input_by_index(0), manhatten=True
+    )
+    return and_gate, or_gate, wire
+
+
+class TestSpatialIndex:
+    def test_add_indexes_components_pins_and_wires(self):
+        """Groups are searched for components, their pins and wires."""
+        and_gate, or_gate, wire = _scene()
+        index = SpatialIndex(VGroup(and_gate, or_gate, wire))
+        assert and_gate in index and or_gate in index and wire in index
+        assert all(pin in index for pin in and_gate.pins)
+        assert len(index) == 2 + 6 + 1
+
+    def test_query_box(self):
+        """Box queries return the items inside, filtered by kind."""
+        and_gate, or_gate, wire = _scene()
+        index = SpatialIndex(and_gate, or_gate, wire)
+        found = index.query_box(
+            LEFT * 4 + DOWN, LEFT * 2 + UP, kind=EntryKind.COMPONENT
+        )
+        assert found == [and_gate]
+        assert wire in index.query_point(wire.line[1].get_center(), tolerance=0.01)
+
+    def test_nearest_pin(self):
+        """nearest_pin and snap_to_pin find the closest pin end within range."""
+        and_gate, or_gate, _ = _scene()
+        index = SpatialIndex(and_gate, or_gate)
+        target = or_gate.get_input_by_index(1)
+        point = target.line.get_end() + np.array([0.05, -0.02, 0])
+        assert index.nearest_pin(point) is target
+        assert np.allclose(index.snap_to_pin(point), target.line.get_end())
+        far = np.array([0, 3, 0])
+        assert index.nearest_pin(far, max_distance=0.5) is None
+        assert np.allclose(index.snap_to_pin(far), far)
+        assert index.nearest_pin(far) is not None
+
+    def test_nearest_pin_ignores_far_wires(self):
+        """Wires far away don't widen the search for pins."""
+        and_gate, or_gate, _ = _scene()
+        far = ConnectorLine(
+            or_gate.get_output_by_index(0), AND2().shift(RIGHT * 5000).pins[0]
+        )
+        index = SpatialIndex(and_gate, far)
+        rings = []
+        ring = index._ring
+        index._ring = lambda *args: rings.append(args) or ring(*args)
+        target = and_gate.get_input_by_index(0)
+        assert index.nearest_pin(target.line.get_end() + UP * 0.01) is target
+        index.remove(and_gate)
+        assert index.nearest_pin(ORIGIN) is None
+        assert len(rings) < 10
+
+    def test_nearest_pin_matches_brute_force(self):
+        """The search finds the closest of many scattered pins."""
+        places = [(0, 0), (40, 3), (-7, 90)]
+        gates = [AND2().shift(RIGHT * x + UP * y) for x, y in places]
+        index = SpatialIndex(*gates)
+        pins = [pin for gate in gates for pin in gate.pins]
+        rng = np.random.default_rng(0)
+        for point in rng.uniform(-100, 100, (50, 3)):
+            point[2] = 0
+            closest = min(pins, key=lambda p: np.linalg.norm(p.line.get_end() - point))
+            assert index.nearest_pin(point) is closest
+
+    def test_tracks_moves(self):
+        """Shifting or scaling a component re-buckets it and its pins."""
+        and_gate, or_gate, _ = _scene()
+        index = SpatialIndex(and_gate, or_gate)
+        and_gate.shift(UP * 3)
+        assert index.query_point(and_gate.get_center(), kind=EntryKind.COMPONENT) == [
+            and_gate
+        ]
+        assert index.query_point(LEFT * 3 + RIGHT * 0.5, kind=EntryKind.COMPONENT) == []
+        pin = and_gate.get_input_by_index(0)
+        assert index.nearest_pin(pin.line.get_end()) is pin
+        point = or_gate[0].get_right() + RIGHT * 0.3
+        assert index.query_point(point, kind=EntryKind.COMPONENT) == []
+        or_gate.scale(2)
+        assert index.query_point(point, kind=EntryKind.COMPONENT) == [or_gate]
+
+    def test_refresh_after_group_move(self):
+        """Moves through a plain VGroup are picked up by refresh()."""
+        and_gate, or_gate, _ = _scene()
+        index = SpatialIndex(and_gate, or_gate)
+        VGroup(and_gate, or_gate).shift(DOWN * 3)
+        index.refresh()
+        assert index.query_point(or_gate.get_center()) == [or_gate]
+
+    def test_overlaps(self):
+        """Overlapping components and wires over blocks are detected."""
+        and_gate, or_gate, wire = _scene()
+        index = SpatialIndex(and_gate, or_gate, wire)
+        assert index.overlaps() == []
+        third = AND2().move_to(or_gate).shift(RIGHT * 0.3)
+        index.add(third)
+        pairs = index.overlaps()
+        assert len(pairs) == 1 and set(map(id, pairs[0])) == {id(or_gate), id(third)}
+        assert index.overlapping(third, kind=EntryKind.COMPONENT) == [or_gate]
+
+    def test_remove(self):
+        """Removed components take their pins with them."""
+        and_gate, or_gate, _ = _scene()
+        index = SpatialIndex(and_gate, or_gate)
+        index.remove(and_gate)
+        assert and_gate not in index
+        assert and_gate.get_output_by_index(0) not in index
+        assert index.query_point(and_gate.get_center()) == []
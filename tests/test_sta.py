@@ -0,0 +1,103 @@
+"""
+Tests for static timing analysis.
+"""
+
+import numpy as np
+import pytest
+from manim import RED, RIGHT, UP
+
+from logicedu.components.blocks import ALUZ, DFF, RegisterFile
+from logicedu.components.logic_gates import AND2, INV
+from logicedu.core import ConnectorLine, Netlist
+from logicedu.simulation import DelayModel, Op, SignalPropagation, analyze_timing
+
+MODEL = DelayModel(
+    gate_delays={Op.INV: 1.0, Op.AND: 2.0},
+    component_delays={DFF: 3.0, ALUZ: 20.0, RegisterFile: 10.0},
+    wire_delay=0,
+    setup_time=1.0,
+)
+
+
+def connect(netlist, start, end):
+    wire = ConnectorLine(start, end)
+    netlist.add_wire(wire)
+    return wire
+
+
+def register_chain(pipelined=False):
+    """DFF -> INV -> INV -> AND2 -> DFF, optionally with a DFF after the first INV."""
+    launch, capture = DFF(), DFF().shift(RIGHT * 12)
+    inv1, inv2 = INV().shift(RIGHT * 2), INV().shift(RIGHT * 6)
+    and_ = AND2().shift(RIGHT * 9)
+    netlist = Netlist(components=[launch, inv1, inv2, and_, capture])
+    connect(netlist, launch.get_output_by_index(0), inv1.get_input_by_index(0))
+    if pipelined:
+        stage = DFF().shift(RIGHT * 4 + UP * 3)
+        netlist.add_component(stage)
+        connect(netlist, inv1.get_output_by_index(0), stage.get_input_by_index(0))
+        connect(netlist, stage.get_output_by_index(0), inv2.get_input_by_index(0))
+    else:
+        connect(netlist, inv1.get_output_by_index(0), inv2.get_input_by_index(0))
+    connect(netlist, inv2.get_output_by_index(0), and_.get_input_by_index(0))
+    connect(netlist, and_.get_output_by_index(0), capture.get_input_by_index(0))
+    return netlist, (launch, inv1, inv2, and_, capture)
+
+
+class TestAnalyzeTiming:
+    """Test arrival, required times and the critical path."""
+
+    def test_register_to_register(self):
+        """Test the clock period of a path between two registers."""
+        netlist, (launch, inv1, inv2, and_, capture) = register_chain()
+        report = analyze_timing(netlist, MODEL)
+        # clock-to-Q 3, INV 1, INV 1, AND 2, setup 1
+        assert report.critical_delay == pytest.approx(8.0)
+        assert report.worst_slack == pytest.approx(0.0)
+        assert [arc.component for arc in report.critical_path] == [inv1, inv2, and_]
+        assert report.endpoint is capture.get_input_by_index(0)
+
+    def test_pipelining_shortens_the_period(self):
+        """Test that a register in the middle splits the path."""
+        netlist, _ = register_chain(pipelined=True)
+        report = analyze_timing(netlist, MODEL)
+        assert report.critical_delay == pytest.approx(3 + 1 + 2 + 1)
+
+    def test_slack_against_clock_period(self):
+        """Test that off-critical nets have positive slack."""
+        netlist, (_, _, _, and_, _) = register_chain()
+        report = analyze_timing(netlist, MODEL, clock_period=10.0)
+        assert report.worst_slack == pytest.approx(2.0)
+        # The AND's second input comes straight from a circuit input at time 0.
+        assert report.net_slack(and_.get_input_by_index(1)) == pytest.approx(10 - 1 - 2)
+        assert np.all(report.slack >= report.worst_slack)
+
+    def test_register_file_write_port_is_an_endpoint(self):
+        """Test that feeding the ALU result back to WriteData is not a loop."""
+        regfile, alu = RegisterFile(), ALUZ().shift(RIGHT * 5)
+        netlist = Netlist(components=[regfile, alu])
+        read_data = regfile.get_output_by_label("ReadData1")
+        write_data = regfile.get_input_by_label("WriteData")
+        connect(netlist, read_data, alu.get_input_by_index(0))
+        connect(netlist, alu.get_output_by_index(0), write_data)
+        report = analyze_timing(netlist, MODEL)
+        assert report.critical_delay == pytest.approx(10 + 20 + 1)
+        assert [arc.component for arc in report.critical_path] == [regfile, alu]
+
+    def test_combinational_loop(self):
+        """Test that a loop without a register is reported."""
+        inv1, inv2 = INV(), INV().shift(RIGHT * 3)
+        netlist = Netlist(components=[inv1, inv2])
+        connect(netlist, inv1.get_output_by_index(0), inv2.get_input_by_index(0))
+        connect(netlist, inv2.get_output_by_index(0), inv1.get_input_by_index(0))
+        with pytest.raises(ValueError, match="combinational loop"):
+            analyze_timing(netlist, MODEL)
+
+    def test_highlight_and_propagation(self):
+        """Test that the critical path can be colored and animated."""
+        netlist, (launch, inv1, _, _, capture) = register_chain()
+        report = analyze_timing(netlist, MODEL)
+        path = report.highlight(RED)
+        assert launch in path and capture in path and inv1 in path
+        assert len(path) == 5 + 4
+        assert len(SignalPropagation(report).overlays) == 4
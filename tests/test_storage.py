@@ -0,0 +1,247 @@
+"""
+Tests for register file and memory storage.
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from logicedu.components.blocks import DataMemory, InstructionMemory, RegisterFile
+from logicedu.components.storage import MemoryStorage, RegisterStorage, load_image
+from logicedu.core import Netlist
+from logicedu.core.prototypes import clone
+from logicedu.simulation import MipsSimulator, WordSimulator, encode_instruction
+
+
+class TestRegisterStorage:
+    """Test reading and writing registers."""
+
+    def test_read_write(self):
+        """Writes are masked, enabled per element and applied in order."""
+        regs = RegisterStorage()
+        regs.write([8, 9, 8], [5, 1 << 33 | 7, 6])
+        regs.write(10, 3, enable=0)
+        assert regs.read([8, 9, 10]).tolist() == [6, 7, 0]
+
+    def test_zero_register(self):
+        """Register 0 ignores writes unless zero_register is off."""
+        regs = RegisterStorage()
+        regs.write(0, 5)
+        regs.load([9, 1, 2])
+        assert regs.read([0, 1, 2]).tolist() == [0, 1, 2]
+        plain = RegisterStorage(num_registers=4, bit_width=8, zero_register=False)
+        plain.write(0, 0x1FF)
+        assert plain.read(0) == 0xFF
+
+    def test_out_of_range(self):
+        """Register numbers past the end raise ValueError."""
+        with pytest.raises(ValueError):
+            RegisterStorage().read(32)
+
+
+class TestMemoryStorage:
+    """Test byte and word access to memory."""
+
+    def test_words_and_bytes(self):
+        """Words and bytes view the same memory in the chosen byte order."""
+        little = MemoryStorage(16, base=0x100)
+        little.write_word(0x104, 0x11223344)
+        assert little.read_byte(0x104) == 0x44
+        big = MemoryStorage(16, byteorder="big")
+        big.write_word(4, 0x11223344)
+        assert big.read_byte([4, 7]).tolist() == [0x11, 0x44]
+        big.write_byte(7, 0x55)
+        assert big.read_word(4) == 0x11223355
+
+    def test_load(self):
+        """Images load as raw bytes or as words."""
+        memory = MemoryStorage(16)
+        memory.load(np.array([1, 2], dtype=np.uint32), address=8)
+        memory.load(b"\x07")
+        assert memory.read_word([0, 8, 12]).tolist() == [7, 1, 2]
+        with pytest.raises(ValueError):
+            memory.load(bytes(20))
+
+    def test_bad_addresses(self):
+        """Unaligned or out-of-range addresses raise ValueError."""
+        memory = MemoryStorage(16, base=0x100)
+        with pytest.raises(ValueError, match="Unaligned"):
+            memory.read_word(0x102)
+        with pytest.raises(ValueError, match="range"):
+            memory.write_word(0x110, 1)
+        memory.write_word(0x110, 1, enable=0)  # disabled writes aren't checked
+
+    def test_from_file(self, tmp_path):
+        """Images are mapped, and written back only when writable."""
+        path = tmp_path / "image.bin"
+        np.arange(4, dtype="<u4").tofile(path)
+        copy = MemoryStorage.from_file(path)
+        assert isinstance(copy.bytes, np.memmap)
+        copy.write_word(0, 9)
+        assert np.fromfile(path, dtype="<u4")[0] == 0
+        shared = MemoryStorage.from_file(path, writable=True)
+        shared.write_word(4, 9)
+        shared.bytes.flush()
+        assert np.fromfile(path, dtype="<u4").tolist() == [0, 9, 2, 3]
+
+        odd = tmp_path / "odd.bin"
+        odd.write_bytes(b"\x01\x02\x03\x04\x05")
+        assert MemoryStorage.from_file(odd).read_word(4) == 5
+
+
+def write_elf(path, words, vaddr=0x400000, entry=0x400004, bss=0):
+    """A big-endian ELF32 file with one executable segment holding words."""
+    code = np.asarray(words, dtype=">u4").tobytes()
+    header = b"\x7fELF" + bytes([1, 2, 1]) + bytes(9)
+    header += struct.pack(
+        ">HHIIIIIHHHHHH", 2, 8, 1, entry, 52, 0, 0, 52, 32, 1, 0, 0, 0
+    )
+    segment = struct.pack(
+        ">IIIIIIII", 1, 84, vaddr, vaddr, len(code), len(code) + bss, 5, 4
+    )
+    path.write_bytes(header + segment + code)
+
+
+class TestLoadImage:
+    """Test opening program images."""
+
+    def test_raw(self, tmp_path):
+        """Raw binaries are mapped at base."""
+        path = tmp_path / "program.bin"
+        np.array([7, 8], dtype="<u4").tofile(path)
+        image = load_image(path, base=0x400000)
+        assert isinstance(image.bytes, np.memmap)
+        assert image.read_word(0x400004) == 8 and image.entry == 0x400000
+
+    def test_elf(self, tmp_path):
+        """An ELF code segment is mapped in its own byte order."""
+        path = tmp_path / "program.elf"
+        write_elf(path, [0x20080005, 0x01084820])
+        image = load_image(path)
+        assert isinstance(image.bytes, np.memmap)
+        assert image.byteorder == "big"
+        assert (image.base, image.entry) == (0x400000, 0x400004)
+        assert image.read_word([0x400000, 0x400004]).tolist() == [
+            0x20080005,
+            0x01084820,
+        ]
+
+    def test_elf_with_bss(self, tmp_path):
+        """A segment longer in memory than in the file is copied and zeroed."""
+        path = tmp_path / "program.elf"
+        write_elf(path, [0x20080005], bss=4)
+        image = MemoryStorage.from_elf(path)
+        assert not isinstance(image.bytes, np.memmap)
+        assert image.read_word([0x400000, 0x400004]).tolist() == [0x20080005, 0]
+        with pytest.raises(ValueError, match="not an ELF"):
+            MemoryStorage.from_elf(__file__)
+
+    def test_hex(self, tmp_path):
+        """Hex word lists start at base; Intel HEX records carry addresses."""
+        words = tmp_path / "words.hex"
+        words.write_text("v2.0 raw\n20080005  # addi\n\n01084820\n")
+        image = load_image(words, base=0x100)
+        assert image.read_word([0x100, 0x104]).tolist() == [0x20080005, 0x01084820]
+        words.write_text("v2.0 raw\n3*0 20080005\n2*ff\n")
+        assert load_image(words).words.tolist() == [0, 0, 0, 0x20080005, 0xFF, 0xFF]
+        for bad, message in (("123456789", "32 bits"), ("2*zz", "Bad hex word")):
+            words.write_text(f"v2.0 raw\n{bad}\n")
+            with pytest.raises(ValueError, match=message):
+                load_image(words)
+
+        intel = tmp_path / "program.ihex"
+        intel.write_text(
+            ":020000040040BA\n"  # upper address 0x0040
+            ":0800000005000820204808015A\n"
+            ":0400000500400004B3\n"  # entry 0x400004
+            ":00000001FF\n"
+        )
+        image = load_image(intel)
+        assert (image.base, image.entry) == (0x400000, 0x400004)
+        assert image.read_word(0x400000) == 0x20080005
+        intel.write_text(":0400000005000820AA\n")
+        with pytest.raises(ValueError, match="Bad Intel HEX"):
+            load_image(intel)
+
+
+class TestStorageBlocks:
+    """Test blocks backed by storage."""
+
+    def test_register_file_ports(self):
+        """The register file reads and writes through its pin names."""
+        regfile = RegisterFile(storage=RegisterStorage())
+        regfile.write_ports({"WriteReg": [8, 9], "WriteData": [4, 5], "RegWrite": 1})
+        read_reg1 = regfile.get_input_by_label("ReadReg1")
+        out = regfile.read_ports({read_reg1: [9, 0], "ReadReg2": 8})
+        assert out["ReadData1"].tolist() == [5, 0] and out["ReadData2"] == 4
+        with pytest.raises(ValueError, match="no storage"):
+            RegisterFile().read_ports({"ReadReg1": 1})
+
+    def test_copies_share_storage(self):
+        """Clones and copies of a block read and write the storage passed in."""
+        memory = MemoryStorage(16)
+        dmem = clone(DataMemory, storage=memory)
+        assert dmem.storage is memory and dmem.copy().storage is memory
+        dmem.write_ports({"Addr": 4, "WriteData": 42, "MemWrite": 1})
+        assert memory.read_word(4) == 42
+        regs = RegisterStorage()
+        assert clone(RegisterFile, storage=regs).copy().storage is regs
+
+    def test_memory_ports(self):
+        """Data memory reads only where MemRead is set."""
+        dmem = DataMemory(storage=MemoryStorage(16))
+        dmem.write_ports({"Addr": 4, "WriteData": 42, "MemWrite": 1})
+        out = dmem.read_ports({"Addr": [4, 1 << 30], "MemRead": [1, 0]})
+        assert out["ReadData"].tolist() == [42, 0]
+        imem = InstructionMemory(storage=MemoryStorage(8))
+        imem.storage.load(np.array([0, 0x20080005], dtype=np.uint32))
+        assert imem.read_ports({"RAddr": 4})["Inst"] == 0x20080005
+
+    def test_word_simulator_reads_storage(self):
+        """WordSimulator drives a register file's outputs from its storage."""
+        regfile = RegisterFile(storage=RegisterStorage())
+        regfile.storage.load(np.arange(32))
+        result = WordSimulator(Netlist(components=[regfile])).evaluate(
+            {
+                regfile.get_input_by_label("ReadReg1"): [1, 2],
+                regfile.get_input_by_label("ReadReg2"): [3, 0],
+            }
+        )
+        read_data1 = regfile.get_output_by_label("ReadData1")
+        read_data2 = regfile.get_output_by_label("ReadData2")
+        assert result.value(read_data1).tolist() == [1, 2]
+        assert result.value(read_data2).tolist() == [3, 0]
+        assert WordSimulator(Netlist(components=[RegisterFile()])).components == []
+
+    def test_mips_simulator_on_block_storage(self, tmp_path):
+        """MipsSimulator runs on storage shared with the drawn blocks."""
+        path = tmp_path / "data.bin"
+        np.array([21, 0], dtype="<u4").tofile(path)
+        dmem = DataMemory(storage=MemoryStorage.from_file(path, base=0x1000))
+        regfile = RegisterFile(storage=RegisterStorage())
+        program = [
+            encode_instruction("addi", 10, 0, 0x1000),
+            encode_instruction("lw", 8, 0, 10),
+            encode_instruction("add", 9, 8, 8),
+            encode_instruction("sw", 9, 4, 10),
+        ]
+        MipsSimulator(
+            program, register_file=regfile.storage, data_memory=dmem.storage
+        ).run()
+        assert regfile.read_ports({"ReadReg1": 9})["ReadData1"] == 42
+        assert dmem.read_ports({"Addr": 0x1004})["ReadData"] == 42
+
+    def test_mips_simulator_on_read_only_memory(self):
+        """Loads from read-only data memory work; stores raise ValueError."""
+        image = np.array([0, 42, 0, 0], dtype="<u4").tobytes()
+        rom = MemoryStorage(buffer=np.frombuffer(image, dtype=np.uint8))
+        load = [encode_instruction("lw", 8, 4, 0)]
+        sim = MipsSimulator(load, data_memory=rom)
+        sim.run()
+        assert sim.registers[8] == 42
+        store = load + [encode_instruction("sw", 8, 8, 0)]
+        sim = MipsSimulator(store, data_memory=rom)
+        with pytest.raises(ValueError, match="read-only data memory at 0x4"):
+            sim.run()
+        assert sim.registers[8] == 42 and sim.pc == 4
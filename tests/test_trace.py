@@ -0,0 +1,84 @@
+"""
+Tests for the columnar trace store.
+"""
+
+import numpy as np
+import pytest
+
+from logicedu.components.blocks import ALUZ
+from logicedu.core import Netlist
+from logicedu.simulation import TraceStore, WordSimulator
+
+
+class TestTraceStore:
+    """Test recording, reading and saving traces."""
+
+    def test_append_holds_missing_columns(self):
+        """Columns left out of a cycle keep their last value."""
+        store = TraceStore({"a": 1, "count": 8}, capacity=2)
+        store.append({"a": 1, "count": 3})
+        store.append({"count": 4})
+        store.extend({"count": np.arange(5, 100)})
+        assert len(store) == 97
+        assert store["a"].tolist() == [1] * 97
+        assert store["count"][:3].tolist() == [3, 4, 5]
+        assert store["a"].dtype == np.uint8
+        assert store.row(-1) == {"a": 1, "count": 99}
+
+    def test_values_must_fit(self):
+        """Values wider than a column raise ValueError."""
+        store = TraceStore({"a": 1})
+        with pytest.raises(ValueError):
+            store.extend({"a": [0, 2]})
+        with pytest.raises(KeyError):
+            store.append({"b": 0})
+
+    def test_slicing_shares_columns(self):
+        """A range of cycles is a read-only view of the same arrays."""
+        store = TraceStore({"count": 16})
+        store.extend({"count": np.arange(1000)})
+        view = store[100:200:10]
+        assert len(view) == 10
+        assert view["count"].tolist() == list(range(100, 200, 10))
+        assert np.shares_memory(view["count"], store["count"])
+        with pytest.raises(ValueError):
+            view.append({"count": 1})
+
+    def test_pin_keys_and_apply(self):
+        """Pin columns are named after their owner and set pin values."""
+        alu = ALUZ()
+        store = TraceStore({alu.result_pin: 32, alu.zero_pin: 1})
+        assert store.names == ["ALUZ.result", "ALUZ.zero"]
+        store.extend({alu.result_pin: [5, 0], alu.zero_pin: [0, 1]})
+        store.apply(1)
+        assert alu.result_pin.value.tolist() == [0]
+        assert alu.zero_pin.value.tolist() == [1]
+        assert store["ALUZ.zero"].tolist() == [0, 1]
+
+    def test_save_and_load(self, tmp_path):
+        """Saved traces load memory-mapped, or into memory to keep recording."""
+        store = TraceStore({"pc": 32, "write": 1}, attrs={"program": "sum"})
+        store.extend({"pc": np.arange(0, 4000, 4), "write": np.arange(1000) % 2})
+        store.save(tmp_path / "run")
+
+        mapped = TraceStore.load(tmp_path / "run")
+        assert isinstance(mapped["pc"], np.memmap)
+        assert mapped.attrs == {"program": "sum"}
+        assert mapped[500:502]["pc"].tolist() == [2000, 2004]
+        with pytest.raises(ValueError):
+            mapped.append({"pc": 0})
+
+        loaded = TraceStore.load(tmp_path / "run", mmap_mode=None)
+        loaded.append({"pc": 4000})
+        assert len(loaded) == 1001
+        assert loaded.row(1000) == {"pc": 4000, "write": 1}
+
+    def test_word_result_to_trace(self):
+        """Word simulation results convert to a trace per pin."""
+        alu = ALUZ()
+        result = WordSimulator(Netlist(components=[alu])).evaluate(
+            {alu.input0_pin: [1, 2, 3], alu.input1_pin: [3, 2, 1]}
+        )
+        store = result.to_trace([alu.result_pin, alu.zero_pin])
+        assert store[alu.result_pin].tolist() == [4, 4, 4]
+        assert len(result.to_trace()) == 3
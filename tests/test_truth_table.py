@@ -0,0 +1,94 @@
+"""
+Tests for truth-table generation.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from logicedu.components.logic_gates import AND2, OR2, XOR2, LogicType
+from logicedu.core import Netlist
+from logicedu.simulation import gate_truth_table, truth_table
+from logicedu.simulation.truth_table import input_patterns
+
+
+def full_adder():
+    """Full adder from two XOR2, two AND2 and an OR2."""
+    xor1, xor2, and1, and2, or_ = XOR2(), XOR2(), AND2(), AND2(), OR2()
+    netlist = Netlist(components=[xor1, xor2, and1, and2, or_])
+    a, b = xor1.get_input_by_index(0), xor1.get_input_by_index(1)
+    cin = xor2.get_input_by_index(1)
+    netlist.connect(a, and1.get_input_by_index(0))
+    netlist.connect(b, and1.get_input_by_index(1))
+    netlist.connect(xor1.get_output_by_index(0), xor2.get_input_by_index(0))
+    netlist.connect(xor1.get_output_by_index(0), and2.get_input_by_index(0))
+    netlist.connect(cin, and2.get_input_by_index(1))
+    netlist.connect(and1.get_output_by_index(0), or_.get_input_by_index(0))
+    netlist.connect(and2.get_output_by_index(0), or_.get_input_by_index(1))
+    outputs = [xor2.get_output_by_index(0), or_.get_output_by_index(0)]
+    return netlist, [a, b, cin], outputs
+
+
+class TestTruthTable:
+    """Test truth tables of gates and circuits."""
+
+    @pytest.mark.parametrize(
+        "logic_type, expected",
+        [
+            (LogicType.AND, [0, 0, 0, 1]),
+            (LogicType.NAND, [1, 1, 1, 0]),
+            (LogicType.NOR, [1, 0, 0, 0]),
+            (LogicType.XNOR, [1, 0, 0, 1]),
+            (LogicType.INV, [1, 0]),
+        ],
+    )
+    def test_gate_tables(self, logic_type, expected):
+        """Test single gates, with rows counting up from all zeros."""
+        table = gate_truth_table(logic_type)
+        assert table.output().astype(int).tolist() == expected
+        assert table.inputs[1].tolist() == [False] * (table.inputs.shape[1] - 1) + [True]
+
+    def test_input_patterns(self):
+        """Test that the bit-sliced columns count through every row."""
+        for n in (3, 8):
+            patterns = input_patterns(n)
+            rows = np.arange(1 << n)
+            for i, words in enumerate(patterns):
+                bits = np.unpackbits(words.view(np.uint8), bitorder="little")
+                assert np.array_equal(bits[: 1 << n], (rows >> (n - 1 - i)) & 1)
+
+    def test_full_adder(self):
+        """Test a composite circuit against integer addition."""
+        netlist, inputs, outputs = full_adder()
+        table = truth_table(netlist, inputs, outputs, output_names=["S", "Cout"])
+        total = table.inputs.sum(axis=1)
+        assert np.array_equal(table.output("S"), total % 2 == 1)
+        assert table.minterms("Cout").tolist() == [3, 5, 6, 7]
+        assert table.rows().shape == (8, 5)
+
+    def test_cached_by_structure(self):
+        """Test that identical circuits share one cached result."""
+        first = truth_table(Netlist(components=[XOR2()]))
+        second = truth_table(Netlist(components=[XOR2()]))
+        assert second.packed_outputs is first.packed_outputs
+
+    def test_twenty_inputs(self):
+        """Test that a 20-input circuit is tabulated quickly."""
+        gates = [OR2() for _ in range(19)]
+        netlist = Netlist(components=gates)
+        for source, sink in zip(gates, gates[1:]):
+            netlist.connect(source.get_output_by_index(0), sink.get_input_by_index(0))
+        start = time.perf_counter()
+        table = truth_table(netlist)
+        assert time.perf_counter() - start < 1.0
+        assert table.num_rows == 1 << 20
+        assert table.minterms().size == (1 << 20) - 1
+
+    def test_to_mobject(self):
+        """Test rendering a small table and refusing a huge one."""
+        table = gate_truth_table(LogicType.XOR)
+        mobject = table.to_mobject()
+        assert len(mobject.get_entries()) == (4 + 1) * 3
+        with pytest.raises(ValueError, match="max_rows"):
+            table.to_mobject(max_rows=2)
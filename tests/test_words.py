@@ -0,0 +1,148 @@
+"""
+Tests for bus values on pins and word-level simulation.
+"""
+
+import numpy as np
+import pytest
+
+from logicedu.components.blocks import (
+    ALUZ,
+    Adder,
+    AdderPlus4,
+    ControlUnit,
+    InstructionMemory,
+    Mux,
+    ShiftLeft,
+    SignExtend,
+)
+from logicedu.core import Netlist
+from logicedu.core.basics import (
+    ConnectorLine,
+    Pin,
+    PinSide,
+    PinType,
+    parse_bit_range,
+    width_error,
+)
+from logicedu.simulation import AluOp, WordSimulator
+
+
+def bus_pin(bit_width, pin_type=PinType.OUTPUT, label="out"):
+    return Pin(
+        pin_side=PinSide.RIGHT, pin_type=pin_type, label=label, bit_width=bit_width
+    )
+
+
+class TestPinValues:
+    """Test bus widths and values on pins."""
+
+    def test_parse_bit_range(self):
+        """Labels ending in a bit slice give (high, low)."""
+        assert parse_bit_range("inst[31:26]") == (31, 26)
+        assert parse_bit_range("inst[5]") == (5, 5)
+        assert parse_bit_range("RegDst") is None
+
+    def test_set_value_checks_range(self):
+        """Values must fit the pin's width."""
+        pin = bus_pin(4)
+        assert pin.set_value([0, 15]).get_value().tolist() == [0, 15]
+        assert pin.value.dtype == np.uint8
+        with pytest.raises(ValueError):
+            pin.set_value(16)
+        with pytest.raises(ValueError):
+            pin.set_value(-1)
+        with pytest.raises(TypeError):
+            pin.set_value(1.5)
+
+    def test_read_applies_bit_range(self):
+        """A sliced input sees only its bits of the driving bus."""
+        control = ControlUnit()
+        pin = control.get_input_by_label("inst[31:26]")
+        assert pin.read(np.array([0x8C000000])).tolist() == [0b100011]
+
+    def test_width_checks(self):
+        """Mismatched widths raise, slices that fit don't."""
+        assert width_error(bus_pin(8), bus_pin(8, PinType.INPUT, "in")) is None
+        with pytest.raises(ValueError):
+            ConnectorLine(bus_pin(8), bus_pin(16, PinType.INPUT, "in"), check_width=True)
+        imem, control = InstructionMemory(), ControlUnit()
+        inst = imem.get_output_by_label("Inst")
+        opcode = control.get_input_by_label("inst[31:26]")
+        ConnectorLine(inst, opcode, check_width=True)
+        assert width_error(bus_pin(16), opcode) is not None
+
+    def test_netlist_width_mismatches(self):
+        """Netlist reports loads whose width doesn't fit the driver."""
+        adder, mux = Adder(), Mux(bit_width=16)
+        netlist = Netlist(components=[adder, mux])
+        netlist.connect(adder.result_pin, mux.get_input_by_index(0))
+        ((driver, load, _),) = netlist.width_mismatches()
+        assert driver is adder.result_pin
+        assert load is mux.get_input_by_index(0)
+
+
+class TestWordSimulator:
+    """Test word-level simulation of datapath blocks."""
+
+    @pytest.mark.parametrize(
+        "op, expected",
+        [
+            (AluOp.AND, 0b1000),
+            (AluOp.OR, 0b1110),
+            (AluOp.ADD, 22),
+            (AluOp.SUB, 2),
+            (AluOp.SLT, 0),
+            (AluOp.NOR, 0xFFFFFFF1),
+        ],
+    )
+    def test_alu_ops(self, op, expected):
+        """ALUZ computes every MIPS ALU operation."""
+        alu = ALUZ()
+        sim = WordSimulator(Netlist(components=[alu]))
+        result = sim.evaluate(
+            {alu.input0_pin: 12, alu.input1_pin: 10}, controls={alu: op}
+        )
+        assert result.value(alu.result_pin).tolist() == [expected]
+
+    def test_alu_signed_compare_and_zero(self):
+        """SLT compares as signed and zero is set when the result is 0."""
+        alu = ALUZ()
+        sim = WordSimulator(Netlist(components=[alu]))
+        result = sim.evaluate(
+            {alu.input0_pin: [0xFFFFFFFF, 3, 5], alu.input1_pin: [1, 3, 5]},
+            controls={alu: [AluOp.SLT, AluOp.SUB, AluOp.ADD]},
+        )
+        assert result.value(alu.result_pin).tolist() == [1, 0, 10]
+        assert result.value(alu.zero_pin).tolist() == [0, 1, 0]
+        assert alu.zero_pin.value.tolist() == [0, 1, 0]
+
+    def test_datapath_chain(self):
+        """Sign-extended offsets are shifted and added to PC + 4."""
+        pc4, extend, shift, adder = AdderPlus4(), SignExtend(), ShiftLeft(2), Adder()
+        netlist = Netlist(components=[adder, shift, extend, pc4])
+        netlist.connect(extend.get_output_by_index(0), shift.get_input_by_index(0))
+        netlist.connect(pc4.result_pin, adder.input0_pin)
+        netlist.connect(shift.get_output_by_index(0), adder.input1_pin)
+        sim = WordSimulator(netlist)
+        result = sim.evaluate(
+            {pc4.input0_pin: [0x100, 0x100], extend.get_input_by_index(0): [3, 0xFFFF]}
+        )
+        assert result.value(adder.result_pin).tolist() == [0x110, 0x100]
+        assert [c.__class__ for c in sim.components][-1] is Adder
+
+    def test_mux_selects(self):
+        """Mux passes the selected data input."""
+        mux = Mux(num_inputs=4, bit_width=8)
+        data = [mux.get_input_by_index(i) for i in range(4)]
+        sel = next(p for p in mux.get_owned_pins() if p.label_str == "sel")
+        assert sel.bit_width == 2
+        result = WordSimulator(Netlist(components=[mux])).evaluate(
+            {data[0]: 10, data[1]: 11, data[2]: 12, data[3]: 13, sel: [3, 0, 2]}
+        )
+        assert result.value(mux.get_output_by_index(0)).tolist() == [13, 10, 12]
+
+    def test_missing_inputs_raise(self):
+        """Every input net needs a value."""
+        alu = ALUZ()
+        with pytest.raises(ValueError, match="No values"):
+            WordSimulator(Netlist(components=[alu])).evaluate({alu.input0_pin: 1})